@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+#
+# Benchmarks for VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2014-2017 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+from os.path import dirname, abspath
+import os
+import json
+import getopt
+import timeit
+import subprocess
+
+print('Benchmark script for VideoSort')
+
+root_dir = dirname(abspath(__file__))
+sys.path.insert(0, root_dir + '/lib')
+repeat = 5
+bench_ids = []
+
+options, _ = getopt.getopt(sys.argv[1:], 'b:n:', ['bench=', 'repeat='])
+for opt, arg in options:
+	if opt in ('-b', '--bench'):
+		bench_ids.append(arg)
+	elif opt in ('-n', '--repeat'):
+		repeat = int(arg)
+
+testdata = json.load(open(root_dir + '/testdata.json'))
+file_names = [os.path.basename(testobj['INPUTFILE']) for testobj in testdata]
+
+def best_time(run, count, number=1):
+	""" Returns best time of run per item in milliseconds, run handling count items """
+	return min(timeit.repeat(run, number=number, repeat=repeat)) * 1000 / number / count
+
+def time_guess():
+	""" Returns best time per guess of file names from testdata, in milliseconds """
+	from guessit import guessit
+	def run():
+		for file_name in file_names:
+			guessit(file_name)
+	run()
+	return best_time(run, len(file_names))
+
+def print_saving(name, before, after):
+	print('%s: %.3f ms -> %.3f ms per guess, saving %.3f ms (%.1f%%)' % (name, before, after, before - after, (before - after) * 100 / before))
+
+class NoCache(dict):
+	""" Cache which never stores anything """
+	def __setitem__(self, key, value):
+		pass
+
+def bench_loose():
+	""" Signature cache of rebulk.loose """
+	from rebulk import loose
+	filters = loose._ARGS_FILTERS
+	loose._ARGS_FILTERS = {False: NoCache(), True: NoCache()}
+	try:
+		uncached = time_guess()
+	finally:
+		loose._ARGS_FILTERS = filters
+	print_saving('loose signature cache', uncached, time_guess())
+
+def bench_memory():
+	""" Memory and allocations of matches, per guess """
+	try:
+		import tracemalloc
+	except ImportError:
+		print('memory: tracemalloc is not available in python %i.%i' % sys.version_info[:2])
+		return
+	from guessit.api import default_api
+	from guessit.options import parse_options
+	from rebulk.match import Match
+	options = parse_options(None, True)
+	match_file = tracemalloc.Filter(True, '*/rebulk/match.py')
+	peak = 0
+	size = 0
+	count = 0
+	tracemalloc.start()
+	try:
+		for file_name in file_names:
+			before = tracemalloc.take_snapshot().filter_traces([match_file])
+			tracemalloc.reset_peak()
+			current = tracemalloc.get_traced_memory()[0]
+			matches = default_api.rebulk.matches(file_name, options)
+			peak += tracemalloc.get_traced_memory()[1] - current
+			after = tracemalloc.take_snapshot().filter_traces([match_file])
+			for stat in after.compare_to(before, 'filename'):
+				size += stat.size_diff
+				count += stat.count_diff
+			del matches
+	finally:
+		tracemalloc.stop()
+	match = Match(0, 0, pattern=None)
+	match_size = sys.getsizeof(match) + (sys.getsizeof(match.__dict__) if hasattr(match, '__dict__') else 0)
+	print('memory: Match instance %i bytes, %.1f KiB peak per guess, %i block(s) and %.1f KiB retained by matches per guess' % (
+		match_size, peak / 1024.0 / len(file_names), count // len(file_names), size / 1024.0 / len(file_names)))
+
+def bench_rules():
+	""" Rules skipped because matches don't contain their trigger names or tags """
+	from guessit.api import default_api
+	time_guess()
+	stats = default_api.rebulk.rules_stats()
+	print('rules: %i evaluated, %i skipped (%.1f%%)' % (stats['evaluated'], stats['skipped'], stats['skip_rate'] * 100))
+	for name, count in sorted(stats['skipped_rules'].items(), key=lambda item: (-item[1], item[0])):
+		print('  %s: skipped %i time(s)' % (name, count))
+
+def bench_query():
+	""" Query cache of matches """
+	from rebulk.match import _BaseMatches
+	memoize = _BaseMatches.__dict__['memoize']
+	_BaseMatches.memoize = lambda self, key, function: function()
+	try:
+		uncached = time_guess()
+	finally:
+		_BaseMatches.memoize = memoize
+	print_saving('matches query cache', uncached, time_guess())
+
+def bench_profile():
+	""" Patterns and rules taking most time on testdata """
+	from guessit import guessit
+	from rebulk import Profiler
+	profiler = Profiler()
+	for file_name in file_names:
+		guessit(file_name, profiler=profiler)
+	print('profile: %i guesses' % len(file_names))
+	print(profiler.table(limit=20))
+
+def bench_many():
+	""" Batch guessing of testdata """
+	import multiprocessing
+	from guessit import guessit, guessit_many
+	options = {'type': 'episode'}
+	def run_single():
+		for file_name in file_names:
+			guessit(file_name, options)
+	def run_many():
+		for _ in guessit_many(file_names, options):
+			pass
+	run_single()
+	single = best_time(run_single, len(file_names))
+	print_saving('guessit_many', single, best_time(run_many, len(file_names)))
+	processes = multiprocessing.cpu_count()
+	if processes > 1:
+		def run_pool():
+			for _ in guessit_many(file_names * 10, options, processes=processes):
+				pass
+		print_saving('guessit_many, %i processes' % processes, single,
+			best_time(run_pool, len(file_names) * 10))
+	else:
+		print('guessit_many: single cpu, worker processes are not benchmarked')
+
+def bench_import():
+	""" Cold import time of guessit, measured in new processes """
+	code = ('import sys, time; sys.path.insert(0, %r); start = time.time(); import guessit; '
+		'print("%%f %%s" %% (time.time() - start, "pkg_resources" in sys.modules))' % (root_dir + '/lib'))
+	importtime = sys.version_info >= (3, 7)
+	best = None
+	for _ in range(repeat):
+		args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+		process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+		out, err = process.communicate()
+		elapsed, pkg_resources = out.split()
+		if best is None or float(elapsed) < best[0]:
+			best = (float(elapsed), pkg_resources, err)
+	print('import: %.1f ms, pkg_resources imported: %s' % (best[0] * 1000, best[1]))
+	if importtime:
+		for line in best[2].splitlines():
+			fields = [field.strip() for field in line.split('|')]
+			if len(fields) == 3 and fields[2] in ('babelfish', 'pkg_resources', 'rebulk', 'guessit'):
+				print('  %s: %.1f ms cumulative' % (fields[2], int(fields[1]) / 1000.0))
+
+def bench_babelfish():
+	""" Cold load time of babelfish tables and of converters used by guessit, measured in new processes """
+	code = ('import sys, time; sys.path.insert(0, %r); start = time.time(); import babelfish; loaded = time.time(); '
+		'[babelfish.language_converters[name] for name in ("alpha3b", "alpha2", "name", "opensubtitles")]; '
+		'babelfish.country_converters["name"]; print("%%f %%f" %% (loaded - start, time.time() - loaded))' % (root_dir + '/lib'))
+	best = None
+	for _ in range(repeat):
+		out = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True).communicate()[0]
+		elapsed = tuple(float(value) * 1000 for value in out.split())
+		if best is None or sum(elapsed) < sum(best):
+			best = elapsed
+	print('babelfish: import %.1f ms, converters %.1f ms' % best)
+
+def bench_language():
+	""" Language lookups of testdata words, chain of babelfish converters against the precomputed map of guessit """
+	import babelfish
+	from guessit.rules.common.words import iter_words
+	from guessit.tests import language_chain
+	converter = babelfish.language_converters['guessit']
+	words = [word.value.lower() for file_name in file_names for word in iter_words(file_name)]
+	def run_chain():
+		for word in words:
+			language_chain(converter, word)
+	def run_map():
+		for word in words:
+			try:
+				converter.language(word)
+			except babelfish.Error:
+				pass
+	run_chain()
+	run_map()
+	before = best_time(run_chain, len(words)) * 1000
+	after = best_time(run_map, len(words)) * 1000
+	print('language: %.2f us -> %.2f us per word, %i words, %i language object(s) interned' % (before, after,
+		len(words), len(converter._interned)))
+
+def bench_affixes():
+	""" Language finder on testdata and on long multi-language names, affixes scanned linearly against tries """
+	from guessit.rules.properties import language
+	from guessit.tests import LinearAffixes
+	multi = ['Show.S01E01.FRENCH.ENGLISH.GERMAN.ITALIAN.SPANISH.DUTCH.SWEDISH.subfrench.engsub.VOSTFR.Subs.DUBBED.720p.mkv',
+		'Movie.2010.MULTi.TRUEFRENCH.PT-BR.Legendado.custom.subs.ITA.ENG.Dublado.NORDiC.SUBFORCED.soft.subtitles.avi']
+	for names in (file_names, multi):
+		def run():
+			for name in names:
+				list(language.find_languages(name, {}))
+		tries = language.prefixes_trie, language.suffixes_trie
+		language.prefixes_trie, language.suffixes_trie = LinearAffixes(tries[0]), LinearAffixes(tries[1])
+		try:
+			run()
+			linear = best_time(run, len(names), 10)
+		finally:
+			language.prefixes_trie, language.suffixes_trie = tries
+		run()
+		print_saving('affix tries, %s' % ('testdata' if names is file_names else 'multi-language names'), linear,
+			best_time(run, len(names), 10))
+
+def bench_date():
+	""" Date search of guessit against the previous dateutil implementation, on testdata and on generated dates """
+	from guessit.rules.common.date import search_date
+	from guessit.tests import search_date_dateutil, generated_dates
+	for name, strings in (('testdata', [' %s ' % file_name for file_name in file_names]),
+			('generated dates', [' Show.%s.Title.720p ' % date for date in generated_dates(2000)])):
+		def run(search):
+			for string in strings:
+				search(string)
+		before = best_time(lambda: run(search_date_dateutil), len(strings)) * 1000
+		after = best_time(lambda: run(search_date), len(strings)) * 1000
+		print('date, %s: %.1f us -> %.1f us per string' % (name, before, after))
+
+benchmarks = [
+	('loose', bench_loose),
+	('memory', bench_memory),
+	('query', bench_query),
+	('profile', bench_profile),
+	('many', bench_many),
+	('import', bench_import),
+	('babelfish', bench_babelfish),
+	('rules', bench_rules),
+	('language', bench_language),
+	('affixes', bench_affixes),
+	('date', bench_date),
+]
+
+for bench_id, bench in benchmarks:
+	if bench_ids == [] or bench_id in bench_ids:
+		bench()
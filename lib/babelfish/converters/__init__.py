@@ -3,8 +3,10 @@
 # that can be found in the LICENSE file.
 #
 import collections
-from pkg_resources import iter_entry_points, EntryPoint
+from importlib import import_module
+from itertools import repeat
 from ..exceptions import LanguageConvertError, LanguageReverseError
+from ..tables import column
 
 
 # from https://github.com/kennethreitz/requests/blob/master/requests/structures.py
@@ -37,6 +39,13 @@ class CaseInsensitiveDict(collections.MutableMapping):
             data = {}
         self.update(data, **kwargs)
 
+    @classmethod
+    def fromlowered(cls, lowered, keys, values):
+        """Create a :class:`CaseInsensitiveDict` from parallel sequences of keys, already lowercased keys and values"""
+        instance = cls()
+        instance._store = dict(zip(lowered, zip(keys, values)))
+        return instance
+
     def __setitem__(self, key, value):
         # Use the lowercased key for lookups, but store the actual
         # key alongside the value.
@@ -130,6 +139,9 @@ class LanguageEquivalenceConverter(LanguageReverseConverter):
     If you also set the class variable CASE_SENSITIVE to ``True`` then the reverse conversion function will be
     case-sensitive (it is case-insensitive by default).
 
+    Internal converters also set the class variable TABLE to the name of their precomputed maps in
+    :mod:`babelfish.tables`.
+
     Example::
 
         class MyCodeConverter(babelfish.LanguageEquivalenceConverter):
@@ -138,19 +150,24 @@ class LanguageEquivalenceConverter(LanguageReverseConverter):
 
     """
     CASE_SENSITIVE = False
+    TABLE = None
 
     def __init__(self):
-        self.codes = set()
-        self.to_symbol = {}
+        if self.TABLE is not None:
+            alpha3s = column(self.TABLE, 'alpha3')
+            symbols = column(self.TABLE, 'symbol')
+        else:
+            alpha3s = list(self.SYMBOLS.keys())
+            symbols = [self.SYMBOLS[alpha3] for alpha3 in alpha3s]
+        reversed_symbols = list(zip(alpha3s, repeat(None), repeat(None)))
+        self.codes = set(symbols)
+        self.to_symbol = dict(zip(alpha3s, symbols))
         if self.CASE_SENSITIVE:
-            self.from_symbol = {}
+            self.from_symbol = dict(zip(symbols, reversed_symbols))
+        elif self.TABLE is not None:
+            self.from_symbol = CaseInsensitiveDict.fromlowered(column(self.TABLE, 'lower'), symbols, reversed_symbols)
         else:
-            self.from_symbol = CaseInsensitiveDict()
-
-        for alpha3, symbol in self.SYMBOLS.items():
-            self.to_symbol[alpha3] = symbol
-            self.from_symbol[symbol] = (alpha3, None, None)
-            self.codes.add(symbol)
+            self.from_symbol = CaseInsensitiveDict(zip(symbols, reversed_symbols))
 
     def convert(self, alpha3, country=None, script=None):
         try:
@@ -203,14 +220,54 @@ class CountryReverseConverter(CountryConverter):
         raise NotImplementedError
 
 
+def iter_entry_points(group):
+    """Iterate over installed entry points of a group
+
+    :mod:`importlib.metadata` is used if available, :mod:`pkg_resources` otherwise. Both are imported only when this
+    function is called.
+
+    :param string group: entry point group
+    :return: entry points having ``name`` attribute and ``load`` method
+
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        from pkg_resources import iter_entry_points as entry_points_of_group
+        return entry_points_of_group(group)
+    installed = entry_points()
+    if hasattr(installed, 'select'):
+        return installed.select(group=group)
+    return installed.get(group, [])
+
+
+def load_converter(entry_point):
+    """Parse a converter with entry point syntax and load its class
+
+    :param string entry_point: converter with entry point syntax ``name = module:attr``
+    :return: name and class of the converter
+    :rtype: tuple
+
+    """
+    name, _, target = entry_point.partition('=')
+    module_name, _, attrs = target.split('[')[0].partition(':')
+    plugin = import_module(module_name.strip())
+    for attr in attrs.strip().split('.'):
+        plugin = getattr(plugin, attr)
+    return name.strip(), plugin
+
+
 class ConverterManager(object):
     """Manager for babelfish converters behaving like a dict with lazy loading
 
     Loading is done in this order:
 
-    * Entry point converters
     * Registered converters
     * Internal converters
+    * Entry point converters
+
+    Entry points are only scanned for names that are neither registered nor internal, so that loading registered and
+    internal converters doesn't require :mod:`pkg_resources`.
 
     .. attribute:: entry_point
 
@@ -235,21 +292,14 @@ class ConverterManager(object):
         """Get a converter, lazy loading it if necessary"""
         if name in self.converters:
             return self.converters[name]
+        for converter in self.registered_converters + self.internal_converters:
+            if converter.partition('=')[0].strip() == name:
+                self.converters[name] = load_converter(converter)[1]()
+                return self.converters[name]
         for ep in iter_entry_points(self.entry_point):
             if ep.name == name:
                 self.converters[ep.name] = ep.load()()
                 return self.converters[ep.name]
-        for ep in (EntryPoint.parse(c) for c in self.registered_converters + self.internal_converters):
-            if ep.name == name:
-                # `require` argument of ep.load() is deprecated in newer versions of setuptools
-                if hasattr(ep, 'resolve'):
-                    plugin = ep.resolve()
-                elif hasattr(ep, '_load'):
-                    plugin = ep._load()
-                else:
-                    plugin = ep.load(require=False)
-                self.converters[ep.name] = plugin()
-                return self.converters[ep.name]
         raise KeyError(name)
 
     def __setitem__(self, name, converter):
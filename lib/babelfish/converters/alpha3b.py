@@ -6,12 +6,10 @@
 #
 from __future__ import unicode_literals
 from . import LanguageEquivalenceConverter
-from ..language import LANGUAGE_MATRIX
+from ..tables import column
 
 
 class Alpha3BConverter(LanguageEquivalenceConverter):
     CASE_SENSITIVE = True
-    SYMBOLS = {}
-    for iso_language in LANGUAGE_MATRIX:
-        if iso_language.alpha3b:
-            SYMBOLS[iso_language.alpha3] = iso_language.alpha3b
+    TABLE = 'alpha3b'
+    SYMBOLS = dict(zip(column(TABLE, 'alpha3'), column(TABLE, 'symbol')))
@@ -6,12 +6,10 @@
 #
 from __future__ import unicode_literals
 from . import LanguageEquivalenceConverter
-from ..language import LANGUAGE_MATRIX
+from ..tables import column
 
 
 class Alpha3TConverter(LanguageEquivalenceConverter):
     CASE_SENSITIVE = True
-    SYMBOLS = {}
-    for iso_language in LANGUAGE_MATRIX:
-        if iso_language.alpha3t:
-            SYMBOLS[iso_language.alpha3] = iso_language.alpha3t
+    TABLE = 'alpha3t'
+    SYMBOLS = dict(zip(column(TABLE, 'alpha3'), column(TABLE, 'symbol')))
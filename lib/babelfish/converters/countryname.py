@@ -6,19 +6,17 @@
 #
 from __future__ import unicode_literals
 from . import CountryReverseConverter, CaseInsensitiveDict
-from ..country import COUNTRY_MATRIX
+from ..tables import column
 from ..exceptions import CountryConvertError, CountryReverseError
 
 
 class CountryNameConverter(CountryReverseConverter):
     def __init__(self):
-        self.codes = set()
-        self.to_name = {}
-        self.from_name = CaseInsensitiveDict()
-        for country in COUNTRY_MATRIX:
-            self.codes.add(country.name)
-            self.to_name[country.alpha2] = country.name
-            self.from_name[country.name] = country.alpha2
+        alpha2s = column('countryname', 'alpha2')
+        names = column('countryname', 'name')
+        self.codes = set(names)
+        self.to_name = dict(zip(alpha2s, names))
+        self.from_name = CaseInsensitiveDict.fromlowered(column('countryname', 'lower'), names, alpha2s)
 
     def convert(self, alpha2):
         if alpha2 not in self.to_name:
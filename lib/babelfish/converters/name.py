@@ -6,12 +6,10 @@
 #
 from __future__ import unicode_literals
 from . import LanguageEquivalenceConverter
-from ..language import LANGUAGE_MATRIX
+from ..tables import column
 
 
 class NameConverter(LanguageEquivalenceConverter):
     CASE_SENSITIVE = False
-    SYMBOLS = {}
-    for iso_language in LANGUAGE_MATRIX:
-        if iso_language.name:
-            SYMBOLS[iso_language.alpha3] = iso_language.name
+    TABLE = 'name'
+    SYMBOLS = dict(zip(column(TABLE, 'alpha3'), column(TABLE, 'symbol')))
@@ -7,14 +7,12 @@
 from __future__ import unicode_literals
 from . import LanguageConverter
 from ..exceptions import LanguageConvertError
-from ..language import LANGUAGE_MATRIX
+from ..tables import column
 
 
 class ScopeConverter(LanguageConverter):
     FULLNAME = {'I': 'individual', 'M': 'macrolanguage', 'S': 'special'}
-    SYMBOLS = {}
-    for iso_language in LANGUAGE_MATRIX:
-        SYMBOLS[iso_language.alpha3] = iso_language.scope
+    SYMBOLS = dict(zip(column('language', 'alpha3'), column('language', 'scope')))
     codes = set(SYMBOLS.values())
 
     def convert(self, alpha3, country=None, script=None):
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013 the BabelFish authors. All rights reserved.
+# Use of this source code is governed by the 3-clause BSD license
+# that can be found in the LICENSE file.
+#
+from __future__ import unicode_literals
+import collections
+import io
+import json
+import os
+from pkgutil import get_data
+
+
+#: Separator of values in precomputed columns, never found in ISO data files
+SEPARATOR = '\t'
+
+#: Path of precomputed tables in babelfish package
+TABLES_PATH = 'data/tables.json'
+
+#: Columns of ISO tables, in order of data files
+LANGUAGE_FIELDS = ('alpha3', 'alpha3b', 'alpha3t', 'alpha2', 'scope', 'type', 'name', 'comment')
+COUNTRY_FIELDS = ('name', 'alpha2')
+SCRIPT_FIELDS = ('code', 'number', 'name', 'french_name', 'pva', 'date')
+
+_tables = None
+_columns = {}
+
+
+def column(table, name):
+    """Get a column of precomputed tables
+
+    Precomputed tables are loaded on first call, and each column is split on first access.
+
+    :param string table: name of the table, ``language``, ``country``, ``script`` or a converter name
+    :param string name: name of the column
+    :return: values of the column
+    :rtype: list
+
+    """
+    global _tables
+    key = (table, name)
+    if key not in _columns:
+        if _tables is None:
+            _tables = json.loads(get_data('babelfish', TABLES_PATH).decode('utf-8'))
+        _columns[key] = _tables[table][name].split(SEPARATOR)
+    return _columns[key]
+
+
+class Matrix(collections.Sequence):
+    """Read-only list of namedtuples built from columns of a precomputed table on first access
+
+    :param string table: name of the table
+    :param type row_class: namedtuple class of rows, its fields are the names of columns
+
+    """
+    def __init__(self, table, row_class):
+        self.table = table
+        self.row_class = row_class
+        self._rows = None
+
+    @property
+    def rows(self):
+        """List of rows, built on first access"""
+        if self._rows is None:
+            columns = [column(self.table, field) for field in self.row_class._fields]
+            self._rows = [self.row_class._make(row) for row in zip(*columns)]
+        return self._rows
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __repr__(self):
+        return '%s(%r, %s)' % (self.__class__.__name__, self.table, self.row_class.__name__)
+
+
+def read_lines(filename):
+    """Read lines of an ISO data file, keeping line endings"""
+    with io.open(os.path.join(os.path.dirname(__file__), 'data', filename), 'rb') as f:
+        return [l.decode('utf-8') for l in f]
+
+
+def build_tables():
+    """Parse ISO data files into columns of ISO tables and of internal converters maps
+
+    Converters maps are stored as parallel key and value columns, lowercased keys are also stored for case-insensitive
+    reverse maps.
+
+    :return: tables as dict of columns
+    :rtype: dict
+
+    """
+    languages = [l.split('\t') for l in read_lines('iso-639-3.tab')[1:]]
+    countries = [l.strip().split(';') for l in read_lines('iso-3166-1.txt')[1:]]
+    scripts = [l.strip().split(';') for l in read_lines('iso15924-utf8-20131012.txt')[1:]
+               if l.strip() and not l.strip().startswith('#')]
+    tables = {'language': dict(zip(LANGUAGE_FIELDS, zip(*languages))),
+              'country': dict(zip(COUNTRY_FIELDS, zip(*countries))),
+              'script': dict(zip(SCRIPT_FIELDS, zip(*scripts)))}
+    language = tables['language']
+    for converter in ('alpha2', 'alpha3b', 'alpha3t', 'name'):
+        symbols = [(alpha3, symbol) for alpha3, symbol in zip(language['alpha3'], language[converter]) if symbol]
+        tables[converter] = {'alpha3': [alpha3 for alpha3, _ in symbols], 'symbol': [symbol for _, symbol in symbols]}
+    tables['name']['lower'] = [symbol.lower() for symbol in tables['name']['symbol']]
+    country = tables['country']
+    tables['countryname'] = {'alpha2': country['alpha2'], 'name': country['name'],
+                             'lower': [name.lower() for name in country['name']]}
+    for columns in tables.values():
+        for name, values in columns.items():
+            assert not any(SEPARATOR in value for value in values)
+            columns[name] = SEPARATOR.join(values)
+    return tables
+
+
+def build(path=None):
+    """Build precomputed tables from ISO data files
+
+    :param string path: path of the file to write, precomputed tables of babelfish package if ``None``
+
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(__file__), *TABLES_PATH.split('/'))
+    with io.open(path, 'wb') as f:
+        f.write(json.dumps(build_tables(), sort_keys=True, indent=0, separators=(',', ':')).encode('ascii') + b'\n')
+
+
+if __name__ == '__main__':
+    build()
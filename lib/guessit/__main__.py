@@ -12,6 +12,7 @@ import os
 import sys
 
 import six
+from rebulk import Profiler
 from rebulk.__version__ import __version__ as __rebulk_version__
 
 from guessit import api
@@ -20,20 +21,22 @@ from guessit.jsonutils import GuessitEncoder
 from guessit.options import argument_parser, parse_options, load_config
 
 
-def guess_filename(filename, options):
+def guess_filename(filename, options, profiler=None):
     """
     Guess a single filename using given options
     :param filename: filename to parse
     :type filename: str
     :param options:
     :type options: dict
+    :param profiler:
+    :type profiler: Profiler
     :return:
     :rtype:
     """
     if not options.get('yaml') and not options.get('json') and not options.get('show_property'):
         print('For:', filename)
 
-    guess = api.guessit(filename, options)
+    guess = api.guessit(filename, options, profiler)
 
     if options.get('show_property'):
         print(guess.get(options.get('show_property'), ''))
@@ -152,9 +155,13 @@ def main(args=None):  # pylint:disable=too-many-branches
     filenames = list(filter(lambda f: f, filenames))
 
     if filenames:
+        profiler = Profiler() if options.get('profile') else None
         for filename in filenames:
             help_required = False
-            guess_filename(filename, options)
+            guess_filename(filename, options, profiler)
+        if profiler is not None:
+            print('GuessIt profile:', file=sys.stderr)
+            print(profiler.table(), file=sys.stderr)
 
     if help_required:  # pragma: no cover
         argument_parser.print_help()
@@ -8,6 +8,7 @@ try:
 except ImportError:  # pragma: no-cover
     from ordereddict import OrderedDict  # pylint:disable=import-error
 
+import sys
 import traceback
 
 import six
@@ -40,18 +41,52 @@ class GuessitException(Exception):
         self.string = string
         self.options = options
 
+    def __reduce__(self):
+        # Traceback of the original error is only available in message, so it can't be built again when unpickled.
+        return _unpickle_guessit_exception, (self.args[0], self.string, self.options)
 
-def guessit(string, options=None):
+
+def _unpickle_guessit_exception(message, string, options):
+    """
+    Rebuilds a GuessitException from a pickled one.
+    """
+    exception = Exception.__new__(GuessitException)
+    Exception.__init__(exception, message)
+    exception.string = string
+    exception.options = options
+    return exception
+
+
+def guessit(string, options=None, profiler=None):
     """
     Retrieves all matches from string as a dict
     :param string: the filename or release name
     :type string: str
     :param options: the filename or release name
     :type options: str|dict
+    :param profiler: profiler recording patterns and rules executions
+    :type profiler: rebulk.profiler.Profiler
     :return:
     :rtype:
     """
-    return default_api.guessit(string, options)
+    return default_api.guessit(string, options, profiler)
+
+
+def guessit_many(strings, options=None, processes=None, chunksize=16):
+    """
+    Retrieves all matches from each string as a dict, in the order of strings
+    :param strings: the filenames or release names
+    :type strings: iterable[str]
+    :param options: options used for all strings
+    :type options: str|dict
+    :param processes: number of worker processes, guess in current process if None or 1
+    :type processes: int
+    :param chunksize: number of strings sent to a worker process at once
+    :type chunksize: int
+    :return:
+    :rtype: generator
+    """
+    return default_api.guessit_many(strings, options, processes, chunksize)
 
 
 def properties(options=None):
@@ -89,48 +124,123 @@ class GuessItApi(object):
             return value.decode('ascii')
         return value
 
-    def guessit(self, string, options=None):
+    @staticmethod
+    def _parse_options(options):
+        """
+        Parse options and fix encoding of their keys and values.
+        :param options:
+        :type options: str|dict
+        :return:
+        :rtype: dict
+        """
+        options = parse_options(options, True)
+        fixed_options = {}
+        for (key, value) in options.items():
+            key = GuessItApi._fix_option_encoding(key)
+            value = GuessItApi._fix_option_encoding(value)
+            fixed_options[key] = value
+        return fixed_options
+
+    def _guessit(self, string, options, profiler=None):
+        """
+        Retrieves all matches from string as a dict, using options already parsed.
+        :param string:
+        :type string: str
+        :param options:
+        :type options: dict
+        :param profiler:
+        :type profiler: rebulk.profiler.Profiler
+        :return:
+        :rtype:
+        """
+        result_decode = False
+        result_encode = False
+
+        if six.PY2 and isinstance(string, six.text_type):
+            string = string.encode("utf-8")
+            result_decode = True
+        if six.PY3 and isinstance(string, six.binary_type):
+            string = string.decode('ascii')
+            result_encode = True
+        matches = self.rebulk.matches(string, options, profiler)
+        if result_decode:
+            for match in matches:
+                if isinstance(match.value, six.binary_type):
+                    match.value = match.value.decode("utf-8")
+        if result_encode:
+            for match in matches:
+                if isinstance(match.value, six.text_type):
+                    match.value = match.value.encode("ascii")
+        return matches.to_dict(options.get('advanced', False), options.get('single_value', False),
+                               options.get('enforce_list', False))
+
+    def guessit(self, string, options=None, profiler=None):
         """
         Retrieves all matches from string as a dict
         :param string: the filename or release name
         :type string: str
         :param options: the filename or release name
         :type options: str|dict
+        :param profiler: profiler recording patterns and rules executions
+        :type profiler: rebulk.profiler.Profiler
         :return:
         :rtype:
         """
         try:
-            options = parse_options(options, True)
-            result_decode = False
-            result_encode = False
-
-            fixed_options = {}
-            for (key, value) in options.items():
-                key = GuessItApi._fix_option_encoding(key)
-                value = GuessItApi._fix_option_encoding(value)
-                fixed_options[key] = value
-            options = fixed_options
-
-            if six.PY2 and isinstance(string, six.text_type):
-                string = string.encode("utf-8")
-                result_decode = True
-            if six.PY3 and isinstance(string, six.binary_type):
-                string = string.decode('ascii')
-                result_encode = True
-            matches = self.rebulk.matches(string, options)
-            if result_decode:
-                for match in matches:
-                    if isinstance(match.value, six.binary_type):
-                        match.value = match.value.decode("utf-8")
-            if result_encode:
-                for match in matches:
-                    if isinstance(match.value, six.text_type):
-                        match.value = match.value.encode("ascii")
-            return matches.to_dict(options.get('advanced', False), options.get('single_value', False),
-                                   options.get('enforce_list', False))
+            options = GuessItApi._parse_options(options)
+            return self._guessit(string, options, profiler)
         except:
             raise GuessitException(string, options)
 
+    def guessit_many(self, strings, options=None, processes=None, chunksize=16):
+        """
+        Retrieves all matches from each string as a dict, in the order of strings.
+
+        Options are parsed once for all strings. If processes is more than 1, strings are guessed by a pool of worker
+        processes and results are plain OrderedDict objects, so advanced option is not supported. A custom api can
+        only be used by worker processes started with fork, as its rules can't be pickled.
+
+        This is a generator: invalid options and unsupported arguments are raised by the first next() call, not when
+        this method is called.
+        :param strings: the filenames or release names
+        :type strings: iterable[str]
+        :param options: options used for all strings
+        :type options: str|dict
+        :param processes: number of worker processes, guess in current process if None or 1
+        :type processes: int
+        :param chunksize: number of strings sent to a worker process at once
+        :type chunksize: int
+        :return:
+        :rtype: generator
+        """
+        try:
+            options = GuessItApi._parse_options(options)
+        except:
+            raise GuessitException(None, options)
+
+        if not processes or processes == 1:
+            for string in strings:
+                try:
+                    result = self._guessit(string, options)
+                except:
+                    raise GuessitException(string, options)
+                yield result
+            return
+
+        if options.get('advanced'):
+            raise ValueError("advanced option is not supported when guessing in worker processes")
+        import multiprocessing  # only needed for worker processes, not imported with guessit
+        # default api is built again by worker processes if they are not forked.
+        api = None if self is default_api else self
+        if api is not None and not _forks_workers():
+            raise ValueError("custom api is only supported when worker processes are started with fork")
+        pool = multiprocessing.Pool(processes, _init_worker, (api, options))
+        try:
+            for result in pool.imap(_guessit_worker, strings, chunksize):
+                yield result
+        finally:
+            pool.terminate()
+
     def properties(self, options=None):
         """
         Grab properties and values that can be generated.
@@ -149,3 +259,37 @@ class GuessItApi(object):
 
 
 default_api = GuessItApi(rebulk_builder())
+
+_worker_api = None
+_worker_options = None
+
+
+def _forks_workers():
+    """
+    Checks if worker processes of multiprocessing are started with fork.
+    """
+    import multiprocessing
+    try:
+        return multiprocessing.get_start_method() == 'fork'
+    except AttributeError:  # python 2 forks on all platforms but Windows
+        return sys.platform != 'win32'
+
+
+def _init_worker(api, options):
+    """
+    Initializes a worker process of guessit_many, building effective patterns and rules for options.
+    """
+    global _worker_api, _worker_options  # pylint:disable=global-statement
+    _worker_api = api if api is not None else default_api
+    _worker_options = options
+    _worker_api.rebulk.matches('', options)
+
+
+def _guessit_worker(string):
+    """
+    Guess a string in a worker process of guessit_many.
+    """
+    try:
+        return OrderedDict(_worker_api._guessit(string, _worker_options))  # pylint:disable=protected-access
+    except:
+        raise GuessitException(string, _worker_options)
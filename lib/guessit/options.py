@@ -81,6 +81,8 @@ def build_argument_parser():
                                   help='Display property values that can be guessed.')
     information_opts.add_argument('--version', dest='version', action='store_true', default=None,
                                   help='Display the guessit version.')
+    information_opts.add_argument('--profile', dest='profile', action='store_true', default=None,
+                                  help='Display time spent in each pattern and rule.')
 
     return opts
 
@@ -42,12 +42,21 @@ def marker_comparator(matches, markers, predicate):
     :return:
     :rtype:
     """
+    weights = {}
+
+    def weight(marker):
+        """
+        Weight of a marker, computed once per span.
+        """
+        if marker.span not in weights:
+            weights[marker.span] = marker_weight(matches, marker, predicate)
+        return weights[marker.span]
 
     def comparator(marker1, marker2):
         """
         The actual comparator function.
         """
-        matches_count = marker_weight(matches, marker2, predicate) - marker_weight(matches, marker1, predicate)
+        matches_count = weight(marker2) - weight(marker1)
         if matches_count:
             return matches_count
         len_diff = len(marker2) - len(marker1)
@@ -70,4 +79,7 @@ def marker_sorted(markers, matches, predicate=marker_comparator_predicate):
     :return:
     :rtype:
     """
-    return sorted(markers, key=cmp_to_key(marker_comparator(matches, markers, predicate=predicate)))
+    markers = list(markers)
+    return list(matches.memoize(('marker_sorted', tuple(markers), predicate),
+                                lambda: sorted(markers, key=cmp_to_key(marker_comparator(matches, markers,
+                                                                                         predicate=predicate)))))
@@ -3,22 +3,40 @@
 """
 Date
 """
-from dateutil import parser
+from datetime import date as _date
+import time
 
 from rebulk.remodule import re
 
-_dsep = r'[-/ \.]'
-_dsep_bis = r'[-/ \.x]'
+_dsep = frozenset('-/ .')
+_dsep_bis = frozenset('-/ .xX')
+_dsep_regexp = r'[-/ \.]'
 
-date_regexps = [
-    re.compile(r'%s((\d{8}))%s' % (_dsep, _dsep), re.IGNORECASE),
-    re.compile(r'%s((\d{6}))%s' % (_dsep, _dsep), re.IGNORECASE),
-    re.compile(r'(?:^|[^\d])((\d{2})%s(\d{1,2})%s(\d{1,2}))(?:$|[^\d])' % (_dsep, _dsep), re.IGNORECASE),
-    re.compile(r'(?:^|[^\d])((\d{1,2})%s(\d{1,2})%s(\d{2}))(?:$|[^\d])' % (_dsep, _dsep), re.IGNORECASE),
-    re.compile(r'(?:^|[^\d])((\d{4})%s(\d{1,2})%s(\d{1,2}))(?:$|[^\d])' % (_dsep_bis, _dsep), re.IGNORECASE),
-    re.compile(r'(?:^|[^\d])((\d{1,2})%s(\d{1,2})%s(\d{4}))(?:$|[^\d])' % (_dsep, _dsep_bis), re.IGNORECASE),
-    re.compile(r'(?:^|[^\d])((\d{1,2}(?:st|nd|rd|th)?%s(?:[a-z]{3,10})%s\d{4}))(?:$|[^\d])' % (_dsep, _dsep),
-               re.IGNORECASE)]
+_digits_re = re.compile(r'\d+')
+
+#: Numeric date forms, in order of priority: allowed lengths of each group of digits, and allowed separators before
+#: and after a single group or between groups.
+numeric_date_forms = [
+    (((8,),), (_dsep, _dsep)),
+    (((6,),), (_dsep, _dsep)),
+    (((2,), (1, 2), (1, 2)), (_dsep, _dsep)),
+    (((1, 2), (1, 2), (2,)), (_dsep, _dsep)),
+    (((4,), (1, 2), (1, 2)), (_dsep_bis, _dsep)),
+    (((1, 2), (1, 2), (4,)), (_dsep, _dsep_bis)),
+]
+
+textual_date_regexp = re.compile(r'(?:^|[^\d])((\d{1,2})(?:st|nd|rd|th)?%s([a-z]{3,10})%s(\d{4}))(?:$|[^\d])' %
+                                 (_dsep_regexp, _dsep_regexp), re.IGNORECASE)
+
+#: Month names recognized by dateutil parser, lowercased
+MONTHS = {'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4, 'april': 4, 'may': 5,
+          'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9,
+          'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12}
+
+#: Other words of textual dates having a meaning for dateutil parser, lowercased. Dates with any other word are invalid.
+DATEUTIL_WORDS = frozenset(['mon', 'monday', 'tue', 'tuesday', 'wed', 'wednesday', 'thu', 'thursday', 'fri', 'friday',
+                            'sat', 'saturday', 'sun', 'sunday', 'hour', 'hours', 'minute', 'minutes', 'second',
+                            'seconds', 'and', 'utc', 'gmt'])
 
 
 def valid_year(year):
@@ -67,6 +85,198 @@ def _guess_day_first_parameter(groups):
         return True
 
 
+def _convert_year(year):
+    """
+    Convert a two digits year to the nearest year from today, like dateutil parser.
+
+    :param year:
+    :type year: int
+    :return:
+    :rtype: int
+    """
+    if year < 100:
+        current_year = time.localtime().tm_year
+        year += current_year // 100 * 100
+        if abs(year - current_year) >= 50:
+            if year < current_year:
+                year += 100
+            else:
+                year -= 100
+    return year
+
+
+def _resolve_date(ymd, month_index, day_first, year_first):
+    """
+    Build the date of 3 numbers, ordered like dateutil parser would.
+
+    :param ymd: numbers found in the date
+    :type ymd: list[int]
+    :param month_index: index of the number given by a month name, None if all numbers are digits
+    :type month_index: int
+    :param day_first:
+    :type day_first: bool
+    :param year_first:
+    :type year_first: bool
+    :return: the date, or None if it's not a valid date
+    :rtype: datetime.date
+    """
+    first, second, third = ymd
+    if month_index == 1:
+        if first > 31 or (year_first and third <= 31):
+            year, month, day = ymd
+        else:
+            day, month, year = ymd
+    elif first > 31 or (year_first and second <= 12 and third <= 31):
+        year, month, day = ymd
+    elif first > 12 or (day_first and second <= 12):
+        day, month, year = ymd
+    else:
+        month, day, year = ymd
+    try:
+        return _date(_convert_year(year), month, day)
+    except ValueError:
+        return None
+
+
+def _is_ascii(string):
+    """
+    Check if the string contains only ascii characters, as dateutil parser only knows ascii digits.
+
+    :param string:
+    :type string: str
+    :return:
+    :rtype: bool
+    """
+    for char in string:
+        if ord(char) >= 128:
+            return False
+    return True
+
+
+def _parse_date(string, day_first, year_first):
+    """
+    Parse a date with dateutil parser, imported on first use.
+
+    :param string:
+    :type string: str
+    :param day_first:
+    :type day_first: bool
+    :param year_first:
+    :type year_first: bool
+    :return: the date, or None if it's not a valid date
+    :rtype: datetime.date
+    """
+    from dateutil import parser
+    try:
+        return parser.parse(string, dayfirst=day_first, yearfirst=year_first).date()  # pylint:disable=no-member
+    except (ValueError, TypeError):  # pragma: no cover
+        # see https://bugs.launchpad.net/dateutil/+bug/1247643
+        return None
+
+
+def _search_numeric_date(string, spans, links, lengths, separators):
+    """
+    Search the first groups of digits matching a numeric date form.
+
+    :param string:
+    :type string: str
+    :param spans: spans of all groups of digits in string
+    :type spans: list[tuple]
+    :param links: separator between each group of digits and the next one, None if it's not a single separator
+    :type links: list[str]
+    :param lengths: allowed lengths of each group
+    :type lengths: tuple
+    :param separators: allowed separators
+    :type separators: tuple
+    :return: spans of matching groups
+    :rtype: list[tuple]
+    """
+    if len(lengths) == 1:
+        for start, end in spans:
+            if end - start in lengths[0] and 0 < start and end < len(string) and \
+                    string[start - 1] in separators[0] and string[end] in separators[1]:
+                return [(start, end)]
+    else:
+        for i in range(len(spans) - 2):
+            if links[i] in separators[0] and links[i + 1] in separators[1]:
+                group_spans = spans[i:i + 3]
+                for (start, end), allowed in zip(group_spans, lengths):
+                    if end - start not in allowed:
+                        break
+                else:
+                    return group_spans
+
+
+def _iter_date_candidates(string):
+    """
+    Iterate the first match of each date form, in order of priority.
+
+    Groups of digits are scanned once for all numeric forms, which are skipped when no group could start a date.
+    Textual form is searched only if a group of 4 digits could end it.
+
+    :param string:
+    :type string: str
+    :return: start, end, groups and a function building the date from day_first and year_first options
+    :rtype: iterable[tuple]
+    """
+    spans = [digits.span() for digits in _digits_re.finditer(string)]
+    links = [string[end] if next_start - end == 1 and string[end] in _dsep_bis else None
+             for (_, end), (next_start, _) in zip(spans, spans[1:])]
+    if any(end - start in (6, 8) for start, end in spans) or \
+            any(link is not None and next_link is not None for link, next_link in zip(links, links[1:])):
+        for lengths, separators in numeric_date_forms:
+            group_spans = _search_numeric_date(string, spans, links, lengths, separators)
+            if not group_spans:
+                continue
+            groups = tuple(string[start:end] for start, end in group_spans)
+            if not _is_ascii(''.join(groups)):
+                yield group_spans[0][0], group_spans[-1][1], groups, \
+                    lambda day_first, year_first, match='-'.join(groups): _parse_date(match, day_first, year_first)
+                continue
+            if len(groups) == 1:
+                digits = groups[0]
+                if len(digits) == 8:
+                    ymd = [int(digits[:4]), int(digits[4:6]), int(digits[6:])]
+                else:
+                    ymd = [_convert_year(int(digits[:2])), int(digits[2:4]), int(digits[4:])]
+            else:
+                ymd = [int(group) for group in groups]
+            yield group_spans[0][0], group_spans[-1][1], groups, \
+                lambda day_first, year_first, ymd=ymd: _resolve_date(ymd, None, day_first, year_first)
+
+    if any(end - start == 4 and start > 0 and string[start - 1] in _dsep for start, end in spans):
+        search_match = textual_date_regexp.search(string)
+        if search_match:
+            yield search_match.start(1), search_match.end(1), (search_match.group(1),), \
+                lambda day_first, year_first: _resolve_textual_date(search_match, day_first, year_first)
+
+
+def _resolve_textual_date(search_match, day_first, year_first):
+    """
+    Build the date of a textual date match, like 12th-March-2014.
+
+    Month names are looked up in MONTHS, dateutil parser is only used for DATEUTIL_WORDS and non ascii dates.
+
+    :param search_match:
+    :type search_match:
+    :param day_first:
+    :type day_first: bool
+    :param year_first:
+    :type year_first: bool
+    :return: the date, or None if it's not a valid date
+    :rtype: datetime.date
+    """
+    if _is_ascii(search_match.group(1)):
+        word = search_match.group(3).lower()
+        month = MONTHS.get(word)
+        if month:
+            return _resolve_date([int(search_match.group(2)), month, int(search_match.group(4))], 1,
+                                 day_first, year_first)
+        if word not in DATEUTIL_WORDS:
+            return None
+    return _parse_date(search_match.group(1), day_first, year_first)
+
+
 def search_date(string, year_first=None, day_first=None):
     """Looks for date patterns, and if found return the date and group span.
 
@@ -82,27 +292,19 @@ def search_date(string, year_first=None, day_first=None):
     >>> search_date(' And this on 17-06-1998. ')
     (13, 23, datetime.date(1998, 6, 17))
 
+    >>> search_date(' Or on 12th-March-2014. ')
+    (7, 22, datetime.date(2014, 3, 12))
+
     >>> search_date(' no date in here ')
     """
-    for date_re in date_regexps:
-        search_match = date_re.search(string)
-        if not search_match:
-            continue
-
-        start, end = search_match.start(1), search_match.end(1)
-        groups = search_match.groups()[1:]
-        match = '-'.join(groups)
-
-        if match is None:
-            continue
-
+    for start, end, groups, build_date in _iter_date_candidates(string):
         if year_first and day_first is None:
             day_first = False
 
         if day_first is None:
             day_first = _guess_day_first_parameter(groups)
 
-        # If day_first/year_first is undefined, parse is made using both possible values.
+        # If day_first/year_first is undefined, date is built using both possible values.
         yearfirst_opts = [False, True]
         if year_first is not None:
             yearfirst_opts = [year_first]
@@ -111,15 +313,10 @@ def search_date(string, year_first=None, day_first=None):
         if day_first is not None:
             dayfirst_opts = [day_first]
 
-        kwargs_list = ({'dayfirst': d, 'yearfirst': y}
-                       for d in dayfirst_opts for y in yearfirst_opts)
-        for kwargs in kwargs_list:
-            try:
-                date = parser.parse(match, **kwargs)
-            except (ValueError, TypeError):  # pragma: no cover
-                # see https://bugs.launchpad.net/dateutil/+bug/1247643
-                date = None
-
-            # check date plausibility
-            if date and valid_year(date.year):  # pylint:disable=no-member
-                return start, end, date.date()  # pylint:disable=no-member
+        for day_first_opt in dayfirst_opts:
+            for year_first_opt in yearfirst_opts:
+                date = build_date(day_first_opt, year_first_opt)
+
+                # check date plausibility
+                if date and valid_year(date.year):
+                    return start, end, date
@@ -181,6 +181,7 @@ class SeasonYear(Rule):
     """
     priority = POST_PROCESS
     consequence = AppendMatch
+    trigger_names = ['season']
 
     def when(self, matches, context):
         ret = []
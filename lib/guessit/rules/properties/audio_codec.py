@@ -77,6 +77,7 @@ class AudioValidatorRule(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_names = audio_properties
 
     def when(self, matches, context):
         ret = []
@@ -106,6 +107,7 @@ class AudioProfileRule(Rule):
     priority = 64
     dependency = AudioValidatorRule
     consequence = RemoveMatch
+    trigger_names = ['audio_profile']
 
     def __init__(self, codec):
         super(AudioProfileRule, self).__init__()
@@ -157,6 +159,7 @@ class HqConflictRule(Rule):
 
     dependency = [DtsRule, AacRule, Ac3Rule]
     consequence = RemoveMatch
+    trigger_names = ['audio_profile']
 
     def when(self, matches, context):
         hq_audio = matches.named('audio_profile', lambda match: match.value == 'HQ')
@@ -173,6 +176,7 @@ class AudioChannelsValidatorRule(Rule):
     """
     priority = 128
     consequence = RemoveMatch
+    trigger_tags = ['weak-audio_channels']
 
     def when(self, matches, context):
         ret = []
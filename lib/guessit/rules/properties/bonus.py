@@ -39,6 +39,7 @@ class BonusTitleRule(Rule):
     consequence = AppendMatch
 
     properties = {'bonus_title': [None]}
+    trigger_names = ['bonus']
 
     def when(self, matches, context):
         bonus_number = matches.named('bonus', lambda match: not match.private, index=0)
@@ -48,6 +48,7 @@ class KeepMarkedYearInFilepart(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_names = ['year']
 
     def when(self, matches, context):
         ret = []
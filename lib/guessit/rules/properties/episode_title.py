@@ -47,6 +47,7 @@ class RemoveConflictsWithEpisodeTitle(Rule):
                            'video_codec', 'audio_codec', 'other', 'container')
         self.affected_if_holes_after = ('part', )
         self.affected_names = ('part', 'year')
+        self.trigger_names = self.affected_names
 
     def when(self, matches, context):
         to_remove = []
@@ -93,6 +94,7 @@ class TitleToEpisodeTitle(Rule):
     If multiple different title are found, convert the one following episode number to episode_title.
     """
     dependency = TitleFromPosition
+    trigger_names = ['title']
 
     def when(self, matches, context):
         titles = matches.named('title')
@@ -162,6 +164,7 @@ class AlternativeTitleReplace(Rule):
     """
     dependency = EpisodeTitleFromPosition
     consequence = RenameMatch
+    trigger_names = ['alternative_title']
 
     def __init__(self, previous_names):
         super(AlternativeTitleReplace, self).__init__()
@@ -201,6 +204,7 @@ class RenameEpisodeTitleWhenMovieType(Rule):
 
     dependency = TypeProcessor
     consequence = RenameMatch
+    trigger_names = ['episode_title']
 
     def when(self, matches, context):
         if matches.named('episode_title', lambda m: 'alternative-replaced' not in m.tags) \
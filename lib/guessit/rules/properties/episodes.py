@@ -326,6 +326,7 @@ class CountValidator(Rule):
     consequence = [RemoveMatch, RenameMatch('episode_count'), RenameMatch('season_count')]
 
     properties = {'episode_count': [None], 'season_count': [None]}
+    trigger_names = ['count']
 
     def when(self, matches, context):
         to_remove = []
@@ -350,6 +351,7 @@ class SeePatternRange(Rule):
     """
     priority = 128
     consequence = [RemoveMatch, AppendMatch]
+    trigger_tags = ['see-pattern']
 
     def __init__(self, range_separators):
         super(SeePatternRange, self).__init__()
@@ -390,6 +392,7 @@ class AbstractSeparatorRange(Rule):
         super(AbstractSeparatorRange, self).__init__()
         self.range_separators = range_separators
         self.property_name = property_name
+        self.trigger_names = [property_name + 'Separator', property_name]
 
     def when(self, matches, context):
         to_remove = []
@@ -487,6 +490,7 @@ class RemoveWeakIfSxxExx(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_tags = ['SxxExx']
 
     def when(self, matches, context):
         to_remove = []
@@ -504,6 +508,7 @@ class RemoveInvalidSeason(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_tags = ['SxxExx']
 
     def when(self, matches, context):
         to_remove = []
@@ -532,6 +537,7 @@ class RemoveInvalidEpisode(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_tags = ['SxxExx']
 
     def when(self, matches, context):
         to_remove = []
@@ -569,6 +575,7 @@ class RemoveWeakDuplicate(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_tags = ['weak-duplicate']
 
     def when(self, matches, context):
         to_remove = []
@@ -589,6 +596,7 @@ class EpisodeDetailValidator(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_names = ['episode_details']
 
     def when(self, matches, context):
         ret = []
@@ -609,6 +617,7 @@ class RemoveDetachedEpisodeNumber(Rule):
     priority = 64
     consequence = RemoveMatch
     dependency = [RemoveWeakIfSxxExx, RemoveWeakDuplicate]
+    trigger_names = ['episode']
 
     def when(self, matches, context):
         ret = []
@@ -638,6 +647,7 @@ class VersionValidator(Rule):
     priority = 64
     dependency = [RemoveWeakIfMovie, RemoveWeakIfSxxExx]
     consequence = RemoveMatch
+    trigger_names = ['version']
 
     def when(self, matches, context):
         ret = []
@@ -655,6 +665,7 @@ class EpisodeSingleDigitValidator(Rule):
     dependency = [TitleFromPosition]
 
     consequence = RemoveMatch
+    trigger_names = ['episode']
 
     def when(self, matches, context):
         ret = []
@@ -32,6 +32,7 @@ class FilmTitleRule(Rule):
     consequence = AppendMatch
 
     properties = {'film_title': [None]}
+    trigger_names = ['film']
 
     def when(self, matches, context):
         bonus_number = matches.named('film', lambda match: not match.private, index=0)
@@ -55,6 +55,7 @@ class ValidateFormat(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_names = ['format']
 
     def when(self, matches, context):
         ret = []
@@ -62,48 +62,114 @@ class GuessitConverter(babelfish.LanguageReverseConverter):  # pylint: disable=m
         for (alpha3, country), synlist in SYN.items():
             for syn in synlist:
                 self.guessit_exceptions[syn.lower()] = (alpha3, country, None)
+        self._codes = None
+        self._reversed = None
+        self._languages = {}
+        self._interned = {}
 
     @property
     def codes(self):  # pylint: disable=missing-docstring
-        return (babelfish.language_converters['alpha3b'].codes |
-                babelfish.language_converters['alpha2'].codes |
-                babelfish.language_converters['name'].codes |
-                babelfish.language_converters['opensubtitles'].codes |
-                babelfish.country_converters['name'].codes |
-                frozenset(self.guessit_exceptions.keys()))
+        if self._codes is None:
+            self._codes = (babelfish.language_converters['alpha3b'].codes |
+                           babelfish.language_converters['alpha2'].codes |
+                           babelfish.language_converters['name'].codes |
+                           babelfish.language_converters['opensubtitles'].codes |
+                           babelfish.country_converters['name'].codes |
+                           frozenset(self.guessit_exceptions.keys()))
+        return self._codes
+
+    @staticmethod
+    def _reversed_items(converter):
+        """
+        Lowercased codes of a babelfish converter with their reversed value.
+        :param converter:
+        :type converter: babelfish.LanguageReverseConverter
+        :return:
+        :rtype: list[(str, tuple)]
+        """
+        from_symbol = getattr(converter, 'from_symbol', None)
+        if isinstance(from_symbol, babelfish.converters.CaseInsensitiveDict):
+            return list(from_symbol.lower_items())
+        items = []
+        for code in converter.codes:
+            code = code.lower()
+            try:
+                items.append((code, converter.reverse(code)))
+            except babelfish.LanguageReverseError:
+                pass
+        return items
+
+    @property
+    def reversed(self):
+        """
+        Single case-insensitive map of accepted names to (alpha3, country, script), built on first access.
+
+        Converters are merged from the lowest priority to the highest, so that a name gets the value of the first
+        converter accepting it: exceptions, alpha3, alpha3b, alpha2, name and opensubtitles. Names containing a
+        country are left to the with country parsing of ``reverse``.
+        :return:
+        :rtype: dict
+        """
+        if self._reversed is None:
+            items = []
+            for converter in ('opensubtitles', 'name', 'alpha2', 'alpha3b'):
+                items.extend(self._reversed_items(babelfish.language_converters[converter]))
+            items.extend((alpha3, (alpha3, None, None)) for alpha3 in babelfish.LANGUAGES)
+            items.extend(self.guessit_exceptions.items())
+            self._reversed = dict((name, code) for name, code in items
+                                  if code[0] in babelfish.LANGUAGES and
+                                  (code[1] is None or code[1] in babelfish.COUNTRIES) and
+                                  not self._with_country(name))
+        return self._reversed
+
+    @staticmethod
+    def _with_country(name):
+        """
+        Match a name containing a country, like pt-BR or French (France).
+        :param name:
+        :type name: str
+        :return:
+        """
+        return (GuessitConverter._with_country_regexp.match(name) or
+                GuessitConverter._with_country_regexp2.match(name))
 
     def convert(self, alpha3, country=None, script=None):
         return str(babelfish.Language(alpha3, country, script))
 
     def reverse(self, name):  # pylint:disable=arguments-differ
-        with_country = (GuessitConverter._with_country_regexp.match(name) or
-                        GuessitConverter._with_country_regexp2.match(name))
+        lang = self.language(name)
+        return lang.alpha3, lang.country.alpha2 if lang.country else None, lang.script or None
 
-        name = name.lower()
-        if with_country:
-            lang = babelfish.Language.fromguessit(with_country.group(1).strip())
-            lang.country = babelfish.Country.fromguessit(with_country.group(2).strip())
-            return lang.alpha3, lang.country.alpha2 if lang.country else None, lang.script or None
+    def language(self, name):
+        """
+        Get the Language of a name, like ``babelfish.Language.fromguessit``.
 
-        # exceptions come first, as they need to override a potential match
-        # with any of the other guessers
+        Languages are interned, the same object is returned for all names of a language, so it must not be modified.
+        :param name:
+        :type name: str
+        :return:
+        :rtype: babelfish.Language
+        """
+        key = name.lower()
         try:
-            return self.guessit_exceptions[name]
+            return self._languages[key]
         except KeyError:
             pass
 
-        for conv in [babelfish.Language,
-                     babelfish.Language.fromalpha3b,
-                     babelfish.Language.fromalpha2,
-                     babelfish.Language.fromname,
-                     babelfish.Language.fromopensubtitles]:
-            try:
-                reverse = conv(name)
-                return reverse.alpha3, reverse.country, reverse.script
-            except (ValueError, babelfish.LanguageReverseError):
-                pass
+        code = self.reversed.get(key)
+        if code is None:
+            with_country = self._with_country(name)
+            if not with_country:
+                raise babelfish.LanguageReverseError(name)
+            lang = self.language(with_country.group(1).strip())
+            country = babelfish.Country.fromguessit(with_country.group(2).strip())
+            code = (lang.alpha3, country.alpha2, lang.script.code if lang.script else None)
 
-        raise babelfish.LanguageReverseError(name)
+        lang = self._interned.get(code)
+        if lang is None:
+            lang = self._interned[code] = babelfish.Language(*code)
+        self._languages[key] = lang
+        return lang
 
 
 def length_comparator(value):
@@ -131,6 +197,56 @@ lang_prefixes = sorted(lang_both + ['true'], key=length_comparator)
 
 weak_prefixes = ('audio', 'true')
 
+
+class AffixTrie(object):
+    """
+    Character trie of affixes, to find all affixes of a word in a single walk.
+
+    Affixes are given as a dict of property name -> list of affixes, suffixes are stored reversed. The end of an
+    affix is marked with key None, holding the property names of the affix.
+    """
+
+    def __init__(self, affixes, suffix=False):
+        self.affixes = affixes
+        self.suffix = suffix
+        self.trie = {}
+        for key, parts in affixes.items():
+            for part in parts:
+                node = self.trie
+                for char in (reversed(part) if suffix else part):
+                    node = node.setdefault(char, {})
+                keys = node.setdefault(None, [])
+                if key not in keys:
+                    keys.append(key)
+
+    def iter_affixes(self, word):
+        """
+        Iterate affixes of a word, ordered by property name like affixes dict, then by affix length.
+        :param word:
+        :type word: str
+        :return: tuples of property name, affix and word without the affix
+        :rtype: iterable[(str, str, str)]
+        """
+        found = []
+        node = self.trie
+        for length, char in enumerate(reversed(word) if self.suffix else word, 1):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found.append((length, node[None]))
+        for key in self.affixes:
+            for length, keys in found:
+                if key in keys:
+                    if self.suffix:
+                        yield key, word[len(word) - length:], word[:len(word) - length]
+                    else:
+                        yield key, word[:length], word[length:]
+
+
+prefixes_trie = AffixTrie(dict(subtitle_language=subtitle_prefixes, language=lang_prefixes))
+suffixes_trie = AffixTrie(dict(subtitle_language=subtitle_suffixes, language=lang_suffixes), suffix=True)
+
 _LanguageMatch = namedtuple('_LanguageMatch', ['property_name', 'word', 'lang'])
 
 
@@ -248,22 +364,12 @@ class LanguageFinder(object):
         """
         Return language matches for the given candidate word.
         """
-        tuples = [
-            (language_word, language_word.next_word,
-             dict(subtitle_language=subtitle_prefixes, language=lang_prefixes),
-             lambda string, prefix: string.startswith(prefix),
-             lambda string, prefix: string[len(prefix):]),
-            (language_word.next_word, language_word,
-             dict(subtitle_language=subtitle_suffixes, language=lang_suffixes),
-             lambda string, suffix: string.endswith(suffix),
-             lambda string, suffix: string[:len(string) - len(suffix)])
-        ]
-
-        for word, fallback_word, affixes, is_affix, strip_affix in tuples:
+        for word, fallback_word, affixes in ((language_word, language_word.next_word, prefixes_trie),
+                                             (language_word.next_word, language_word, suffixes_trie)):
             if not word:
                 continue
 
-            match = self.find_match_for_word(word, fallback_word, affixes, is_affix, strip_affix)
+            match = self.find_match_for_word(word, fallback_word, affixes)
             if match:
                 yield match
 
@@ -271,9 +377,11 @@ class LanguageFinder(object):
         if match:
             yield match
 
-    def find_match_for_word(self, word, fallback_word, affixes, is_affix, strip_affix):
+    def find_match_for_word(self, word, fallback_word, affixes):
         """
         Return the language match for the given word and affixes.
+        :param affixes: prefixes_trie or suffixes_trie
+        :type affixes: AffixTrie
         """
         for current_word in (word.extended_word, word):
             if not current_word:
@@ -283,26 +391,21 @@ class LanguageFinder(object):
             if word_lang in self.common_words:
                 continue
 
-            for key, parts in affixes.items():
-                for part in parts:
-                    if not is_affix(word_lang, part):
-                        continue
-
-                    match = None
-                    value = strip_affix(word_lang, part)
-                    if not value:
-                        if fallback_word:
-                            match = self.find_language_match_for_word(fallback_word, key=key, force=True)
-
-                        if not match and part not in weak_prefixes:
-                            match = self.create_language_match(key, LanguageWord(current_word.start, current_word.end,
-                                                                                 'und', current_word.input_string))
-                    elif value not in self.common_words:
+            for key, part, value in affixes.iter_affixes(word_lang):
+                match = None
+                if not value:
+                    if fallback_word:
+                        match = self.find_language_match_for_word(fallback_word, key=key, force=True)
+
+                    if not match and part not in weak_prefixes:
                         match = self.create_language_match(key, LanguageWord(current_word.start, current_word.end,
-                                                                             value, current_word.input_string))
+                                                                             'und', current_word.input_string))
+                elif value not in self.common_words:
+                    match = self.create_language_match(key, LanguageWord(current_word.start, current_word.end,
+                                                                         value, current_word.input_string))
 
-                    if match:
-                        return match
+                if match:
+                    return match
 
     def find_language_match_for_word(self, word, key='language', force=False):
         """
@@ -333,7 +436,7 @@ class LanguageFinder(object):
             return self.parsed[lang_word]
 
         try:
-            lang = babelfish.Language.fromguessit(lang_word)
+            lang = babelfish.language_converters['guessit'].language(lang_word)
             if self.allowed_languages:
                 if (hasattr(lang, 'name') and lang.name.lower() in self.allowed_languages) \
                         or (hasattr(lang, 'alpha2') and lang.alpha2.lower() in self.allowed_languages) \
@@ -366,6 +469,7 @@ class SubtitlePrefixLanguageRule(Rule):
     consequence = RemoveMatch
 
     properties = {'subtitle_language': [None]}
+    trigger_names = ['language', 'subtitle_language.prefix']
 
     def when(self, matches, context):
         to_rename = []
@@ -411,6 +515,7 @@ class SubtitleSuffixLanguageRule(Rule):
     consequence = RemoveMatch
 
     properties = {'subtitle_language': [None]}
+    trigger_names = ['language', 'subtitle_language.suffix']
 
     def when(self, matches, context):
         to_append = []
@@ -441,6 +546,7 @@ class SubtitleExtensionRule(Rule):
     consequence = [RemoveMatch, RenameMatch('subtitle_language')]
 
     properties = {'subtitle_language': [None]}
+    trigger_names = ['container']
 
     def when(self, matches, context):
         subtitle_extension = matches.named('container',
@@ -115,6 +115,7 @@ class ProperCountRule(Rule):
     consequence = AppendMatch
 
     properties = {'proper_count': [None]}
+    trigger_names = ['other']
 
     def when(self, matches, context):
         propers = matches.named('other', lambda match: match.value == 'Proper')
@@ -133,6 +134,7 @@ class ValidateHasNeighbor(Rule):
     Validate tag has-neighbor
     """
     consequence = RemoveMatch
+    trigger_tags = ['has-neighbor']
 
     def when(self, matches, context):
         ret = []
@@ -158,6 +160,7 @@ class ValidateHasNeighborBefore(Rule):
     Validate tag has-neighbor-before that previous match exists.
     """
     consequence = RemoveMatch
+    trigger_tags = ['has-neighbor-before']
 
     def when(self, matches, context):
         ret = []
@@ -177,6 +180,7 @@ class ValidateHasNeighborAfter(Rule):
     Validate tag has-neighbor-after that next match exists.
     """
     consequence = RemoveMatch
+    trigger_tags = ['has-neighbor-after']
 
     def when(self, matches, context):
         ret = []
@@ -197,6 +201,7 @@ class ValidateScreenerRule(Rule):
     """
     consequence = RemoveMatch
     priority = 64
+    trigger_names = ['other']
 
     def when(self, matches, context):
         ret = []
@@ -213,6 +218,7 @@ class ValidateMuxRule(Rule):
     """
     consequence = RemoveMatch
     priority = 64
+    trigger_names = ['other']
 
     def when(self, matches, context):
         ret = []
@@ -228,6 +234,7 @@ class ValidateHardcodedSubs(Rule):
 
     priority = 32
     consequence = RemoveMatch
+    trigger_names = ['other']
 
     def when(self, matches, context):
         to_remove = []
@@ -253,6 +260,7 @@ class ValidateStreamingServiceNeighbor(Rule):
 
     priority = 32
     consequence = RemoveMatch
+    trigger_names = ['other']
 
     def when(self, matches, context):
         to_remove = []
@@ -66,6 +66,7 @@ class ScreenSizeOnlyOne(Rule):
     Keep a single screen_size pet filepath part.
     """
     consequence = RemoveMatch
+    trigger_names = ['screen_size']
 
     def when(self, matches, context):
         to_remove = []
@@ -83,6 +84,7 @@ class RemoveScreenSizeConflicts(Rule):
     Remove season and episode matches which conflicts with screen_size match.
     """
     consequence = RemoveMatch
+    trigger_names = ['screen_size']
 
     def when(self, matches, context):
         to_remove = []
@@ -77,6 +77,7 @@ class ValidateStreamingService(Rule):
 
     priority = 32
     consequence = RemoveMatch
+    trigger_names = ['streaming_service']
 
     def when(self, matches, context):
         """Streaming service is always before format.
@@ -291,6 +291,7 @@ class PreferTitleWithYear(Rule):
     consequence = [RemoveMatch, AppendTags(['equivalent-ignore'])]
 
     properties = {'title': [None]}
+    trigger_names = ['title']
 
     def when(self, matches, context):
         with_year_in_group = []
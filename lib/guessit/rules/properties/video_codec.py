@@ -56,6 +56,7 @@ class ValidateVideoCodec(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_names = ['video_codec']
 
     def when(self, matches, context):
         ret = []
@@ -76,6 +77,7 @@ class VideoProfileRule(Rule):
     Rule to validate video_profile
     """
     consequence = RemoveMatch
+    trigger_names = ['video_profile']
 
     def when(self, matches, context):
         profile_list = matches.named('video_profile', lambda match: 'video_profile.rule' in match.tags)
@@ -3,7 +3,8 @@
 """
 Website property.
 """
-from pkg_resources import resource_stream  # @UnresolvedImport
+from pkgutil import get_data
+
 from rebulk.remodule import re
 
 from rebulk import Rebulk, Rule, RemoveMatch
@@ -23,7 +24,7 @@ def website():
     rebulk.defaults(name="website")
 
     tlds = [l.strip().decode('utf-8')
-            for l in resource_stream('guessit', 'tlds-alpha-by-domain.txt').readlines()
+            for l in get_data('guessit', 'tlds-alpha-by-domain.txt').splitlines()
             if b'--' not in l][1:]  # All registered domain extension
 
     safe_tlds = ['com', 'org', 'net']  # For sure a website extension
@@ -54,6 +55,7 @@ def website():
         If found match is more likely a title, remove website.
         """
         consequence = RemoveMatch
+        trigger_names = ['website']
 
         @staticmethod
         def valid_followers(match):
@@ -87,6 +89,7 @@ class ValidateWebsitePrefix(Rule):
     """
     priority = 64
     consequence = RemoveMatch
+    trigger_tags = ['website.prefix']
 
     def when(self, matches, context):
         to_remove = []
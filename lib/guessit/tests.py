@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of guessit api and rules.
+
+Run from the lib directory: python -m guessit.tests
+"""
+import random
+import re
+from unittest import TestCase, TestSuite, TestLoader, TextTestRunner
+
+import babelfish
+from dateutil import parser
+
+from .api import guessit, guessit_many, GuessitException
+from .rules.common.date import search_date, valid_year, _guess_day_first_parameter
+from .rules.common.words import iter_words
+from .rules.properties import language
+
+STRINGS = ['The.Walking.Dead.2010.S01E04.BluRay.1080p.DD5.1.x264-CHD.mkv',
+           'Fargo.1996.REMASTERED.BluRay.720p.H264-20-40.mp4',
+           'The.Daily.Show.2013.06.27.Tom.Goldstein.HDTV.x264-FQM.mkv',
+           'Castle.S01E02E03.720p.BluRay.x264-SiNNERS.mkv',
+           '2001 A Space Odyssey (1968).mkv']
+
+
+class TestGuessitMany(TestCase):
+    """
+    guessit_many gives the results of guessit, in the current process or in worker processes.
+    """
+    options = {'allowed_languages': [], 'allowed_countries': []}
+
+    def expected(self):
+        return [guessit(string, self.options) for string in STRINGS]
+
+    def test_current_process(self):
+        self.assertEqual(list(guessit_many(STRINGS, self.options)), self.expected())
+        self.assertEqual(list(guessit_many(STRINGS, self.options, processes=1)), self.expected())
+
+    def test_worker_processes(self):
+        results = list(guessit_many(STRINGS, self.options, processes=2, chunksize=2))
+        self.assertEqual([list(result.items()) for result in results],
+                         [list(result.items()) for result in self.expected()])
+
+    def test_exception(self):
+        for processes in (None, 2):
+            with self.assertRaises(GuessitException) as context:
+                list(guessit_many(STRINGS[:1] + [123], processes=processes))
+            self.assertEqual(context.exception.string, 123)
+
+    def test_advanced_in_worker_processes(self):
+        # raised by the first next() call of the generator
+        results = guessit_many(STRINGS, {'advanced': True}, processes=2)
+        self.assertRaises(ValueError, next, results)
+
+
+def language_chain(converter, name):
+    """
+    Previous language lookup: names with a country, exceptions of guessit, then babelfish converters tried in
+    sequence.
+    :param converter: guessit language converter
+    :param name:
+    :return: the language, None if the name is not a language
+    :rtype: babelfish.Language
+    """
+    with_country = converter._with_country(name)  # pylint:disable=protected-access
+    name = name.lower()
+    if with_country:
+        lang = language_chain(converter, with_country.group(1).strip())
+        if lang is None:
+            return None
+        return babelfish.Language(lang.alpha3, babelfish.Country.fromguessit(with_country.group(2).strip()).alpha2,
+                                  lang.script)
+    if name in converter.guessit_exceptions:
+        return babelfish.Language(*converter.guessit_exceptions[name])
+    for conv in [babelfish.Language, babelfish.Language.fromalpha3b, babelfish.Language.fromalpha2,
+                 babelfish.Language.fromname, babelfish.Language.fromopensubtitles]:
+        try:
+            return conv(name)
+        except (ValueError, babelfish.LanguageReverseError):
+            pass
+    return None
+
+
+class LinearAffixes(object):
+    """
+    Affixes of an AffixTrie tested one by one with startswith or endswith.
+    """
+
+    def __init__(self, trie):
+        self.trie = trie
+
+    def iter_affixes(self, word):
+        """
+        Iterate affixes of a word, ordered by property name, then by affix order.
+        """
+        for key, parts in self.trie.affixes.items():
+            for part in parts:
+                if self.trie.suffix and word.endswith(part):
+                    yield key, part, word[:len(word) - len(part)]
+                elif not self.trie.suffix and word.startswith(part):
+                    yield key, part, word[len(part):]
+
+
+def search_date_dateutil(string, year_first=None, day_first=None):
+    """
+    Previous date search: regular expressions tried in sequence, dates parsed by dateutil.
+    """
+    dsep = r'[-/ \.]'
+    dsep_bis = r'[-/ \.x]'
+    date_regexps = [
+        re.compile(r'%s((\d{8}))%s' % (dsep, dsep), re.IGNORECASE),
+        re.compile(r'%s((\d{6}))%s' % (dsep, dsep), re.IGNORECASE),
+        re.compile(r'(?:^|[^\d])((\d{2})%s(\d{1,2})%s(\d{1,2}))(?:$|[^\d])' % (dsep, dsep), re.IGNORECASE),
+        re.compile(r'(?:^|[^\d])((\d{1,2})%s(\d{1,2})%s(\d{2}))(?:$|[^\d])' % (dsep, dsep), re.IGNORECASE),
+        re.compile(r'(?:^|[^\d])((\d{4})%s(\d{1,2})%s(\d{1,2}))(?:$|[^\d])' % (dsep_bis, dsep), re.IGNORECASE),
+        re.compile(r'(?:^|[^\d])((\d{1,2})%s(\d{1,2})%s(\d{4}))(?:$|[^\d])' % (dsep, dsep_bis), re.IGNORECASE),
+        re.compile(r'(?:^|[^\d])((\d{1,2}(?:st|nd|rd|th)?%s(?:[a-z]{3,10})%s\d{4}))(?:$|[^\d])' % (dsep, dsep),
+                   re.IGNORECASE)]
+    for date_re in date_regexps:
+        search_match = date_re.search(string)
+        if not search_match:
+            continue
+        groups = search_match.groups()[1:]
+        if year_first and day_first is None:
+            day_first = False
+        if day_first is None:
+            day_first = _guess_day_first_parameter(groups)
+        for dayfirst in ([True, False] if day_first is None else [day_first]):
+            for yearfirst in ([False, True] if year_first is None else [year_first]):
+                try:
+                    date = parser.parse('-'.join(groups), dayfirst=dayfirst, yearfirst=yearfirst)
+                except (ValueError, TypeError):
+                    date = None
+                if date and valid_year(date.year):
+                    return search_match.start(1), search_match.end(1), date.date()
+    return None
+
+
+def generated_dates(count, seed=0):
+    """
+    Dates in the formats of search_date, with invalid months, days and month names.
+    """
+    rand = random.Random(seed)
+    separators = '-/. x'
+    dates = []
+    for _ in range(count):
+        year, month, day = rand.randint(1900, 2040), rand.randint(1, 13), rand.randint(1, 32)
+        dates.append(rand.choice([
+            '%04i%02i%02i' % (year, month, day), '%02i%02i%02i' % (year % 100, month, day),
+            '%i%s%02i%s%02i' % (year, rand.choice(separators), month, rand.choice(separators), day),
+            '%02i%s%02i%s%i' % (day, rand.choice(separators), month, rand.choice(separators), year),
+            '%i%s%i%s%02i' % (month, rand.choice(separators), day, rand.choice(separators), year % 100),
+            '%ith%s%s%s%i' % (day, rand.choice(separators), rand.choice(['March', 'dec', 'Sept', 'Foo', 'Monday']),
+                              rand.choice(separators), year)]))
+    return dates
+
+
+class TestLanguageMap(TestCase):
+    """
+    The precomputed map of the guessit converter gives the languages of the chain of babelfish converters.
+    """
+    words = ['fr', 'fre', 'fra', 'french', 'vf', 'vff', 'vo', 'english', 'eng', 'en', 'de', 'ger', 'pt-br', 'pob',
+             'se', 'is', 'it', 'no', 'cz', 'hd', '1080p', 'x264', 'the', 'mkv', 'und', 'mul', 'zxx', 'flemish',
+             'brazilian', 'ita', 'spanish', 'esp', 'jap', 'chinese', 'kor', 'dual', 'multi', 'fr-ca', 'pt-PT',
+             'english (us)', 'French (France)', 'xx-yy', '']
+
+    def test_words(self):
+        converter = babelfish.language_converters['guessit']
+        words = set(self.words)
+        words.update(word.value.lower() for string in STRINGS for word in iter_words(string))
+        words.update(converter.reversed)
+        for word in words:
+            expected = language_chain(converter, word)
+            if expected is None:
+                self.assertRaises(babelfish.Error, converter.language, word)
+            else:
+                self.assertEqual(converter.language(word), expected, word)
+
+
+class TestAffixTrie(TestCase):
+    """
+    Affix tries find the affixes of a linear scan, and give the same languages.
+    """
+    strings = STRINGS + [
+        'Show.S01E01.FRENCH.ENGLISH.GERMAN.ITALIAN.SPANISH.DUTCH.SWEDISH.subfrench.engsub.VOSTFR.Subs.DUBBED.720p.mkv',
+        'Movie.2010.MULTi.TRUEFRENCH.PT-BR.Legendado.custom.subs.ITA.ENG.Dublado.NORDiC.SUBFORCED.soft.subtitles.avi']
+
+    def patch_linear(self):
+        self.addCleanup(setattr, language, 'prefixes_trie', language.prefixes_trie)
+        self.addCleanup(setattr, language, 'suffixes_trie', language.suffixes_trie)
+        language.prefixes_trie = LinearAffixes(language.prefixes_trie)
+        language.suffixes_trie = LinearAffixes(language.suffixes_trie)
+
+    def test_iter_affixes(self):
+        words = set(word.value.lower() for string in self.strings for word in iter_words(string))
+        for trie in (language.prefixes_trie, language.suffixes_trie):
+            for part in (part for parts in trie.affixes.values() for part in parts):
+                words.update([part, part + 'fr', 'fr' + part, part + part])
+            for word in words:
+                self.assertEqual(sorted(trie.iter_affixes(word)), sorted(LinearAffixes(trie).iter_affixes(word)), word)
+
+    def find_languages(self):
+        # matches are yielded in set order
+        return [sorted((start, end, props['name'], str(props['value']))
+                       for start, end, props in language.find_languages(string, {})) for string in self.strings]
+
+    def test_find_languages(self):
+        expected = self.find_languages()
+        self.patch_linear()
+        self.assertEqual(self.find_languages(), expected)
+
+
+class TestSearchDate(TestCase):
+    """
+    Date search gives the results of the previous dateutil implementation.
+    """
+    options = [(None, None), (True, None), (None, True)]
+
+    def check(self, strings):
+        for string in strings:
+            for year_first, day_first in self.options:
+                self.assertEqual(search_date(string, year_first, day_first),
+                                 search_date_dateutil(string, year_first, day_first), (string, year_first, day_first))
+
+    def test_strings(self):
+        self.check([' %s ' % string for string in STRINGS])
+
+    def test_generated_dates(self):
+        self.check([' Show.%s.Title.720p ' % date for date in generated_dates(2000)])
+
+
+def suite():
+    suite = TestSuite()
+    for case in (TestGuessitMany, TestLanguageMap, TestAffixTrie, TestSearchDate):
+        suite.addTest(TestLoader().loadTestsFromTestCase(case))
+    return suite
+
+
+if __name__ == '__main__':
+    TextTestRunner().run(suite())
@@ -8,3 +8,4 @@ from .rebulk import Rebulk
 from .rules import Rule, CustomRule, AppendMatch, RemoveMatch, RenameMatch, AppendTags, RemoveTags
 from .processors import ConflictSolver, PrivateRemover, POST_PROCESS, PRE_PROCESS
 from .pattern import REGEX_AVAILABLE
+from .profiler import Profiler
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aho-Corasick automaton used to search all strings of StringPattern objects in a single pass
+"""
+from collections import deque
+
+from .pattern import StringPattern
+
+
+class Automaton(object):
+    """
+    Aho-Corasick automaton for a set of strings.
+
+    >>> automaton = Automaton(['an', 'a', 'nan'])
+    >>> sorted(automaton.find_all('banana').items())
+    [('a', [1, 3, 5]), ('an', [1, 3]), ('nan', [2])]
+    """
+
+    def __init__(self, keys):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for key in keys:
+            self._add(key)
+        self._link()
+
+    def _add(self, key):
+        """
+        Add a key to the trie.
+        :param key:
+        :type key: str
+        """
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        if key not in self._output[node]:
+            self._output[node] += (key,)
+
+    def _link(self):
+        """
+        Compute failure links (breadth first) and merge outputs of failure nodes.
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._output[child] += self._output[fail]
+
+    def find_all(self, string):
+        """
+        Find all keys in string.
+
+        Occurrences of a key don't overlap each other, exactly like ``rebulk.utils.find_all``.
+        :param string:
+        :type string: str
+        :return: dict of key -> list of start indices
+        :rtype: dict[str, list[int]]
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = {}
+        ends = {}
+        node = 0
+        for end, char in enumerate(string, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for key in output[node]:
+                start = end - len(key)
+                if start >= ends.get(key, 0):
+                    ends[key] = end
+                    found.setdefault(key, []).append(start)
+        return found
+
+
+def indexable(pattern):
+    """
+    Check if a pattern can be searched by a StringIndex.
+    :param pattern:
+    :type pattern: Pattern
+    :return:
+    :rtype: bool
+    """
+    # pylint:disable=protected-access
+    # start/end kwargs restrict find_all to a part of the input
+    return isinstance(pattern, StringPattern) and all(pattern.patterns) and \
+        'start' not in pattern._kwargs and 'end' not in pattern._kwargs
+
+
+class StringIndex(object):
+    """
+    Strings of many StringPattern objects compiled into automatons, one for case sensitive strings and one for
+    strings with ``ignore_case`` option.
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: patterns to index, patterns not supported by the index are skipped.
+        :type patterns: list[Pattern]
+        """
+        self.patterns = set()
+        keys = set()
+        ignore_case_keys = set()
+        for pattern in patterns:
+            if indexable(pattern):
+                self.patterns.add(pattern)
+                if pattern.ignore_case:
+                    ignore_case_keys.update(key.lower() for key in pattern.patterns)
+                else:
+                    keys.update(pattern.patterns)
+        self._automaton = Automaton(keys) if keys else None
+        self._ignore_case_automaton = Automaton(ignore_case_keys) if ignore_case_keys else None
+
+    def __contains__(self, pattern):
+        return pattern in self.patterns
+
+    def find_all(self, input_string):
+        """
+        Search all indexed strings in input_string.
+        :param input_string:
+        :type input_string: str
+        :return: StringIndexResult
+        :rtype: StringIndexResult
+        """
+        found = self._automaton.find_all(input_string) if self._automaton else {}
+        ignore_case_found = self._ignore_case_automaton.find_all(input_string.lower()) \
+            if self._ignore_case_automaton else {}
+        return StringIndexResult(found, ignore_case_found)
+
+
+class StringIndexResult(object):
+    """
+    Indices of strings found by StringIndex in an input string.
+    """
+
+    def __init__(self, found, ignore_case_found):
+        self._found = found
+        self._ignore_case_found = ignore_case_found
+
+    def indices(self, pattern, string):
+        """
+        Start indices of a string of a pattern.
+        :param pattern:
+        :type pattern: StringPattern
+        :param string:
+        :type string: str
+        :return:
+        :rtype: list[int]
+        """
+        if pattern.ignore_case:
+            return self._ignore_case_found.get(string.lower(), ())
+        return self._found.get(string, ())
+
+    def any(self, pattern):
+        """
+        Check if any string of the pattern was found.
+        :param pattern:
+        :type pattern: StringPattern
+        :return:
+        :rtype: bool
+        """
+        return any(self.indices(pattern, string) for string in pattern.patterns)
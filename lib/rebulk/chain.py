@@ -260,7 +260,7 @@ class Chain(Pattern):
                 end = match.end
         match = call(Match, start, end, pattern=self, input_string=input_string, **self._match_kwargs)
         for chain_match in current_chain_matches:
-            if chain_match.children:
+            if chain_match._children:  # pylint:disable=protected-access
                 for child in chain_match.children:
                     match.children.append(child)
             if chain_match not in match.children:
@@ -278,7 +278,7 @@ class Chain(Pattern):
                 chain_part_match.input_string = input_string
                 chain_part_match.end += offset
                 chain_part_match.start += offset
-            if chain_part_match.children:
+            if chain_part_match._children:  # pylint:disable=protected-access
                 Chain._fix_matches_offset(chain_part_match.children, input_string, offset)
 
     @staticmethod
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Interval index of matches, answering position and overlap queries in logarithmic time.
+"""
+from bisect import bisect_left, insort
+
+
+class IntervalIndex(object):
+    """
+    Index of matches by span, built with a segment tree over input positions and a list of matches sorted by start.
+
+    Each match is stored with its span at the time it was added and a sequence number. Matches found at the same
+    position are returned in sequence order, which is the order matches were added.
+
+    >>> from collections import namedtuple
+    >>> Item = namedtuple('Item', ['value', 'span'])
+    >>> index = IntervalIndex()
+    >>> for item in (Item('a', (0, 5)), Item('b', (3, 8)), Item('c', (6, 7))):
+    ...     index.add(item)
+    >>> [item.value for item in index.at(4)]
+    ['a', 'b']
+    >>> [entry[-1].value for entry in index.overlapping(4, 7)]
+    ['a', 'b', 'c']
+    """
+
+    def __init__(self, size=0):
+        self._size = 1
+        while self._size < size:
+            self._size <<= 1
+        self._nodes = [None] * (2 * self._size)
+        self._starts = []
+        self._spans = {}
+        self._seq = 0
+
+    def _nodes_of(self, start, end):
+        """
+        Segment tree nodes covering positions from start to end.
+        :param start:
+        :type start: int
+        :param end:
+        :type end: int
+        :return:
+        :rtype: list[int]
+        """
+        nodes = []
+        low = start + self._size
+        high = end + self._size
+        while low < high:
+            if low & 1:
+                nodes.append(low)
+                low += 1
+            if high & 1:
+                high -= 1
+                nodes.append(high)
+            low >>= 1
+            high >>= 1
+        return nodes
+
+    def _insert(self, entry):
+        """
+        Insert an entry in segment tree nodes
+        :param entry: (seq, start, end, match)
+        :type entry: tuple
+        """
+        nodes = self._nodes
+        for node in self._nodes_of(entry[1], entry[2]):
+            if nodes[node] is None:
+                nodes[node] = [entry]
+            else:
+                nodes[node].append(entry)
+
+    def _grow(self, end):
+        """
+        Resize the segment tree so that it contains position end - 1.
+        :param end:
+        :type end: int
+        """
+        while self._size < end:
+            self._size <<= 1
+        self._nodes = [None] * (2 * self._size)
+        for start, seq, end_, match in self._starts:
+            if start < end_:
+                self._insert((seq, start, end_, match))
+
+    def add(self, match):
+        """
+        Add a match
+        :param match:
+        :type match: Match
+        """
+        start, end = match.span
+        entry = (self._seq, start, end, match)
+        self._seq += 1
+        if start < end:
+            if end > self._size:
+                self._grow(end)
+            self._insert(entry)
+        insort(self._starts, (start, entry[0], end, match))
+        self._spans.setdefault((start, end), []).append(entry)
+
+    def remove(self, match):
+        """
+        Remove the first added match equal to given match.
+        :param match:
+        :type match: Match
+        """
+        span = match.span
+        entries = self._spans.get(span, ())
+        for i, entry in enumerate(entries):
+            if entry[3] == match:
+                del entries[i]
+                break
+        else:
+            if span[0] < span[1]:
+                raise ValueError("match is not in index: %s" % (match,))
+            return
+        seq, start, end, _ = entry
+        del self._starts[bisect_left(self._starts, (start, seq))]
+        if start < end:
+            nodes = self._nodes
+            for node in self._nodes_of(start, end):
+                nodes[node].remove(entry)
+
+    def _stab(self, pos):
+        """
+        Entries of matches containing position.
+        :param pos:
+        :type pos: int
+        :return: list of (seq, start, end, match) not sorted.
+        :rtype: list[tuple]
+        """
+        if pos < 0 or pos >= self._size:
+            return []
+        entries = []
+        nodes = self._nodes
+        node = pos + self._size
+        while node:
+            if nodes[node]:
+                entries.extend(nodes[node])
+            node >>= 1
+        return entries
+
+    def at(self, pos):
+        """
+        Matches containing position, in sequence order.
+        :param pos:
+        :type pos: int
+        :return:
+        :rtype: list[Match]
+        """
+        return [entry[3] for entry in sorted(self._stab(pos))]
+
+    def overlapping(self, start, end):
+        """
+        Entries of matches containing at least one position from start to end, in sequence order.
+        :param start:
+        :type start: int
+        :param end:
+        :type end: int
+        :return: list of (seq, start, end, match)
+        :rtype: list[tuple]
+        """
+        if start >= end:
+            return []
+        entries = self._stab(start)
+        starts = self._starts
+        for i in range(bisect_left(starts, (start + 1,)), bisect_left(starts, (end,))):
+            match_start, seq, match_end, match = starts[i]
+            if match_start < match_end:
+                entries.append((seq, match_start, match_end, match))
+        entries.sort()
+        return entries
+
+    def starts_before(self, position):
+        """
+        Matches starting before position, from the nearest one.
+        :param position:
+        :type position: int
+        :return: generator of (start, match)
+        :rtype: generator
+        """
+        starts = self._starts
+        for i in reversed(range(bisect_left(starts, (position,)))):
+            yield starts[i][0], starts[i][3]
+
+    def starts_from(self, position, end):
+        """
+        Matches starting from position and before end, from the nearest one.
+        :param position:
+        :type position: int
+        :param end:
+        :type end: int
+        :return: generator of (start, match)
+        :rtype: generator
+        """
+        starts = self._starts
+        for i in range(bisect_left(starts, (position,)), bisect_left(starts, (end,))):
+            yield starts[i][0], starts[i][3]
@@ -5,6 +5,8 @@ Various utilities functions
 """
 import inspect
 import sys
+from weakref import WeakKeyDictionary
+
 from .utils import is_iterable
 
 if sys.version_info < (3, 4, 0):  # pragma: no cover
@@ -31,6 +33,81 @@ else:  # pragma: no cover
         return class_
 
 
+class ArgsFilter(object):
+    """
+    Accepted arguments of a function or constructor signature, filtering args and kwargs without reflection.
+    """
+
+    def __init__(self, argspec, constructor):
+        """
+        :param argspec: argspec of the function or constructor
+        :type argspec: argspec
+        :param constructor: is it a constructor ?
+        :type constructor: bool
+        """
+        self.names = frozenset(argspec.args)
+        self.keywords = bool(argspec.keywords)
+        self.positional = None if argspec.varargs else len(argspec.args) - (1 if constructor else 0)
+
+    def filter(self, args, kwargs):
+        """
+        Return (args, kwargs) matching the signature
+
+        :param args:
+        :type args: tuple
+        :param kwargs:
+        :type kwargs: dict
+        :return: (args, kwargs) matching the signature
+        :rtype: tuple
+        """
+        if not self.keywords:
+            names = self.names
+            kwargs = dict((k, kwargs[k]) for k in kwargs if k in names)
+        if self.positional is not None:
+            args = args[:self.positional]
+        return args, kwargs
+
+
+# Filters of inspected functions and constructors. Bound methods are keyed on their function, which has the same
+# argspec.
+_ARGS_FILTERS = {False: WeakKeyDictionary(), True: WeakKeyDictionary()}
+
+
+def args_filter(callable_, constructor=None):
+    """
+    Retrieves the ArgsFilter of a function or constructor, inspecting its signature on first call only.
+
+    >>> args_filter(lambda a, b=None: None).filter((1, 2, 3), {'b': 4, 'c': 5})
+    ((1, 2), {'b': 4})
+
+    :param callable_: function or class to inspect
+    :type callable_: callable
+    :param constructor: is it a constructor ? Defaults to True for classes.
+    :type constructor: bool
+    :return:
+    :rtype: ArgsFilter
+    """
+    if constructor is None:
+        constructor = inspect.isclass(callable_)
+    filters = _ARGS_FILTERS[constructor]
+    key = getattr(callable_, '__func__', callable_)
+    try:
+        return filters[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable
+        key = None
+    if constructor:
+        argspec = inspect.getargspec(_constructor(callable_))  # pylint:disable=deprecated-method
+    else:
+        argspec = inspect.getargspec(callable_)  # pylint:disable=deprecated-method
+    filter_ = ArgsFilter(argspec, constructor)
+    if key is not None:
+        filters[key] = filter_
+    return filter_
+
+
 def call(function, *args, **kwargs):
     """
     Call a function or constructor with given args and kwargs after removing args and kwargs that doesn't match
@@ -45,8 +122,7 @@ def call(function, *args, **kwargs):
     :return: sale vakye as default function call
     :rtype: object
     """
-    func = constructor_args if inspect.isclass(function) else function_args
-    call_args, call_kwargs = func(function, *args, **kwargs)
+    call_args, call_kwargs = args_filter(function).filter(args, kwargs)
     return function(*call_args, **call_kwargs)
 
 
@@ -63,8 +139,7 @@ def function_args(callable_, *args, **kwargs):
     :return: (args, kwargs) matching the function signature
     :rtype: tuple
     """
-    argspec = inspect.getargspec(callable_)  # pylint:disable=deprecated-method
-    return argspec_args(argspec, False, *args, **kwargs)
+    return args_filter(callable_, False).filter(args, kwargs)
 
 
 def constructor_args(class_, *args, **kwargs):
@@ -80,8 +155,7 @@ def constructor_args(class_, *args, **kwargs):
     :return: (args, kwargs) matching the function signature
     :rtype: tuple
     """
-    argspec = inspect.getargspec(_constructor(class_))  # pylint:disable=deprecated-method
-    return argspec_args(argspec, True, *args, **kwargs)
+    return args_filter(class_, True).filter(args, kwargs)
 
 
 def argspec_args(argspec, constructor, *args, **kwargs):
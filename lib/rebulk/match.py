@@ -15,6 +15,7 @@ import six
 
 from .loose import ensure_list, filter_index
 from .utils import is_iterable
+from .intervals import IntervalIndex
 from .debug import defined_at
 
 
@@ -46,7 +47,10 @@ class _BaseMatches(MutableSequence):
         self.__tag_dict = None
         self.__start_dict = None
         self.__end_dict = None
-        self.__index_dict = None
+        self.__interval_index = None
+        self._generation = 0
+        self.__query_cache = {}
+        self.__query_generation = 0
         if matches:
             self.extend(matches)
 
@@ -82,20 +86,19 @@ class _BaseMatches(MutableSequence):
         if self.__tag_dict is None:
             self.__tag_dict = defaultdict(_BaseMatches._base)
             for match in self._delegate:
-                for tag in match.tags:
+                for tag in match._tags:  # pylint:disable=protected-access
                     _BaseMatches._base_add(self.__tag_dict[tag], match)
 
         return self.__tag_dict
 
     @property
-    def _index_dict(self):
-        if self.__index_dict is None:
-            self.__index_dict = defaultdict(_BaseMatches._base)
+    def _interval_index(self):
+        if self.__interval_index is None:
+            self.__interval_index = IntervalIndex(max(len(self.input_string or ''), self._max_end))
             for match in self._delegate:
-                for index in range(*match.span):
-                    _BaseMatches._base_add(self.__index_dict[index], match)
+                self.__interval_index.add(match)
 
-        return self.__index_dict
+        return self.__interval_index
 
     def _add_match(self, match):
         """
@@ -107,17 +110,17 @@ class _BaseMatches(MutableSequence):
             if match.name:
                 _BaseMatches._base_add(self._name_dict[match.name], (match))
         if self.__tag_dict is not None:
-            for tag in match.tags:
+            for tag in match._tags:  # pylint:disable=protected-access
                 _BaseMatches._base_add(self._tag_dict[tag], match)
         if self.__start_dict is not None:
             _BaseMatches._base_add(self._start_dict[match.start], match)
         if self.__end_dict is not None:
             _BaseMatches._base_add(self._end_dict[match.end], match)
-        if self.__index_dict is not None:
-            for index in range(*match.span):
-                _BaseMatches._base_add(self._index_dict[index], match)
+        if self.__interval_index is not None:
+            self.__interval_index.add(match)
         if match.end > self._max_end:
             self._max_end = match.end
+        self._generation += 1
 
     def _remove_match(self, match):
         """
@@ -129,17 +132,54 @@ class _BaseMatches(MutableSequence):
             if match.name:
                 _BaseMatches._base_remove(self._name_dict[match.name], match)
         if self.__tag_dict is not None:
-            for tag in match.tags:
+            for tag in match._tags:  # pylint:disable=protected-access
                 _BaseMatches._base_remove(self._tag_dict[tag], match)
         if self.__start_dict is not None:
             _BaseMatches._base_remove(self._start_dict[match.start], match)
         if self.__end_dict is not None:
             _BaseMatches._base_remove(self._end_dict[match.end], match)
-        if self.__index_dict is not None:
-            for index in range(*match.span):
-                _BaseMatches._base_remove(self._index_dict[index], match)
+        if self.__interval_index is not None:
+            self.__interval_index.remove(match)
         if match.end >= self._max_end and not self._end_dict[match.end]:
             self._max_end = max(self._end_dict.keys())
+        self._generation += 1
+
+    @property
+    def generation(self):
+        """
+        Generation of this list, incremented each time a match is added or removed.
+
+        Lookup structures are updated only when a match is added or removed: remove the match, edit its span and
+        add it again. Query cache is also invalidated by any edit of span, name or tags of a match.
+        :return:
+        :rtype: int
+        """
+        return self._generation
+
+    def memoize(self, key, function):
+        """
+        Get the result of a query, computed by function only once per generation of this list and until a match is
+        edited.
+
+        Returned object is cached and must not be modified. Queries with unhashable key are not cached.
+        :param key: query identifier and arguments
+        :type key: tuple
+        :param function: function computing the query result
+        :type function: callable
+        :return:
+        :rtype: object
+        """
+        generation = (self._generation, _match_edits)
+        if self.__query_generation != generation:
+            self.__query_cache = {}
+            self.__query_generation = generation
+        try:
+            return self.__query_cache[key]
+        except KeyError:
+            ret = self.__query_cache[key] = function()
+            return ret
+        except TypeError:
+            return function()
 
     def previous(self, match, predicate=None, index=None):
         """
@@ -209,6 +249,41 @@ class _BaseMatches(MutableSequence):
         """
         return filter_index(_BaseMatches._base(self._tag_dict[tag]), predicate, index)
 
+    def contains_any(self, names=None, tags=None):
+        """
+        Check if at least one match has one of given names or tags.
+        :param names:
+        :type names: list[str]
+        :param tags:
+        :type tags: list[str]
+        :return:
+        :rtype: bool
+        """
+        # names and tags of matches edited in place are not updated in name and tag lookups
+        present_names, present_tags = self.memoize(('present',), self._present)
+        if names:
+            for name in names:
+                if name in present_names:
+                    return True
+        if tags:
+            for tag in tags:
+                if tag in present_tags:
+                    return True
+        return False
+
+    def _present(self):
+        """
+        Names and tags of matches in this list.
+        :return:
+        :rtype: tuple[set, set]
+        """
+        names = set()
+        tags = set()
+        for match in self._delegate:
+            names.add(match.name)
+            tags.update(match._tags)  # pylint:disable=protected-access
+        return names, tags
+
     def starting(self, start, predicate=None, index=None):
         """
         Retrieves a set of Match objects that starts at given index.
@@ -253,11 +328,9 @@ class _BaseMatches(MutableSequence):
             end = self.max_end
         else:
             end = min(self.max_end, end)
-        ret = _BaseMatches._base()
-        for match in sorted(self):
-            if match.start < end and match.end > start:
-                ret.append(match)
-        return filter_index(ret, predicate, index)
+        ret = self.memoize(('range', start, end),
+                           lambda: sorted(match for match in self._delegate if match.start < end and match.end > start))
+        return filter_index(_BaseMatches._base(ret), predicate, index)
 
     def chain_before(self, position, seps, start=0, predicate=None, index=None):
         """
@@ -350,10 +423,9 @@ class _BaseMatches(MutableSequence):
         :return:
         :rtype:
         """
-        for lindex in reversed(range(0, position)):
-            for starting in self.starting(lindex):
-                if not ignore or not ignore(starting):
-                    return lindex
+        for lindex, starting in self._interval_index.starts_before(position):
+            if lindex >= 0 and (not ignore or not ignore(starting)):
+                return lindex
         return 0
 
     def _hole_end(self, position, ignore=None):
@@ -366,66 +438,94 @@ class _BaseMatches(MutableSequence):
         :return:
         :rtype:
         """
-        for rindex in range(position, self.max_end):
-            for starting in self.starting(rindex):
-                if not ignore or not ignore(starting):
-                    return rindex
+        for rindex, starting in self._interval_index.starts_from(position, self.max_end):
+            if not ignore or not ignore(starting):
+                return rindex
         return self.max_end
 
-    def holes(self, start=0, end=None, formatter=None, ignore=None, seps=None, predicate=None,
-              index=None):  # pylint: disable=too-many-branches,too-many-locals
+    def _hole_spans(self, start, end, ignore, seps):
         """
-        Retrieves a set of Match objects that are not defined in given range.
+        Retrieves spans of holes in given range.
         :param start:
-        :type start:
+        :type start: int
         :param end:
-        :type end:
-        :param formatter:
-        :type formatter:
+        :type end: int
         :param ignore:
         :type ignore:
         :param seps:
         :type seps:
-        :param predicate:
-        :type predicate:
-        :param index:
-        :type index:
         :return:
-        :rtype:
+        :rtype: list[(int, int)]
         """
-        assert self.input_string if seps else True, "input_string must be defined when using seps parameter"
-        if end is None:
-            end = self.max_end
-        else:
-            end = min(self.max_end, end)
-        ret = _BaseMatches._base()
+        ret = []
         hole = False
         rindex = start
 
         loop_start = self._hole_start(start, ignore)
 
+        covered = [False] * max(end - loop_start, 0)
+        for _, match_start, match_end, match in self._interval_index.overlapping(loop_start, end):
+            if not ignore or not ignore(match):
+                for i in range(max(match_start, loop_start) - loop_start, min(match_end, end) - loop_start):
+                    covered[i] = True
+
         for rindex in range(loop_start, end):
-            current = []
-            for at_index in self.at_index(rindex):
-                if not ignore or not ignore(at_index):
-                    current.append(at_index)
+            current = covered[rindex - loop_start]
 
             if seps and hole and self.input_string and self.input_string[rindex] in seps:
                 hole = False
-                ret[-1].end = rindex
+                ret[-1][1] = rindex
             else:
                 if not current and not hole:
-                    # Open a new hole match
+                    # Open a new hole
                     hole = True
-                    ret.append(Match(max(rindex, start), None, input_string=self.input_string, formatter=formatter))
+                    ret.append([max(rindex, start), None])
                 elif current and hole:
-                    # Close current hole match
+                    # Close current hole
                     hole = False
-                    ret[-1].end = rindex
+                    ret[-1][1] = rindex
 
         if ret and hole:
             # go the the next starting element ...
-            ret[-1].end = min(self._hole_end(rindex, ignore), end)
+            ret[-1][1] = min(self._hole_end(rindex, ignore), end)
+        return [tuple(span) for span in ret]
+
+    def holes(self, start=0, end=None, formatter=None, ignore=None, seps=None, predicate=None,
+              index=None):  # pylint: disable=too-many-arguments
+        """
+        Retrieves a set of Match objects that are not defined in given range.
+
+        Spans of holes are cached, unless ignore is given, until this list or a match is modified, but new Match objects
+        are returned on each call.
+        :param start:
+        :type start:
+        :param end:
+        :type end:
+        :param formatter:
+        :type formatter:
+        :param ignore:
+        :type ignore:
+        :param seps:
+        :type seps:
+        :param predicate:
+        :type predicate:
+        :param index:
+        :type index:
+        :return:
+        :rtype:
+        """
+        assert self.input_string if seps else True, "input_string must be defined when using seps parameter"
+        if end is None:
+            end = self.max_end
+        else:
+            end = min(self.max_end, end)
+        if ignore is None:
+            spans = self.memoize(('holes', start, end, seps), lambda: self._hole_spans(start, end, ignore, seps))
+        else:
+            # ignore is usually a new function on each call, it would never be found in cache
+            spans = self._hole_spans(start, end, ignore, seps)
+        ret = _BaseMatches._base(Match(hole_start, hole_end, input_string=self.input_string, formatter=formatter)
+                                 for hole_start, hole_end in spans)
         return filter_index(ret, predicate, index)
 
     def conflicting(self, match, predicate=None, index=None):
@@ -442,10 +542,13 @@ class _BaseMatches(MutableSequence):
         """
         ret = _BaseMatches._base()
 
-        for i in range(*match.span):
-            for at_match in self.at_index(i):
-                if at_match not in ret:
-                    ret.append(at_match)
+        start = match.start
+        overlapping = self._interval_index.overlapping(*match.span)
+        # ordered by first conflicting position, like a scan of each position of the span
+        overlapping.sort(key=lambda entry: max(entry[1], start))
+        for _, _, _, at_match in overlapping:
+            if at_match not in ret:
+                ret.append(at_match)
 
         ret.remove(match)
 
@@ -461,8 +564,8 @@ class _BaseMatches(MutableSequence):
         """
         Retrieves a list of matches from given (start, end) tuple.
         """
-        starting = self._index_dict[span[0]]
-        ending = self._index_dict[span[1] - 1]
+        starting = self._interval_index.at(span[0])
+        ending = self._interval_index.at(span[1] - 1)
 
         merged = list(starting)
         for marker in ending:
@@ -475,7 +578,7 @@ class _BaseMatches(MutableSequence):
         """
         Retrieves a list of matches from given position
         """
-        return filter_index(self._index_dict[pos], predicate, index)
+        return filter_index(self._interval_index.at(pos), predicate, index)
 
     @property
     def names(self):
@@ -599,19 +702,29 @@ class Markers(_BaseMatches):
         super(Markers, self)._add_match(match)
 
 
+# Tags of matches without tags, replaced by a list when tags are accessed.
+_EMPTY_TAGS = ()
+
+# Number of edits of span, name or tags of any match, invalidates cached queries of matches.
+_match_edits = 0
+
+
 class Match(object):
     """
     Object storing values related to a single match
     """
+    __slots__ = ('_start', '_end', '_name', '_value', '_tags', 'marker', 'parent', 'input_string', 'formatter',
+                 'pattern', 'private', 'conflict_solver', '_children', '_raw_start', '_raw_end', 'defined_at',
+                 'match_index', '_formatted')
 
     def __init__(self, start, end, value=None, name=None, tags=None, marker=None, parent=None, private=None,
                  pattern=None, input_string=None, formatter=None, conflict_solver=None, **kwargs):
         # pylint: disable=unused-argument
-        self.start = start
-        self.end = end
-        self.name = name
+        self._start = start
+        self._end = end
+        self._name = name
         self._value = value
-        self.tags = ensure_list(tags)
+        self._tags = ensure_list(tags) if tags else _EMPTY_TAGS
         self.marker = marker
         self.parent = parent
         self.input_string = input_string
@@ -622,8 +735,63 @@ class Match(object):
         self._children = None
         self._raw_start = None
         self._raw_end = None
+        self._formatted = None
         self.defined_at = pattern.defined_at if pattern else defined_at()
 
+    @property
+    def tags(self):
+        """
+        List of tags of the match
+        """
+        if self._tags is _EMPTY_TAGS:
+            self._tags = []
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        global _match_edits  # pylint:disable=global-statement
+        self._tags = value
+        _match_edits += 1
+
+    @property
+    def start(self):
+        """
+        Start index of the match
+        """
+        return self._start
+
+    @start.setter
+    def start(self, value):
+        global _match_edits  # pylint:disable=global-statement
+        self._start = value
+        _match_edits += 1
+
+    @property
+    def end(self):
+        """
+        End index of the match
+        """
+        return self._end
+
+    @end.setter
+    def end(self, value):
+        global _match_edits  # pylint:disable=global-statement
+        self._end = value
+        _match_edits += 1
+
+    @property
+    def name(self):
+        """
+        Name of the match
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        global _match_edits  # pylint:disable=global-statement
+        self._name = value
+        _match_edits += 1
+
     @property
     def span(self):
         """
@@ -654,7 +822,12 @@ class Match(object):
         if self._value:
             return self._value
         if self.formatter:
-            return self.formatter(self.raw)
+            # formatted value is cached until raw bounds, formatter or input_string change.
+            key = (self.raw_start, self.raw_end, self.formatter, self.input_string)
+            formatted = self._formatted
+            if formatted is None or formatted[0] != key:
+                formatted = self._formatted = (key, self.formatter(self.raw))
+            return formatted[1]
         return self.raw
 
     @value.setter
@@ -675,10 +848,10 @@ class Match(object):
         :return:
         :rtype:
         """
-        if not self.children:
+        if not self._children:
             return set([self.name])
         ret = set()
-        for child in self.children:
+        for child in self._children:
             for name in child.names:
                 ret.add(name)
         return ret
@@ -861,8 +1034,8 @@ class Match(object):
             flags += '+private'
         if self.name:
             name = "+name=%s" % (self.name,)
-        if self.tags:
-            tags = "+tags=%s" % (self.tags,)
+        if self._tags:
+            tags = "+tags=%s" % (self._tags,)
         if self.defined_at:
             defined += "@%s" % (self.defined_at,)
         return "<%s:%s%s%s%s%s%s>" % (self.value, self.span, flags, name, tags, initiator, defined)
@@ -114,7 +114,7 @@ class Pattern(object):
         :return:
         :rtype:
         """
-        return match.children and (self.children or self.every)
+        return match._children and (self.children or self.every)  # pylint:disable=protected-access
 
     def _yield_parent(self):
         """
@@ -187,6 +187,23 @@ class Pattern(object):
         """
         Computes all matches for a given input
 
+        :param input_string: the string to parse
+        :type input_string: str
+        :param context: the context
+        :type context: dict
+        :param with_raw_matches: should return details
+        :type with_raw_matches: dict
+        :return: matches based on input_string for this pattern
+        :rtype: iterator[Match]
+        """
+        return self._matches(self._match, input_string, context, with_raw_matches)
+
+    def _matches(self, match_function, input_string, context, with_raw_matches):
+        """
+        Computes all matches for a given input, using match_function to find matches of each base pattern.
+
+        :param match_function: function(pattern, input_string, context) like _match
+        :type match_function: func
         :param input_string: the string to parse
         :type input_string: str
         :param context: the context
@@ -203,7 +220,7 @@ class Pattern(object):
         for pattern in self.patterns:
             yield_parent = self._yield_parent()
             match_index = -1
-            for match in self._match(pattern, input_string, context):
+            for match in match_function(pattern, input_string, context):
                 match_index += 1
                 match.match_index = match_index
                 raw_matches.append(match)
@@ -211,7 +228,8 @@ class Pattern(object):
                 if not self._match_parent(match, yield_parent):
                     continue
                 validated = True
-                for child in match.children:
+                children = match._children or ()  # pylint:disable=protected-access
+                for child in children:
                     if not self._match_child(child, yield_children):
                         validated = False
                         break
@@ -219,12 +237,12 @@ class Pattern(object):
                     if self.private_parent:
                         match.private = True
                     if self.private_children:
-                        for child in match.children:
+                        for child in children:
                             child.private = True
                     if yield_parent or self.private_parent:
                         matches.append(match)
                     if yield_children or self.private_children:
-                        for child in match.children:
+                        for child in children:
                             child.match_index = match_index
                             matches.append(child)
         matches = self._matches_post_process(matches)
@@ -339,6 +357,7 @@ class StringPattern(Pattern):
         self._patterns = patterns
         self._kwargs = kwargs
         self._match_kwargs = filter_match_kwargs(kwargs)
+        self.ignore_case = kwargs.get('ignore_case', False)
 
     @property
     def patterns(self):
@@ -348,8 +367,33 @@ class StringPattern(Pattern):
     def match_options(self):
         return self._match_kwargs
 
+    def indexed_matches(self, input_string, found, context=None, with_raw_matches=False):
+        """
+        Computes all matches for a given input, from strings already found by a StringIndex.
+
+        :param input_string: the string to parse
+        :type input_string: str
+        :param found: strings found in input_string
+        :type found: rebulk.automaton.StringIndexResult
+        :param context: the context
+        :type context: dict
+        :param with_raw_matches: should return details
+        :type with_raw_matches: dict
+        :return: matches based on input_string for this pattern
+        :rtype: iterator[Match]
+        """
+        def match_function(pattern, input_string, context):  # pylint:disable=unused-argument
+            """
+            Matches of a string found by the index
+            """
+            return self._match_indices(pattern, input_string, found.indices(self, pattern))
+        return self._matches(match_function, input_string, context, with_raw_matches)
+
     def _match(self, pattern, input_string, context=None):
-        for index in find_all(input_string, pattern, **self._kwargs):
+        return self._match_indices(pattern, input_string, find_all(input_string, pattern, **self._kwargs))
+
+    def _match_indices(self, pattern, input_string, indices):
+        for index in indices:
             yield Match(index, index + len(pattern), pattern=self, input_string=input_string, **self._match_kwargs)
 
 
@@ -397,6 +441,30 @@ class RePattern(Pattern):
     def match_options(self):
         return self._match_kwargs
 
+    def filtered_matches(self, input_string, accepted, context=None, with_raw_matches=False):
+        """
+        Computes all matches for a given input, evaluating only some of the regular expressions.
+
+        :param input_string: the string to parse
+        :type input_string: str
+        :param accepted: regular expressions to evaluate, others are known not to match
+        :type accepted: list
+        :param context: the context
+        :type context: dict
+        :param with_raw_matches: should return details
+        :type with_raw_matches: dict
+        :return: matches based on input_string for this pattern
+        :rtype: iterator[Match]
+        """
+        def match_function(pattern, input_string, context):
+            """
+            Matches of an accepted regular expression
+            """
+            if any(pattern is regex for regex in accepted):
+                return self._match(pattern, input_string, context)
+            return ()
+        return self._matches(match_function, input_string, context, with_raw_matches)
+
     def _match(self, pattern, input_string, context=None):
         names = dict((v, k) for k, v in pattern.groupindex.items())
         for match_object in pattern.finditer(input_string):
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Literal prefilter for RePattern objects.
+
+Each compiled regular expression is analysed once to extract the literal fragments (or a digit) an input must contain
+to be matched. Regular expressions whose prerequisites are missing from the input are not evaluated at all.
+"""
+# pylint: disable=wrong-import-position
+import re
+import warnings
+
+with warnings.catch_warnings():
+    # sre_parse is deprecated in python 3.11
+    warnings.simplefilter('ignore', DeprecationWarning)
+    import sre_parse
+    import sre_constants
+
+from .pattern import RePattern
+
+# Token for "any digit" in requirements
+DIGIT = '\\d'
+
+_DIGITS = frozenset('0123456789')
+
+_NON_ASCII = re.compile(u'[^\x00-\x7f]')
+
+
+def _literal(code):
+    """
+    Lowercased ascii character of a literal code, None for other characters
+    """
+    if code < 128:
+        return chr(code).lower()
+    return None
+
+
+def _char_set(items):
+    """
+    Requirement for a character class: set of lowercased characters or DIGIT, None if no requirement can be built.
+    """
+    chars = set()
+    for operator, argument in items:
+        if operator == sre_constants.LITERAL:
+            char = _literal(argument)
+            if char is None:
+                return None
+            chars.add(char)
+        elif operator == sre_constants.RANGE and argument[1] - argument[0] < 16 and argument[1] < 128:
+            chars.update(_literal(code) for code in range(argument[0], argument[1] + 1))
+        elif operator == sre_constants.CATEGORY and argument == sre_constants.CATEGORY_DIGIT:
+            chars.add(DIGIT)
+        else:
+            return None
+    if chars and chars.issubset(_DIGITS | set([DIGIT])):
+        return frozenset([DIGIT])
+    return frozenset(chars) if chars else None
+
+
+def _best(requirements):
+    """
+    The most selective requirement: the one with longest shortest fragment.
+    """
+    return max(requirements, key=lambda requirement: min(len(fragment) for fragment in requirement))
+
+
+def requirements_of(items):
+    """
+    Requirements of a parsed sequence. Each requirement is a frozenset of fragments and is satisfied if any of its
+    fragments is in the input; all requirements must be satisfied for a match.
+
+    :param items: parsed regular expression (sre_parse)
+    :type items: list
+    :return:
+    :rtype: list[frozenset]
+    """
+    # pylint: disable=too-many-branches
+    requirements = []
+    run = ''
+    for operator, argument in items:
+        char = _literal(argument) if operator == sre_constants.LITERAL else None
+        if char is not None:
+            run += char
+            continue
+        if run:
+            requirements.append(frozenset([run]))
+            run = ''
+        if operator == sre_constants.SUBPATTERN:
+            requirements.extend(requirements_of(argument[-1]))
+        elif operator in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if argument[0] >= 1:
+                requirements.extend(requirements_of(argument[2]))
+        elif operator == sre_constants.BRANCH:
+            fragments = set()
+            for branch in argument[1]:
+                branch_requirements = requirements_of(branch)
+                if not branch_requirements:
+                    fragments = None
+                    break
+                fragments.update(_best(branch_requirements))
+            if fragments:
+                requirements.append(frozenset(fragments))
+        elif operator == sre_constants.IN:
+            char_set = _char_set(argument)
+            if char_set:
+                requirements.append(char_set)
+    if run:
+        requirements.append(frozenset([run]))
+    return requirements
+
+
+def regex_requirements(regex):
+    r"""
+    Requirements of a compiled regular expression (see requirements_of).
+
+    >>> [sorted(requirement) for requirement in regex_requirements(re.compile(r'(?:x|h)[-.]?26[45]', re.I))]
+    [['h', 'x'], ['26'], ['\\d']]
+    >>> [sorted(requirement) for requirement in regex_requirements(re.compile(r'S(\d+)E\d+'))]
+    [['s'], ['\\d'], ['e']]
+
+    :param regex:
+    :type regex: compiled regular expression
+    :return:
+    :rtype: list[frozenset]
+    """
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags & sre_constants.SRE_FLAG_VERBOSE)
+    except Exception:  # pylint:disable=broad-except
+        # bytes patterns, syntax of regex module
+        return []
+    requirements = []
+    for requirement in requirements_of(list(parsed)):
+        if requirement not in requirements:
+            requirements.append(requirement)
+    return requirements
+
+
+class InputFragments(object):
+    """
+    Checks requirements against an input string.
+    """
+
+    def __init__(self, input_string):
+        self.lowered = input_string.lower()
+        self.has_digit = any(char in _DIGITS for char in self.lowered)
+        # Case folding of non ascii characters may match ascii literals
+        self.enabled = not _NON_ASCII.search(input_string)
+        self._satisfied = {}
+
+    def satisfies(self, requirements):
+        """
+        Check if all requirements are satisfied
+        :param requirements:
+        :type requirements: list[frozenset]
+        :return:
+        :rtype: bool
+        """
+        if not self.enabled:
+            return True
+        for requirement in requirements:
+            satisfied = self._satisfied.get(requirement)
+            if satisfied is None:
+                satisfied = self._satisfied[requirement] = any(
+                    self.has_digit if fragment == DIGIT else fragment in self.lowered for fragment in requirement)
+            if not satisfied:
+                return False
+        return True
+
+
+class RegexPrefilter(object):
+    """
+    Requirements of all regular expressions of RePattern objects, with counters of evaluated and skipped
+    regular expressions.
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: patterns to analyse, other than RePattern are ignored.
+        :type patterns: list[Pattern]
+        """
+        self.requirements = {}
+        for pattern in patterns:
+            if isinstance(pattern, RePattern) and pattern not in self.requirements:
+                self.requirements[pattern] = [(regex, regex_requirements(regex)) for regex in pattern.patterns]
+        self.evaluated = 0
+        self.skipped = 0
+        self.skipped_patterns = 0
+
+    def __contains__(self, pattern):
+        return pattern in self.requirements
+
+    def accepted(self, pattern, fragments):
+        """
+        Regular expressions of pattern which may match the input.
+        :param pattern:
+        :type pattern: RePattern
+        :param fragments:
+        :type fragments: InputFragments
+        :return:
+        :rtype: list
+        """
+        accepted = [regex for regex, requirements in self.requirements[pattern] if fragments.satisfies(requirements)]
+        self.evaluated += len(accepted)
+        self.skipped += len(self.requirements[pattern]) - len(accepted)
+        if not accepted:
+            self.skipped_patterns += 1
+        return accepted
+
+    @property
+    def stats(self):
+        """
+        Counters of regular expressions evaluated and skipped, and of patterns skipped entirely.
+        :return:
+        :rtype: dict
+        """
+        return {'evaluated': self.evaluated, 'skipped': self.skipped, 'skipped_patterns': self.skipped_patterns}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Opt-in profiler of patterns and rules.
+"""
+from timeit import default_timer
+
+
+class ProfileEntry(object):
+    """
+    Counters of a pattern or a rule.
+    """
+
+    def __init__(self, kind, label):
+        self.kind = kind
+        self.label = label
+        self.calls = 0
+        self.time = 0.0
+        self.matches = 0
+        self.removals = 0
+
+    def to_dict(self):
+        """
+        Converts entry to a dict object.
+        :return:
+        :rtype: dict
+        """
+        return {'kind': self.kind, 'label': self.label, 'calls': self.calls, 'time': self.time,
+                'matches': self.matches, 'removals': self.removals}
+
+    def __repr__(self):
+        return "<%s %s:calls=%s,time=%.6f,matches=%s,removals=%s>" % (self.kind, self.label, self.calls, self.time,
+                                                                       self.matches, self.removals)
+
+
+class Profiler(object):
+    """
+    Records call count, cumulative time, match count and removal count of each pattern and rule.
+
+    A profiler is given to ``Rebulk.matches`` and accumulates counters over all calls it is given to.
+
+    For a pattern, matches are the matches it has found and removals are those missing from the final result. For a
+    rule, matches are the matches added by its consequence and removals those it has removed.
+
+    >>> from rebulk import Rebulk
+    >>> profiler = Profiler()
+    >>> bulk = Rebulk().string('la', name='la').string('lakers', name='lakers')
+    >>> bulk.matches("the lakers are from la", profiler=profiler)
+    [<la:(20, 22)+name=la>, <lakers:(4, 10)+name=lakers>]
+    >>> [(entry.label, entry.calls, entry.matches, entry.removals) for entry in profiler.entries('pattern', 'calls')]
+    [("<StringPattern:('la',)>", 1, 2, 1), ("<StringPattern:('lakers',)>", 1, 1, 0)]
+    >>> [(entry.label, entry.removals) for entry in profiler.entries('rule') if entry.removals]
+    [('<ConflictSolver>', 1)]
+    """
+
+    columns = ('calls', 'time', 'matches', 'removals')
+
+    def __init__(self, timer=default_timer):
+        self.timer = timer
+        self._entries = {}
+        self._found = []
+
+    def _entry(self, kind, obj):
+        """
+        Get entry of a pattern or rule
+        :param kind:
+        :type kind: str
+        :param obj:
+        :type obj: Pattern|Rule
+        :return:
+        :rtype: ProfileEntry
+        """
+        key = (kind, obj)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = ProfileEntry(kind, repr(obj))
+        return entry
+
+    def pattern(self, pattern, elapsed, pattern_matches):
+        """
+        Record a pattern evaluation.
+        :param pattern:
+        :type pattern: Pattern
+        :param elapsed: time spent, in seconds
+        :type elapsed: float
+        :param pattern_matches: matches found by the pattern
+        :type pattern_matches: list[Match]
+        """
+        entry = self._entry('pattern', pattern)
+        entry.calls += 1
+        entry.time += elapsed
+        entry.matches += len(pattern_matches)
+        for match in pattern_matches:
+            self._found.append((entry, match))
+
+    def rule(self, rule, elapsed, added, removed):
+        """
+        Record a rule evaluation.
+        :param rule:
+        :type rule: Rule
+        :param elapsed: time spent, in seconds
+        :type elapsed: float
+        :param added: count of matches added by the rule
+        :type added: int
+        :param removed: count of matches removed by the rule
+        :type removed: int
+        """
+        entry = self._entry('rule', rule)
+        entry.calls += 1
+        entry.time += elapsed
+        entry.matches += added
+        entry.removals += removed
+
+    def finish(self, matches):
+        """
+        Record removals of pattern matches missing from the final result of a ``Rebulk.matches`` call.
+        :param matches:
+        :type matches: Matches
+        """
+        kept = set(id(match) for match in matches)
+        kept.update(id(marker) for marker in matches.markers)
+        for entry, match in self._found:
+            if id(match) not in kept:
+                entry.removals += 1
+        del self._found[:]
+
+    def entries(self, kind=None, sort='time'):
+        """
+        Retrieves recorded entries, sorted by given column in descending order.
+        :param kind: 'pattern' or 'rule', None for both
+        :type kind: str
+        :param sort: one of columns
+        :type sort: str
+        :return:
+        :rtype: list[ProfileEntry]
+        """
+        entries = [entry for entry in self._entries.values() if kind is None or entry.kind == kind]
+        return sorted(entries, key=lambda entry: (-getattr(entry, sort), entry.kind, entry.label))
+
+    def table(self, kind=None, sort='time', limit=None):
+        """
+        Formats recorded entries as a text table.
+        :param kind: 'pattern' or 'rule', None for both
+        :type kind: str
+        :param sort: one of columns
+        :type sort: str
+        :param limit: maximum number of entries
+        :type limit: int
+        :return:
+        :rtype: str
+        """
+        lines = ['%8s %12s %8s %8s  %-7s %s' % ('calls', 'time (ms)', 'matches', 'removals', 'kind', 'label')]
+        for entry in self.entries(kind, sort)[:limit]:
+            lines.append('%8i %12.3f %8i %8i  %-7s %s' % (entry.calls, entry.time * 1000, entry.matches,
+                                                         entry.removals, entry.kind, entry.label))
+        return '\n'.join(lines)
@@ -9,6 +9,8 @@ from .match import Matches
 
 from .pattern import RePattern, StringPattern, FunctionalPattern
 from .chain import Chain
+from .automaton import StringIndex
+from .prefilter import RegexPrefilter, InputFragments
 
 from .processors import ConflictSolver, PrivateRemover
 from .loose import set_defaults
@@ -62,6 +64,8 @@ class Rebulk(object):
             self.disabled = disabled
         self._patterns = []
         self._rules = Rules()
+        self._effective_cache = {}
+        self._version = 0
         if default_rules:
             self.rules(ConflictSolver, PrivateRemover)
         self._defaults = {}
@@ -70,6 +74,7 @@ class Rebulk(object):
         self._functional_defaults = {}
         self._chain_defaults = {}
         self._rebulks = []
+        self._pattern_indexes = {}
 
     def pattern(self, *pattern):
         """
@@ -81,6 +86,7 @@ class Rebulk(object):
         :rtype: Rebulk
         """
         self._patterns.extend(pattern)
+        self._version += 1
         return self
 
     def defaults(self, **kwargs):
@@ -232,6 +238,7 @@ class Rebulk(object):
         """
         chain = self.build_chain(**kwargs)
         self._patterns.append(chain)
+        self._version += 1
         return chain
 
     def build_chain(self, **kwargs):
@@ -257,6 +264,7 @@ class Rebulk(object):
         :return:
         """
         self._rules.load(*rules)
+        self._version += 1
         return self
 
     def rebulk(self, *rebulks):
@@ -267,15 +275,18 @@ class Rebulk(object):
         :return:
         """
         self._rebulks.extend(rebulks)
+        self._version += 1
         return self
 
-    def matches(self, string, context=None):
+    def matches(self, string, context=None, profiler=None):
         """
         Search for all matches with current configuration against input_string
         :param string: string to search into
         :type string: str
         :param context: context to use
         :type context: dict
+        :param profiler: profiler recording patterns and rules executions, disabled if None
+        :type profiler: rebulk.profiler.Profiler
         :return: A custom list of matches
         :rtype: Matches
         """
@@ -283,70 +294,169 @@ class Rebulk(object):
         if context is None:
             context = {}
 
-        self._matches_patterns(matches, context)
+        self._matches_patterns(matches, context, profiler)
 
-        self._execute_rules(matches, context)
+        self._execute_rules(matches, context, profiler)
+
+        if profiler is not None:
+            profiler.finish(matches)
 
         return matches
 
+    def _effective(self, context):
+        """
+        Get the cache entry of effective patterns and rules for given context.
+
+        Entries are keyed on the disabled state of each children, and on the version of this rebulk object and its
+        children which changes when patterns, rules or children rebulk objects are added.
+        :param context:
+        :type context:
+        :return:
+        :rtype: dict
+        """
+        key = (self._version,) + tuple((rebulk._version, bool(rebulk.disabled(context))) for rebulk in self._rebulks)
+        entry = self._effective_cache.get(key)
+        if entry is None:
+            entry = self._effective_cache[key] = {}
+        return entry
+
     def effective_rules(self, context=None):
         """
         Get effective rules for this rebulk object and its children.
+
+        Returned object is cached and must not be modified.
         :param context:
         :type context:
         :return:
         :rtype:
         """
-        rules = Rules()
-        rules.extend(self._rules)
-        for rebulk in self._rebulks:
-            if not rebulk.disabled(context):
-                extend_safe(rules, rebulk._rules)
+        entry = self._effective(context)
+        rules = entry.get('rules')
+        if rules is None:
+            rules = entry['rules'] = Rules()
+            rules.extend(self._rules)
+            for rebulk in self._rebulks:
+                if not rebulk.disabled(context):
+                    extend_safe(rules, rebulk._rules)
         return rules
 
-    def _execute_rules(self, matches, context):
+    def _execute_rules(self, matches, context, profiler=None):
         """
         Execute rules for this rebulk and children.
         :param matches:
         :type matches:
         :param context:
         :type context:
+        :param profiler:
+        :type profiler: rebulk.profiler.Profiler
         :return:
         :rtype:
         """
         if not self.disabled(context):
             rules = self.effective_rules(context)
-            rules.execute_all_rules(matches, context)
+            rules.execute_all_rules(matches, context, profiler)
 
     def effective_patterns(self, context=None):
         """
         Get effective patterns for this rebulk object and its children.
+
+        Returned list is cached and must not be modified.
         :param context:
         :type context:
         :return:
         :rtype:
         """
-        patterns = list(self._patterns)
-        for rebulk in self._rebulks:
-            if not rebulk.disabled(context):
-                extend_safe(patterns, rebulk._patterns)
+        entry = self._effective(context)
+        patterns = entry.get('patterns')
+        if patterns is None:
+            patterns = entry['patterns'] = list(self._patterns)
+            for rebulk in self._rebulks:
+                if not rebulk.disabled(context):
+                    extend_safe(patterns, rebulk._patterns)
         return patterns
 
-    def _matches_patterns(self, matches, context):
+    def pattern_indexes(self, patterns):
+        """
+        Get the StringIndex of string patterns and RegexPrefilter of regex patterns included in given effective
+        patterns.
+        :param patterns:
+        :type patterns: list[Pattern]
+        :return:
+        :rtype: (StringIndex, RegexPrefilter)
+        """
+        key = tuple(patterns)
+        indexes = self._pattern_indexes.get(key)
+        if indexes is None:
+            indexes = self._pattern_indexes[key] = (StringIndex(patterns), RegexPrefilter(patterns))
+        return indexes
+
+    def prefilter_stats(self):
+        """
+        Counters of regular expressions evaluated and skipped by the literal prefilter since creation of this object.
+        :return:
+        :rtype: dict
+        """
+        stats = {'evaluated': 0, 'skipped': 0, 'skipped_patterns': 0}
+        for _, prefilter in self._pattern_indexes.values():
+            for key, value in prefilter.stats.items():
+                stats[key] += value
+        return stats
+
+    def rules_stats(self):
+        """
+        Counters of rules evaluated and skipped because they were not triggered since creation of this object.
+        :return:
+        :rtype: dict
+        """
+        stats = {'evaluated': 0, 'skipped': 0, 'skipped_rules': {}}
+        for entry in self._effective_cache.values():
+            rules = entry.get('rules')
+            if rules is not None:
+                rules_stats = rules.stats
+                stats['evaluated'] += rules_stats['evaluated']
+                stats['skipped'] += rules_stats['skipped']
+                for name, count in rules_stats['skipped_rules'].items():
+                    stats['skipped_rules'][name] = stats['skipped_rules'].get(name, 0) + count
+        total = stats['evaluated'] + stats['skipped']
+        stats['skip_rate'] = float(stats['skipped']) / total if total else 0.0
+        return stats
+
+    def _matches_patterns(self, matches, context, profiler=None):  # pylint:disable=too-many-branches
         """
         Search for all matches with current paterns agains input_string
         :param matches: matches list
         :type matches: Matches
         :param context: context to use
         :type context: dict
+        :param profiler:
+        :type profiler: rebulk.profiler.Profiler
         :return:
         :rtype:
         """
         if not self.disabled(context):
             patterns = self.effective_patterns(context)
+            string_index, prefilter = self.pattern_indexes(patterns)
+            found = string_index.find_all(matches.input_string)
+            fragments = InputFragments(matches.input_string)
             for pattern in patterns:
                 if not pattern.disabled(context):
-                    pattern_matches = pattern.matches(matches.input_string, context)
+                    if profiler is not None:
+                        start = profiler.timer()
+                    if pattern in string_index:
+                        if found.any(pattern) or pattern.post_processor:
+                            pattern_matches = pattern.indexed_matches(matches.input_string, found, context)
+                        else:
+                            pattern_matches = []
+                    elif pattern in prefilter:
+                        accepted = prefilter.accepted(pattern, fragments)
+                        if accepted or pattern.post_processor:
+                            pattern_matches = pattern.filtered_matches(matches.input_string, accepted, context)
+                        else:
+                            pattern_matches = []
+                    else:
+                        pattern_matches = pattern.matches(matches.input_string, context)
+                    if profiler is not None:
+                        profiler.pattern(pattern, profiler.timer() - start, pattern_matches)
                     if pattern_matches:
                         log(pattern.log_level, "Pattern has %s match(es). (%s)", len(pattern_matches), pattern)
                     else:
@@ -70,6 +70,8 @@ class CustomRule(Condition, Consequence):
     name = None
     dependency = None
     properties = {}
+    trigger_names = None
+    trigger_tags = None
 
     def __init__(self, log_level=None):
         self.defined_at = debug.defined_at()
@@ -87,6 +89,22 @@ class CustomRule(Condition, Consequence):
         """
         return True
 
+    def triggered(self, matches):
+        """
+        Check if matches contain at least one match having a name from trigger_names or a tag from trigger_tags.
+
+        Rules declaring neither trigger_names nor trigger_tags are always triggered. Declare them only if when
+        condition can't be truthy without such a match.
+
+        :param matches:
+        :type matches: rebulk.match.Matches
+        :return: True if rule should be executed, False if it can be skipped
+        :rtype: bool
+        """
+        if self.trigger_names is None and self.trigger_tags is None:
+            return True
+        return matches.contains_any(self.trigger_names, self.trigger_tags)
+
     def __lt__(self, other):
         return self.priority > other.priority
 
@@ -246,6 +264,11 @@ class Rules(list):
 
     def __init__(self, *rules):
         super(Rules, self).__init__()
+        self._plan = None
+        self._plan_key = None
+        self.evaluated = 0
+        self.skipped = 0
+        self.skipped_rules = {}
         self.load(*rules)
 
     def load(self, *rules):
@@ -292,7 +315,7 @@ class Rules(list):
         """
         self.append(class_())
 
-    def execute_all_rules(self, matches, context):
+    def execute_all_rules(self, matches, context, profiler=None):
         """
         Execute all rules from this rules list. All when condition with same priority will be performed before
         calling then actions.
@@ -301,26 +324,69 @@ class Rules(list):
         :type matches:
         :param context:
         :type context:
+        :param profiler: profiler recording rules executions
+        :type profiler: rebulk.profiler.Profiler
         :return:
         :rtype:
         """
         ret = []
-        for priority, priority_rules in groupby(sorted(self), lambda rule: rule.priority):
-            sorted_rules = toposort_rules(list(priority_rules))  # Group by dependency graph toposort
-            for rules_group in sorted_rules:
-                rules_group = list(sorted(rules_group, key=self.index))  # Sort rules group based on initial ordering.
-                group_log_level = None
-                for rule in rules_group:
-                    if group_log_level is None or group_log_level < rule.log_level:
-                        group_log_level = rule.log_level
-                log(group_log_level, "%s independent rule(s) at priority %s.", len(rules_group), priority)
-                for rule in rules_group:
+        for priority, group_log_level, rules_group in self.execution_plan():
+            log(group_log_level, "%s independent rule(s) at priority %s.", len(rules_group), priority)
+            for rule in rules_group:
+                if not rule.triggered(matches):
+                    log(rule.log_level, "Rule is not triggered: %s", rule)
+                    self.skipped += 1
+                    name = rule.name if rule.name else rule.__class__.__name__
+                    self.skipped_rules[name] = self.skipped_rules.get(name, 0) + 1
+                    continue
+                self.evaluated += 1
+                if profiler is None:
                     when_response = execute_rule(rule, matches, context)
-                    if when_response is not None:
-                        ret.append((rule, when_response))
+                else:
+                    when_response = profile_rule(profiler, rule, matches, context)
+                if when_response is not None:
+                    ret.append((rule, when_response))
 
         return ret
 
+    @property
+    def stats(self):
+        """
+        Counters of rules evaluated and skipped because they were not triggered, with the skip count of each rule.
+        :return:
+        :rtype: dict
+        """
+        return {'evaluated': self.evaluated, 'skipped': self.skipped, 'skipped_rules': dict(self.skipped_rules)}
+
+    def execution_plan(self):
+        """
+        Get rules groups in execution order, as a list of (priority, log_level, rules_group) tuples.
+
+        The plan is computed on first call, and computed again only if rules of this list have changed.
+
+        :return:
+        :rtype: list[(int, int, list[Rule])]
+        """
+        key = tuple(id(rule) for rule in self)  # rules are referenced by the plan, so their ids can't be reused.
+        if self._plan is None or self._plan_key != key:
+            positions = {}
+            for i, rule in enumerate(self):
+                positions.setdefault(rule, i)
+            plan = []
+            for priority, priority_rules in groupby(sorted(self), lambda rule: rule.priority):
+                sorted_rules = toposort_rules(list(priority_rules))  # Group by dependency graph toposort
+                for rules_group in sorted_rules:
+                    # Sort rules group based on initial ordering.
+                    rules_group = list(sorted(rules_group, key=positions.__getitem__))
+                    group_log_level = None
+                    for rule in rules_group:
+                        if group_log_level is None or group_log_level < rule.log_level:
+                            group_log_level = rule.log_level
+                    plan.append((priority, group_log_level, rules_group))
+            self._plan = plan
+            self._plan_key = key
+        return self._plan
+
 
 def execute_rule(rule, matches, context):
     """
@@ -345,6 +411,33 @@ def execute_rule(rule, matches, context):
     else:
         log(rule.log_level, "Rule is disabled: %s", rule)
 
+
+def profile_rule(profiler, rule, matches, context):
+    """
+    Execute the given rule, recording its execution in profiler.
+    :param profiler:
+    :type profiler: rebulk.profiler.Profiler
+    :param rule:
+    :type rule:
+    :param matches:
+    :type matches:
+    :param context:
+    :type context:
+    :return:
+    :rtype:
+    """
+    generation = matches.generation
+    length = len(matches)
+    start = profiler.timer()
+    when_response = execute_rule(rule, matches, context)
+    elapsed = profiler.timer() - start
+    # each added or removed match increments generation once
+    changes = matches.generation - generation
+    delta = len(matches) - length
+    profiler.rule(rule, elapsed, (changes + delta) // 2, (changes - delta) // 2)
+    return when_response
+
+
 def toposort_rules(rules):
     """
     Sort given rules using toposort with dependency parameter.
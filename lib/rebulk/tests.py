@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of lookup structures and caches of rebulk.
+
+Run from the lib directory: python -m rebulk.tests
+"""
+import doctest
+import random
+import re
+from collections import namedtuple
+from unittest import TestCase, TestSuite, TestLoader, TextTestRunner
+
+from . import automaton, intervals, prefilter
+from .intervals import IntervalIndex
+from .match import Match, Matches
+from .prefilter import InputFragments, RegexPrefilter, regex_requirements
+from .rebulk import Rebulk
+from .rules import Rule, Rules, RemoveMatch
+
+Item = namedtuple('Item', ['value', 'span'])
+
+
+class TestQueryCache(TestCase):
+    """
+    Cached queries of matches must follow edits of matches in the list.
+    """
+    def setUp(self):
+        self.matches = Matches(input_string='abcdefghijklmnopqrst')
+        self.first = Match(0, 5, name='first', input_string=self.matches.input_string)
+        self.second = Match(10, 15, name='second', input_string=self.matches.input_string)
+        self.matches.extend([self.first, self.second])
+
+    def spans(self, matches):
+        return [match.span for match in matches]
+
+    def test_range_after_span_edit(self):
+        self.assertEqual(self.matches.range(5, 10), [])
+        self.first.end = 7
+        self.assertEqual(self.matches.range(5, 10), [self.first])
+        self.second.start = 9
+        self.assertEqual(self.matches.range(5, 10), [self.first, self.second])
+
+    def test_holes_after_list_change(self):
+        self.assertEqual(self.spans(self.matches.holes(0, 20)), [(5, 10), (15, 20)])
+        # spans are edited as the interval index requires
+        self.matches.remove(self.second)
+        self.second.start = 8
+        self.matches.append(self.second)
+        self.assertEqual(self.spans(self.matches.holes(0, 20)), [(5, 8), (15, 20)])
+
+    def test_holes_with_ignore(self):
+        ignore_first = lambda match: match.name == 'first'
+        self.assertEqual(self.spans(self.matches.holes(0, 20, ignore=ignore_first)), [(0, 10), (15, 20)])
+        self.first.name = 'renamed'
+        self.assertEqual(self.spans(self.matches.holes(0, 20, ignore=ignore_first)), [(5, 10), (15, 20)])
+
+    def test_contains_any_after_rename(self):
+        self.assertTrue(self.matches.contains_any(['first']))
+        self.first.name = 'renamed'
+        self.assertFalse(self.matches.contains_any(['first']))
+        self.assertTrue(self.matches.contains_any(['renamed']))
+
+    def test_contains_any_after_tags_edit(self):
+        self.assertFalse(self.matches.contains_any(tags=['tag']))
+        self.second.tags = ['tag']
+        self.assertTrue(self.matches.contains_any(tags=['tag']))
+
+    def test_list_changes(self):
+        self.assertEqual(self.matches.range(0, 20), [self.first, self.second])
+        self.matches.remove(self.first)
+        self.assertEqual(self.matches.range(0, 20), [self.second])
+        self.matches.append(self.first)
+        self.assertEqual(self.matches.range(0, 20), [self.first, self.second])
+
+
+class TestIntervalIndex(TestCase):
+    """
+    Queries of the interval index give the results of a linear scan of the items.
+    """
+    def setUp(self):
+        rand = random.Random(0)
+        self.items = []
+        for value in range(200):
+            start = rand.randint(0, 100)
+            self.items.append(Item(value, (start, start + rand.choice([0, 1, 2, 5, 20]))))
+        self.index = IntervalIndex(20)
+        for item in self.items:
+            self.index.add(item)
+
+    def check(self):
+        for pos in range(-1, 125):
+            self.assertEqual(self.index.at(pos), [item for item in self.items if item.span[0] <= pos < item.span[1]])
+            self.assertEqual(list(self.index.starts_from(pos, pos + 10)),
+                             sorted((item.span[0], item) for item in self.items if pos <= item.span[0] < pos + 10))
+            self.assertEqual(list(self.index.starts_before(pos)),
+                             sorted(((item.span[0], item) for item in self.items if item.span[0] < pos),
+                                    reverse=True))
+            for end in (pos, pos + 1, pos + 7):
+                self.assertEqual([entry[-1] for entry in self.index.overlapping(pos, end)],
+                                 [item for item in self.items if item.span[0] < end and pos < item.span[1]
+                                  and item.span[0] < item.span[1] and pos < end])
+
+    def test_queries(self):
+        self.check()
+
+    def test_remove(self):
+        for item in self.items[::3]:
+            self.index.remove(item)
+        del self.items[::3]
+        self.check()
+
+    def test_remove_missing(self):
+        self.assertRaises(ValueError, self.index.remove, Item('missing', (3, 5)))
+
+
+class TestPrefilter(TestCase):
+    """
+    Regular expressions are skipped only if they can't match the input.
+    """
+    regexps = [r'S(\d+)E(\d+)', r'(?:x|h)[-.]?26[45]', r'Blu-?ray', r'(?:DTS|AC3|DD5\.1)', r'\d{4}', r'[ab]+c?',
+               r'(?:part|cd)\d*']
+    strings = ['Show.S01E02.x264', 'Movie.2010.BluRay.DTS-HD', 'abc', 'Part.II.avi', 'Film.H.265.ac3', 'bluray',
+               'CD2', 'nothing here', '']
+
+    def test_requirements(self):
+        requirements = regex_requirements(re.compile(r'(?:x|h)[-.]?26[45]', re.I))
+        self.assertEqual(requirements, [frozenset(['x', 'h']), frozenset(['26']), frozenset([prefilter.DIGIT])])
+        # optional parts are not required
+        self.assertEqual(regex_requirements(re.compile(r'Blu-?ray')), [frozenset(['blu']), frozenset(['ray'])])
+        self.assertEqual(regex_requirements(re.compile(r'(?:a|b?)\w')), [])
+
+    def test_accepted(self):
+        rebulk = Rebulk(default_rules=False).regex(*self.regexps, flags=re.IGNORECASE)
+        prefilter_ = RegexPrefilter(rebulk.effective_patterns())
+        pattern = rebulk.effective_patterns()[0]
+        for string in self.strings:
+            fragments = InputFragments(string)
+            accepted = prefilter_.accepted(pattern, fragments)
+            for regex in pattern.patterns:
+                if regex not in accepted:
+                    self.assertEqual(regex.search(string), None)
+        self.assertTrue(prefilter_.stats['skipped'] > 0)
+
+    def test_non_ascii_input(self):
+        # case folding of non ascii characters may give ascii characters
+        fragments = InputFragments(u'\u212a')
+        self.assertTrue(fragments.satisfies([frozenset(['k'])]))
+
+    def test_matches(self):
+        rebulk = Rebulk(default_rules=False).regex(*self.regexps, flags=re.IGNORECASE)
+        for string in self.strings:
+            expected = [(match.span, match.value) for regex in rebulk.effective_patterns()[0].patterns
+                        for match in [Match(*found.span(), input_string=string) for found in regex.finditer(string)]]
+            self.assertEqual(sorted((match.span, match.value) for match in rebulk.matches(string)), sorted(expected))
+        self.assertTrue(rebulk.prefilter_stats()['skipped'] > 0)
+
+
+class Recorder(Rule):
+    """
+    Rule recording its evaluations and removing nothing.
+    """
+    consequence = RemoveMatch
+
+    def __init__(self):
+        super(Recorder, self).__init__()
+        self.calls = 0
+
+    def when(self, matches, context):
+        self.calls += 1
+
+
+class First(Recorder):
+    priority = 10
+
+
+class Second(Recorder):
+    priority = 10
+    dependency = First
+
+
+class Independent(Recorder):
+    priority = 10
+
+
+class Last(Recorder):
+    pass
+
+
+class Triggered(Recorder):
+    trigger_names = ['name']
+    trigger_tags = ['tag']
+
+
+class TestExecutionPlan(TestCase):
+    """
+    Execution plan of rules and effective rules of rebulk objects are cached until they change.
+    """
+    def groups(self, rules):
+        return [(priority, [rule.__class__ for rule in group]) for priority, _, group in rules.execution_plan()]
+
+    def test_plan(self):
+        rules = Rules(Last, Second, Independent, First)
+        self.assertEqual(self.groups(rules), [(10, [Independent, First]), (10, [Second]), (0, [Last])])
+        self.assertTrue(rules.execution_plan() is rules.execution_plan())
+
+    def test_plan_after_change(self):
+        rules = Rules(First, Second)
+        plan = rules.execution_plan()
+        rules.append(Last())
+        self.assertEqual(self.groups(rules), [(10, [First]), (10, [Second]), (0, [Last])])
+        rules.remove(First())
+        self.assertEqual(self.groups(rules), [(10, [Second]), (0, [Last])])
+        self.assertFalse(rules.execution_plan() is plan)
+
+    def test_effective_rules(self):
+        child = Rebulk(disabled=lambda context: context.get('disabled'), default_rules=False).rules(Second)
+        rebulk = Rebulk(default_rules=False).rules(First).rebulk(child)
+        rules = rebulk.effective_rules({})
+        self.assertEqual([rule.__class__ for rule in rules], [First, Second])
+        self.assertTrue(rebulk.effective_rules({}) is rules)
+        self.assertEqual([rule.__class__ for rule in rebulk.effective_rules({'disabled': True})], [First])
+        child.rules(Last)
+        self.assertEqual([rule.__class__ for rule in rebulk.effective_rules({})], [First, Second, Last])
+        rebulk.rebulk(Rebulk(default_rules=False).rules(Independent))
+        self.assertEqual([rule.__class__ for rule in rebulk.effective_rules({})], [First, Second, Last, Independent])
+
+    def test_effective_patterns(self):
+        child = Rebulk(disabled=lambda context: context.get('disabled'), default_rules=False).string('child')
+        rebulk = Rebulk(default_rules=False).string('parent').rebulk(child)
+        self.assertEqual([match.value for match in rebulk.matches('parent child')], ['parent', 'child'])
+        self.assertEqual([match.value for match in rebulk.matches('parent child', {'disabled': True})], ['parent'])
+        rebulk.string('other')
+        self.assertEqual([match.value for match in rebulk.matches('parent other child')], ['parent', 'other', 'child'])
+
+
+class TestTrigger(TestCase):
+    """
+    Rules are evaluated only if matches contain one of their trigger names or tags.
+    """
+    def setUp(self):
+        self.always = Last()
+        self.triggered = Triggered()
+        self.rules = Rules(self.always, self.triggered)
+        self.matches = Matches(input_string='abcdef')
+
+    def test_skipped(self):
+        self.matches.append(Match(0, 3, name='other', input_string='abcdef'))
+        self.rules.execute_all_rules(self.matches, {})
+        self.assertEqual((self.always.calls, self.triggered.calls), (1, 0))
+        self.assertEqual(self.rules.stats, {'evaluated': 1, 'skipped': 1, 'skipped_rules': {'Triggered': 1}})
+
+    def test_name(self):
+        self.matches.append(Match(0, 3, name='name', input_string='abcdef'))
+        self.rules.execute_all_rules(self.matches, {})
+        self.assertEqual(self.triggered.calls, 1)
+
+    def test_tag(self):
+        self.matches.append(Match(0, 3, name='other', tags=['tag'], input_string='abcdef'))
+        self.rules.execute_all_rules(self.matches, {})
+        self.assertEqual(self.triggered.calls, 1)
+
+    def test_rename(self):
+        match = Match(0, 3, name='other', input_string='abcdef')
+        self.matches.append(match)
+        self.rules.execute_all_rules(self.matches, {})
+        match.name = 'name'
+        self.rules.execute_all_rules(self.matches, {})
+        self.assertEqual(self.triggered.calls, 1)
+        self.assertEqual(self.rules.stats['evaluated'], 3)
+
+
+def suite():
+    suite = TestSuite()
+    for case in (TestQueryCache, TestIntervalIndex, TestPrefilter, TestExecutionPlan, TestTrigger):
+        suite.addTest(TestLoader().loadTestsFromTestCase(case))
+    for module in (automaton, intervals, prefilter):
+        suite.addTest(doctest.DocTestSuite(module))
+    return suite
+
+
+def load_tests(loader, tests, pattern):  # pylint:disable=unused-argument
+    return suite()
+
+
+if __name__ == '__main__':
+    TextTestRunner().run(suite())
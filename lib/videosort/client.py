@@ -0,0 +1,99 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Thin client passing a post-processing job to a running VideoSort worker.
+
+    The module must stay cheap to import: it is loaded by VideoSort.py
+    before guessit and must not pull in anything but the standard library.
+"""
+
+import os
+import sys
+import json
+import socket
+
+# Exit code used by NZBGet
+POSTPROCESS_ERROR=94
+
+# Environment variables passed to the worker: pp-parameters, script options,
+# nzb-file properties and NZBGet global options
+ENV_PREFIXES = ('NZBPP_', 'NZBPO_', 'NZBPR_', 'NZBOP_')
+
+# Line sent by the worker after the output of the job and a newline, followed by exit code
+EXIT_MARKER = b'\0EXIT='
+
+def job_environ(environ):
+    """ Returns the part of the environment which describes the job """
+    return dict((key, value) for key, value in environ.items() if key.startswith(ENV_PREFIXES))
+
+def forward_job(socket_path, environ=None, out=None):
+    """ Sends the job to the worker and relays its output to 'out' (stdout).
+        Returns exit code of the job or None if the worker is not running,
+        in which case the caller must process the job itself.
+    """
+    if not socket_path or not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    if environ is None:
+        environ = os.environ
+    if out is None:
+        out = getattr(sys.stdout, 'buffer', sys.stdout)
+
+    try:
+        request = json.dumps(job_environ(environ)).encode('utf-8') + b'\n'
+    except (UnicodeError, ValueError):
+        # the worker can't reproduce such environment, process the job in-process
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except socket.error:
+        sock.close()
+        return None
+
+    try:
+        sock.sendall(request)
+        sock.shutdown(socket.SHUT_WR)
+        response = sock.makefile('rb')
+        # a line is written when the next one is received: the newline
+        # before the marker was added by the worker and is removed
+        pending = None
+        for line in response:
+            if line.startswith(EXIT_MARKER) and pending is not None:
+                out.write(pending[:-1])
+                out.flush()
+                try:
+                    return int(line[len(EXIT_MARKER):])
+                except ValueError:
+                    break
+            if pending is not None:
+                out.write(pending)
+                out.flush()
+            pending = line
+        if pending is not None:
+            out.write(pending)
+    except socket.error:
+        pass
+    finally:
+        sock.close()
+
+    out.write(b'[ERROR] VideoSort worker terminated unexpectedly\n')
+    out.flush()
+    return POSTPROCESS_ERROR
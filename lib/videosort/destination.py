@@ -0,0 +1,125 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Cache of destination directories.
+
+    Each destination directory is listed once per job. Checks for existing
+    files (name collisions, "(2)"-suffixes) and directories are answered
+    from the listing instead of a stat-call per probe, which matters for
+    large directories on network shares.
+"""
+
+import os
+import sys
+
+# Default for directories where case sensitivity can't be detected
+CASE_INSENSITIVE_PLATFORMS = ('darwin', 'win32', 'cygwin')
+
+def list_names(dirpath):
+    """ Returns names of all entries in directory. Raises OSError. """
+    if hasattr(os, 'scandir'):
+        return [entry.name for entry in os.scandir(dirpath)]
+    return os.listdir(dirpath)
+
+def is_case_insensitive(dirpath, names):
+    """ Detects if the file system of directory ignores letter case """
+    for name in names:
+        swapped = name.swapcase()
+        if swapped != name and swapped not in names:
+            return os.path.exists(os.path.join(dirpath, swapped))
+    return sys.platform in CASE_INSENSITIVE_PLATFORMS
+
+
+class DirListing(object):
+    """ Names in one directory, lowercased if the file system ignores case """
+
+    def __init__(self, names, case_insensitive):
+        self.case_insensitive = case_insensitive
+        self.names = set(self.key(name) for name in names)
+
+    def key(self, name):
+        return name.lower() if self.case_insensitive else name
+
+    def __contains__(self, name):
+        return self.key(name) in self.names
+
+    def add(self, name):
+        self.names.add(self.key(name))
+
+    def discard(self, name):
+        self.names.discard(self.key(name))
+
+
+class DestinationCache(object):
+    """ Listings of destination directories, read on first use """
+
+    def __init__(self):
+        # dirpath -> DirListing or None if the directory doesn't exist
+        self.dirs = {}
+
+    def listing(self, dirpath):
+        if dirpath not in self.dirs:
+            try:
+                names = list_names(dirpath)
+            except OSError:
+                self.dirs[dirpath] = None
+            else:
+                self.dirs[dirpath] = DirListing(names, is_case_insensitive(dirpath, names))
+        return self.dirs[dirpath]
+
+    def exists(self, path):
+        """ Checks if a file or directory exists (as os.path.exists) """
+        dirpath, name = os.path.split(path)
+        listing = self.listing(dirpath)
+        return listing is not None and name in listing
+
+    def dir_exists(self, dirpath):
+        return self.listing(dirpath) is not None
+
+    def makedirs(self, dirpath):
+        """ Creates directory with all missing parents """
+        if self.dir_exists(dirpath):
+            return
+        os.makedirs(dirpath)
+        head, name = os.path.split(dirpath)
+        self.dirs[dirpath] = DirListing((), is_case_insensitive(head, [name]))
+        # Parents created by makedirs are listed again on next use
+        while name:
+            listing = self.dirs.get(head)
+            if listing is not None:
+                listing.add(name)
+                break
+            self.dirs.pop(head, None)
+            if os.path.dirname(head) == head:
+                break
+            head, name = os.path.split(head)
+
+    def add(self, path):
+        """ Registers file created in destination directory """
+        dirpath, name = os.path.split(path)
+        listing = self.listing(dirpath)
+        if listing is not None:
+            listing.add(name)
+
+    def remove(self, path):
+        """ Registers file deleted from destination directory """
+        dirpath, name = os.path.split(path)
+        listing = self.dirs.get(dirpath)
+        if listing is not None:
+            listing.discard(name)
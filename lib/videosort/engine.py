@@ -0,0 +1,1147 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Sort engine of VideoSort.
+
+    Script options are parsed once into a Config. Each download is sorted
+    by a SortJob holding the state of that download only, so one process can
+    sort any number of downloads:
+
+        config = Config.from_environ(os.environ)
+        result = sort_download(config, '/downloads/My.Show.S01E02.720p')
+"""
+
+from __future__ import print_function
+
+import sys
+import os
+import traceback
+import re
+import shutil
+import guessit
+from collections import namedtuple
+
+from videosort.inventory import Inventory
+from videosort.destination import DestinationCache
+from videosort.transfer import transfer_file
+from videosort.stats import JobTimer, timed, clock, to_text
+from videosort.nfo import scan_nfo, similar_words
+from videosort.titles import TitleCase
+from videosort.template import FormatTemplate, MOVIES_SPECIFIERS, SERIES_SPECIFIERS, \
+    DATED_SPECIFIERS, DATED_DEPRECATED
+
+try:
+    unicode
+except NameError:
+    unicode = str
+
+# Exit codes used by NZBGet
+POSTPROCESS_SUCCESS=93
+POSTPROCESS_NONE=95
+POSTPROCESS_ERROR=94
+
+# Script config options which must be present in config file
+REQUIRED_OPTIONS = ('NZBPO_MoviesDir', 'NZBPO_SeriesDir', 'NZBPO_DatedDir',
+    'NZBPO_OtherTvDir', 'NZBPO_VideoExtensions', 'NZBPO_SatelliteExtensions', 'NZBPO_MinSize',
+    'NZBPO_MoviesFormat', 'NZBPO_SeriesFormat', 'NZBPO_OtherTvFormat', 'NZBPO_DatedFormat',
+    'NZBPO_EpisodeSeparator', 'NZBPO_Overwrite', 'NZBPO_Cleanup', 'NZBPO_LowerWords', 'NZBPO_UpperWords',
+    'NZBPO_TvCategories', 'NZBPO_Preview', 'NZBPO_Verbose')
+
+# difflib match threshold. Anything below is not considered a match
+DEEP_SCAN_RATIO = 0.60
+
+
+class Config(namedtuple('Config', ['movies_format', 'series_format', 'dated_format', 'othertv_format',
+        'multiple_episodes', 'episode_separator', 'movies_dir', 'series_dir', 'dated_dir', 'othertv_dir',
+        'video_extensions', 'satellite_extensions', 'min_size', 'overwrite', 'cleanup', 'hardlink', 'preview', 'verbose',
+        'satellites', 'lower_words', 'upper_words', 'series_year', 'tv_categories', 'dnzb_headers',
+        'prefer_nzb_name', 'deep_scan', 'deep_scan_ratio',
+        'movies_template', 'series_template', 'dated_template', 'othertv_template', 'title_case', 'stats_file',
+        'format_warnings'])):
+    """ Script options (NZBPO_*). Immutable, can be shared by any number of jobs. """
+    __slots__ = ()
+
+    @staticmethod
+    def missing_options(environ):
+        """ Returns names of required options absent in environment """
+        return [optname[6:] for optname in REQUIRED_OPTIONS if not optname.upper() in environ]
+
+    @classmethod
+    def from_environ(cls, environ):
+        """ Parses script options, raises KeyError if a required option is missing """
+        satellite_extensions = tuple(environ['NZBPO_SATELLITEEXTENSIONS'].replace(' ', '').lower().split(','))
+        dnzb_headers = environ.get('NZBPO_DNZBHEADERS', 'yes') == 'yes'
+        movies_format = environ['NZBPO_MOVIESFORMAT']
+        series_format = environ['NZBPO_SERIESFORMAT']
+        dated_format = environ['NZBPO_DATEDFORMAT']
+        othertv_format = environ['NZBPO_OTHERTVFORMAT']
+        lower_words = tuple(environ['NZBPO_LOWERWORDS'].replace(' ', '').split(','))
+        upper_words = tuple(environ['NZBPO_UPPERWORDS'].replace(' ', '').split(','))
+        movies_template = FormatTemplate(movies_format, MOVIES_SPECIFIERS)
+        series_template = FormatTemplate(series_format, SERIES_SPECIFIERS)
+        dated_template = FormatTemplate(dated_format, DATED_SPECIFIERS, DATED_DEPRECATED)
+        othertv_template = FormatTemplate(othertv_format, MOVIES_SPECIFIERS)
+        return cls(
+            movies_format=movies_format,
+            series_format=series_format,
+            dated_format=dated_format,
+            othertv_format=othertv_format,
+            multiple_episodes=environ.get('NZBPO_MULTIPLEEPISODES', 'list'),
+            episode_separator=environ['NZBPO_EPISODESEPARATOR'],
+            movies_dir=environ['NZBPO_MOVIESDIR'],
+            series_dir=environ['NZBPO_SERIESDIR'],
+            dated_dir=environ['NZBPO_DATEDDIR'],
+            othertv_dir=environ['NZBPO_OTHERTVDIR'],
+            video_extensions=tuple(environ['NZBPO_VIDEOEXTENSIONS'].replace(' ', '').lower().split(',')),
+            satellite_extensions=satellite_extensions,
+            min_size=int(environ['NZBPO_MINSIZE']) << 20,
+            overwrite=environ['NZBPO_OVERWRITE'] == 'yes',
+            cleanup=environ['NZBPO_CLEANUP'] == 'yes',
+            hardlink=environ.get('NZBPO_HARDLINK', 'no') == 'yes',
+            stats_file=environ.get('NZBPO_STATSFILE', ''),
+            preview=environ['NZBPO_PREVIEW'] == 'yes',
+            verbose=environ['NZBPO_VERBOSE'] == 'yes',
+            satellites=len(satellite_extensions)>0,
+            lower_words=lower_words,
+            upper_words=upper_words,
+            series_year=environ.get('NZBPO_SERIESYEAR', 'yes') == 'yes',
+            tv_categories=tuple(environ['NZBPO_TVCATEGORIES'].lower().split(',')),
+            dnzb_headers=dnzb_headers,
+            prefer_nzb_name=environ.get('NZBPO_PREFERNZBNAME', '') == 'yes',
+            # NZBPO_DNZBHEADERS must also be enabled
+            deep_scan=dnzb_headers,
+            deep_scan_ratio=DEEP_SCAN_RATIO,
+            movies_template=movies_template,
+            series_template=series_template,
+            dated_template=dated_template,
+            othertv_template=othertv_template,
+            title_case=TitleCase(lower_words, upper_words),
+            # Unknown specifiers of all formats, reported when the config is loaded
+            format_warnings=tuple(movies_template.unknown_warnings('MoviesFormat') +
+                series_template.unknown_warnings('SeriesFormat') +
+                dated_template.unknown_warnings('DatedFormat') +
+                othertv_template.unknown_warnings('OtherTvFormat')))
+
+
+class DnzbHeaders(namedtuple('DnzbHeaders', ['proper_name', 'episode_name', 'movie_year', 'more_info'])):
+    """ Direct-NZB headers of a download """
+    __slots__ = ()
+
+    @classmethod
+    def from_environ(cls, environ):
+        return cls(
+            proper_name=environ.get('NZBPR__DNZB_PROPERNAME', ''),
+            episode_name=environ.get('NZBPR__DNZB_EPISODENAME', ''),
+            movie_year=environ.get('NZBPR__DNZB_MOVIEYEAR', ''),
+            more_info=environ.get('NZBPR__DNZB_MOREINFO', ''))
+
+NO_DNZB_HEADERS = DnzbHeaders('', '', '', '')
+
+
+class SortResult(namedtuple('SortResult', ['status', 'moves', 'final_dirs'])):
+    """ Outcome of sorting a download:
+        status - exit code for NZBGet (POSTPROCESS_SUCCESS, _NONE or _ERROR);
+        moves - list of (source, destination) tuples, including satellites;
+        final_dirs - unique destination directories in order of moving.
+    """
+    __slots__ = ()
+
+    @property
+    def final_dir(self):
+        """ Value for NZBGet's FINALDIR command """
+        return '|'.join(self.final_dirs)
+
+
+STRIP_AFTER = ('_', '.', '-')
+
+# * From SABnzbd+ (with modifications) *
+
+REPLACE_AFTER = {
+    '()': '',
+    '..': '.',
+    '__': '_',
+    '  ': ' ',
+    '//': '/',
+    ' - - ': ' - ',
+    '--': '-'
+}
+
+def get_decades(year):
+    """ Return 4 digit and 2 digit decades given 'year'
+    """
+    if year:
+        try:
+            decade = year[2:3]+'0'
+            decade2 = year[:3]+'0'
+        except:
+            decade = ''
+            decade2 = ''
+    else:
+        decade = ''
+        decade2 = ''
+    return decade, decade2
+
+_RE_LOWERCASE = re.compile(r'{([^{]*)}')
+def to_lowercase(path):
+    ''' Lowercases any characters enclosed in {} '''
+    while True:
+        m = _RE_LOWERCASE.search(path)
+        if not m:
+            break
+        path = path[:m.start()] + m.group(1).lower() + path[m.end():]
+
+    # just incase
+    path = path.replace('{', '')
+    path = path.replace('}', '')
+    return path
+
+_RE_UPPERCASE = re.compile(r'{{([^{]*)}}')
+def to_uppercase(path):
+    ''' Lowercases any characters enclosed in {{}} '''
+    while True:
+        m = _RE_UPPERCASE.search(path)
+        if not m:
+            break
+        path = path[:m.start()] + m.group(1).upper() + path[m.end():]
+    return path
+
+def strip_folders(path):
+    """ Return 'path' without leading and trailing strip-characters in each element
+    """
+    f = path.strip('/').split('/')
+
+    # For path beginning with a slash, insert empty element to prevent loss
+    if len(path.strip()) > 0 and path.strip()[0] in '/\\':
+        f.insert(0, '')
+
+    def strip_all(x):
+        """ Strip all leading/trailing underscores and hyphens
+            also dots for Windows
+        """
+        old_name = ''
+        while old_name != x:
+            old_name = x
+            for strip_char in STRIP_AFTER:
+                x = x.strip().strip(strip_char)
+
+        return x
+
+    return os.path.normpath('/'.join([strip_all(x) for x in f]))
+
+# END * From SABnzbd+ * END
+
+def os_path_split(path):
+    parts = []
+    while True:
+        newpath, tail = os.path.split(path)
+        if newpath == path:
+            if path: parts.append(path)
+            break
+        parts.append(tail)
+        path = newpath
+    parts.reverse()
+    return parts
+
+
+class LazyMapping(object):
+    """ Values of format specifiers for a file. A value is computed on
+        first access and remembered, so only the specifiers referenced
+        by the formatting string are computed.
+    """
+
+    def __init__(self):
+        self.getters = {}
+        self.values = {}
+
+    def add(self, key, getter):
+        self.getters[key] = getter
+
+    def add_value(self, key, value):
+        self.values[key] = value
+
+    def add_items(self, keys, getter):
+        """ Adds specifiers for items of a tuple returned by getter, None keys are skipped """
+        for index, key in enumerate(keys):
+            if key is not None:
+                self.getters[key] = lambda index=index: getter()[index]
+
+    def __getitem__(self, key):
+        if key not in self.values:
+            self.values[key] = self.getters[key]()
+        return self.values[key]
+
+    def resolve(self, specifiers):
+        """ Returns dict with values of the specifiers """
+        return dict((key, self[key]) for key in specifiers)
+
+
+class SortJob(object):
+    """ Sorting of one download. Holds the state of the download (moved files etc.) """
+
+    def __init__(self, config, directory, nzb_name=None, category='', dnzb=NO_DNZB_HEADERS, out=None):
+        self.config = config
+        self.download_dir = directory
+        self.nzb_name = nzb_name if nzb_name is not None else os.path.basename(directory)
+        self.category = category
+        self.force_tv = category.lower() in config.tv_categories
+        self.dnzb = dnzb
+        self.out = out if out is not None else sys.stdout
+        self.verbose = config.verbose
+
+        # Use name of nzb-file instead of name of video file
+        self.use_nzb_name = False
+
+        # List of moved files (source path)
+        self.moved_src_files = []
+
+        # List of moved files (destination path)
+        self.moved_dst_files = []
+
+        # Set of moved files (destination path), for fast lookup
+        self.planned_dst_files = set()
+
+        # Listings of destination directories
+        self.destinations = DestinationCache()
+
+        # Separator character used between file name and opening brace
+        # for duplicate files such as "My Movie (2).mkv"
+        self.dupe_separator = ' '
+
+        # Flag indicating that anything was moved. Cleanup possible.
+        self.files_moved = False
+
+        # Flag indicating any error. Cleanup is disabled.
+        self.errors = False
+
+        # Files of the download directory, listed once when the job starts
+        self.inventory = None
+
+        # Satellite files grouped by lowercased base name (see satellite_index)
+        self._satellites = None
+
+        # Results of deep scan of nfo-files (path -> bool)
+        self._deep_scan_results = {}
+
+        # Scanned nfo-files (path -> NfoInfo or None)
+        self._nfo_scans = {}
+
+        # Formatting strings already checked for deprecated specifiers
+        self._warned_templates = set()
+
+        # Time spent in phases of the job
+        self.timer = JobTimer()
+
+    def log(self, message):
+        print(message, file=self.out)
+
+    def unique_name(self, new):
+        """ Adds unique numeric suffix to destination file name to avoid overwriting
+            such as "filename.(2).ext", "filename.(3).ext", etc.
+            If existing file was created by the script it is renamed to "filename.(1).ext".
+        """
+        fname, fext = os.path.splitext(new)
+        suffix_num = 2
+        while True:
+            new_name = fname + self.dupe_separator + '(' + str(suffix_num) + ')' + fext
+            if not self.destinations.exists(new_name) and new_name not in self.planned_dst_files:
+                break
+            suffix_num += 1
+        return new_name
+
+    def optimized_move(self, old, new):
+        start = clock()
+        size = os.path.getsize(old)
+        method, reason = transfer_file(old, new, self.config.hardlink)
+        self.timer.add('optimized_move', clock() - start, size)
+        if reason:
+            self.log('[DETAIL] %s, performed %s: %s' % (reason, method, new))
+
+    @timed('rename')
+    def rename(self, old, new):
+        """ Moves the file to its sorted location.
+            It creates any necessary directories to place the new file and moves it.
+        """
+        destinations = self.destinations
+        if destinations.exists(new) or new in self.planned_dst_files:
+            if self.config.overwrite and new not in self.planned_dst_files:
+                if not self.config.preview:
+                    os.remove(new)
+                    self.optimized_move(old, new)
+                self.log('[INFO] Overwrote: %s' % new)
+            else:
+                # rename to filename.(2).ext, filename.(3).ext, etc.
+                new = self.unique_name(new)
+                self.move(old, new)
+        else:
+            self.move(old, new)
+        self.inventory.remove(old)
+        self.moved_src_files.append(old)
+        self.moved_dst_files.append(new)
+        self.planned_dst_files.add(new)
+        return new
+
+    def move(self, old, new):
+        """ Moves the file to a new name, creating directories as needed """
+        if not self.config.preview:
+            self.destinations.makedirs(os.path.dirname(new))
+            self.optimized_move(old, new)
+            self.destinations.add(new)
+        self.log('[INFO] Moved: %s' % new)
+
+    def satellite_base(self, entry):
+        """ Returns base name of the video the satellite file belongs to
+            and the part to keep in the satellite name (subtitle language).
+        """
+        fbase = entry.base
+        subpart = ''
+        # We support GuessIt supported subtitle extensions
+        if entry.ext.lower()[1:] in ['srt', 'idx', 'sub', 'ssa', 'ass']:
+            guess = guessit.guessit(entry.name)
+            language = None
+            if guess and 'subtitle_language' in guess:
+                language = guess['subtitle_language']
+                # guessit returns a list only if it finds multiple languages
+                if isinstance(language, list):
+                    language = language[0]
+                fbase = fbase[:fbase.rfind('.')]
+                # Use alpha2 subtitle language from GuessIt (en, es, de, etc.)
+                subpart = '.' + language.alpha2
+            if self.verbose:
+                if subpart != '':
+                    self.log('Satellite: %s is a subtitle [%s]' % (entry.name, language))
+                else:
+                    # English (or undetermined)
+                    self.log('Satellite: %s is a subtitle' % entry.name)
+        return fbase, subpart
+
+    def satellite_index(self):
+        """ Satellite files grouped by lowercased base name of the video they
+            belong to. Built on first use from the inventory.
+        """
+        if self._satellites is None:
+            self._satellites = {}
+            for entry in self.inventory.with_extensions(self.config.satellite_extensions):
+                fbase, subpart = self.satellite_base(entry)
+                self._satellites.setdefault(fbase.lower(), []).append((entry, subpart))
+        return self._satellites
+
+    def nfo_matches(self, entry):
+        """ Checks if nfo-file with a different base name belongs to the download """
+        if entry.path not in self._deep_scan_results:
+            # Guess details are not important, just that there was a match
+            self._deep_scan_results[entry.path] = self.deep_scan_nfo(entry.path) is not None
+        return self._deep_scan_results[entry.path]
+
+    @timed('move_satellites')
+    def move_satellites(self, videofile, dest):
+        """ Moves satellite files such as subtitles that are associated with base
+            and stored in root to the correct dest.
+        """
+        if self.verbose:
+            self.log('Move satellites for %s' % videofile)
+
+        root = os.path.dirname(videofile)
+        destbasenm = os.path.splitext(dest)[0]
+        base = os.path.basename(os.path.splitext(videofile)[0]).lower()
+        index = self.satellite_index()
+
+        found = [(entry, subpart) for entry, subpart in index.get(base, ())
+            if Inventory.is_under(entry, root)]
+
+        # Aggressive match attempt for nfo-files
+        if self.config.deep_scan and '.nfo' in self.config.satellite_extensions:
+            for fbase, satellites in index.items():
+                if fbase != base:
+                    found.extend((entry, subpart) for entry, subpart in satellites
+                        if entry.ext.lower() == '.nfo' and Inventory.is_under(entry, root) and
+                            self.inventory.contains(entry) and self.nfo_matches(entry))
+
+        # keep the order of files in directory
+        found.sort(key=lambda item: item[0].order)
+
+        for entry, subpart in found:
+            if self.inventory.contains(entry):
+                if self.config.deep_scan and entry.ext.lower() == '.nfo':
+                    # read before the move, other videos of the directory may need its IMDb ID
+                    self.scan_nfo(entry.path)
+                new = destbasenm + subpart + entry.ext
+                if self.verbose:
+                    self.log('Satellite: %s' % os.path.basename(new))
+                self.rename(entry.path, new)
+
+    def scan_nfo(self, filename):
+        """ Returns NfoInfo of nfo-file (read once per job) or None on error """
+        if filename not in self._nfo_scans:
+            try:
+                self._nfo_scans[filename] = scan_nfo(filename)
+            except IOError as e:
+                self.log('[ERROR] %s' % str(e))
+                self._nfo_scans[filename] = None
+        return self._nfo_scans[filename]
+
+    @timed('deep_scan_nfo')
+    def deep_scan_nfo(self, filename, ratio=None):
+        if ratio is None:
+            ratio = self.config.deep_scan_ratio
+        if self.verbose:
+            self.log('Deep scanning satellite: %s (ratio=%.2f)' % (filename, ratio))
+        info = self.scan_nfo(filename)
+        if info is None:
+            return None
+        # Compare words against NZB name, best matches first
+        for word_ratio, word in similar_words(info.words, self.nzb_name, ratio):
+            try:
+                guess = guessit.guessit(word + '.nfo')
+            except UnicodeDecodeError:
+                continue
+            if self.verbose:
+                self.log('Tested: %s (ratio=%.2f)' % (word, word_ratio))
+            # Series = TV, Title = Movie
+            if 'title' in guess:
+                if self.verbose:
+                    self.log('Possible match found: %s (ratio=%.2f)' % (word, word_ratio))
+                return guess
+        return None
+
+    def nfo_imdb(self, videofile):
+        """ Returns IMDb ID from nfo-files stored with the video or empty string.
+            These are nfo-files in the directory of the video and, in its
+            subdirectories, nfo-files with the same base name as the video;
+            nfo-files of other videos in subdirectories are not used.
+            Nfo-file with the same base name as the video is checked first.
+            Nfo-files already moved with another video are checked too, they
+            were scanned before the move.
+        """
+        root = os.path.dirname(videofile)
+        base = os.path.basename(os.path.splitext(videofile)[0]).lower()
+        nfos = [entry for entry in self.inventory.files
+            if entry.ext.lower() == '.nfo' and (entry.dirpath == root or
+                entry.base.lower() == base and Inventory.is_under(entry, root))]
+        nfos.sort(key=lambda entry: entry.base.lower() != base)
+        for entry in nfos:
+            info = self.scan_nfo(entry.path)
+            if info is not None and info.imdb_ids:
+                if self.verbose:
+                    self.log('Using IMDb ID from %s' % entry.name)
+                return info.imdb_ids[0]
+        return ''
+
+    @timed('cleanup_download_dir')
+    def cleanup_download_dir(self):
+        """ Remove the download directory if it (or any subfodler) does not contain "important" files
+            (important = size >= min_size)
+        """
+        if self.verbose:
+            self.log('Cleanup')
+
+        preview = self.config.preview
+
+        # Check if there are any big files remaining
+        for entry in self.inventory:
+            # Check minimum file size
+            if (entry.size or 0) >= self.config.min_size:
+                self.log('[WARNING] Skipping clean up due to large files remaining in the directory')
+                return
+
+        # Now delete all files with nice logging
+        for entry in self.inventory:
+            if not preview:
+                os.remove(entry.path)
+            self.log('[INFO] Deleted: %s' % entry.path)
+        if not preview:
+            shutil.rmtree(self.download_dir)
+        self.log('[INFO] Deleted: %s' % self.download_dir)
+
+    def titles(self, name, titleing=False):
+        """ Returns the name with words separated with spaces, dots and underscores """
+        return self.config.title_case.titles(name, titleing)
+
+    def add_titles(self, mapping, name, titled, original):
+        """ Adds specifiers of a name with words separated with spaces, dots
+            and underscores: 'titled' - case-adjusted, 'original' - original letter case.
+        """
+        mapping.add_items(titled, lambda: self.titles(name, True))
+        mapping.add_items(original, lambda: self.titles(name, False))
+
+    def add_common_mapping(self, old_filename, guess, mapping):
+
+        # Original dir name, file name and extension
+        original_dirname = os.path.basename(self.download_dir)
+        original_fname, original_fext = os.path.splitext(os.path.split(os.path.basename(old_filename))[1])
+        original_category = self.category
+
+        # Directory name
+        dir_title = original_dirname.replace("-", " ").replace('.',' ').replace('_',' ')
+        mapping.add_value('%dn', original_dirname)
+        self.add_titles(mapping, dir_title, ('%^dn', '%.dn', '%_dn'), ('%^dN', '%.dN', '%_dN'))
+
+        # File name
+        fname_title = original_fname.replace("-", " ").replace('.',' ').replace('_',' ')
+        mapping.add_value('%fn', original_fname)
+        self.add_titles(mapping, fname_title, ('%^fn', '%.fn', '%_fn'), ('%^fN', '%.fN', '%_fN'))
+
+        # File extension
+        mapping.add_value('%ext', original_fext)
+        mapping.add('%EXT', lambda: original_fext.upper())
+        mapping.add('%Ext', lambda: original_fext.title())
+
+        # Category
+        self.add_titles(mapping, original_category, ('%cat', '%.cat', '%_cat'), ('%cAt', '%.cAt', '%_cAt'))
+
+        # Video information
+        mapping.add_value('%qf', guess.get('format', ''))
+        mapping.add_value('%qss', guess.get('screen_size', ''))
+        mapping.add_value('%qvc', guess.get('video_codec', ''))
+        mapping.add_value('%qac', guess.get('audio_codec', ''))
+        mapping.add_value('%qah', guess.get('audio_channels', ''))
+        mapping.add_value('%qrg', guess.get('release_group', ''))
+
+    def add_year_mapping(self, year, mapping):
+
+        # year
+        mapping.add_value('%y', year)
+
+        # decades
+        mapping.add_items(('%decade', '%0decade'), lambda: get_decades(year))
+
+    def add_episode_name_mapping(self, guess, mapping):
+
+        # episode names
+        title = guess.get('episode_title')
+        if title:
+            self.add_titles(mapping, title, ('%en', '%e.n', '%e_n'), ('%eN', '%e.N', '%e_N'))
+        else:
+            for key in ('%en', '%e.n', '%e_n', '%eN', '%e.N', '%e_N'):
+                mapping.add_value(key, '')
+
+    def add_series_mapping(self, guess, mapping):
+
+        # Show name
+        series = guess.get('title', '')
+        self.add_titles(mapping, series, ('%sn', '%s.n', '%s_n'), ('%sN', '%s.N', '%s_N'))
+
+        # season number
+        season_num = str(guess.get('season', ''))
+        mapping.add_value('%s', season_num)
+        mapping.add('%0s', lambda: season_num.rjust(2,'0'))
+
+        self.add_episode_name_mapping(guess, mapping)
+
+        # episode number
+        if not isinstance(guess.get('episode'), list):
+            episode_num = str(guess.get('episode', ''))
+            mapping.add_value('%e', episode_num)
+            mapping.add('%0e', lambda: episode_num.rjust(2,'0'))
+        else:
+            # multi episodes
+            mapping.add_items(('%e', '%0e'), lambda: self.episode_numbers(guess.get('episode')))
+
+        self.add_year_mapping(str(guess.get('year', '')), mapping)
+
+    def episode_numbers(self, episodes):
+        """ Returns numbers of multiple episodes as is and two-digits """
+        episodes = [str(item) for item in episodes]
+        episode_num_all = ''
+        episode_num_just = ''
+        episode_separator = self.config.episode_separator
+        if self.config.multiple_episodes == 'range':
+            episode_num_all = episodes[0] + episode_separator + episodes[-1]
+            episode_num_just = episodes[0].rjust(2, '0') + episode_separator + episodes[-1].rjust(2, '0')
+        else:   # if multiple_episodes == 'list':
+            for episode_num in episodes:
+                ep_prefix = episode_separator if episode_num_all != '' else ''
+                episode_num_all += ep_prefix + episode_num
+                episode_num_just += ep_prefix + episode_num.rjust(2,'0')
+        return episode_num_all, episode_num_just
+
+    def add_movies_mapping(self, filename, guess, mapping):
+
+        # title
+        name = guess.get('title', '')
+        self.add_titles(mapping, name, ('%title', '%.title', '%_title'), (None, None, None))
+
+        # title (short forms)
+        self.add_titles(mapping, name, ('%t', '%.t', '%_t'), ('%tT', '%t.T', '%t_T'))
+
+        self.add_year_mapping(str(guess.get('year', '')), mapping)
+
+        # imdb (from DNZB-header or nfo-file)
+        if 'imdb' in guess or not self.config.deep_scan:
+            mapping.add_value('%imdb', guess.get('imdb', ''))
+            mapping.add_value('%cpimdb', guess.get('cpimdb', ''))
+        else:
+            mapping.add('%imdb', lambda: self.nfo_imdb(filename))
+            mapping.add('%cpimdb', lambda: 'cp(' + mapping['%imdb'] + ')' if mapping['%imdb'] else '')
+
+    def add_dated_mapping(self, guess, mapping):
+
+        # title
+        name = guess.get('title', '')
+        self.add_titles(mapping, name, ('%title', '%.title', '%_title'), (None, None, None))
+
+        # title (short forms)
+        self.add_titles(mapping, name, ('%t', '%.t', '%_t'), (None, None, None))
+
+        # Show name
+        series = guess.get('title', '')
+        self.add_titles(mapping, series, ('%sn', '%s.n', '%s_n'), ('%sN', '%s.N', '%s_N'))
+
+        # Some older code at this point stated:
+        # "Guessit doesn't provide episode names for dated tv shows"
+        # but was referring to the invalid field '%desc'
+        # In my researches I couldn't find such a case, but just to be sure
+        self.add_episode_name_mapping(guess, mapping)
+
+        # date
+        date = guess.get('date')
+
+        # year
+        mapping.add('%year', lambda: str(date.year))
+        mapping.add('%y', lambda: str(date.year))
+
+        # decades
+        mapping.add_items(('%decade', '%0decade'), lambda: get_decades(str(date.year)))
+
+        # month
+        mapping.add('%m', lambda: str(date.month))
+        mapping.add('%0m', lambda: str(date.month).rjust(2, '0'))
+
+        # day
+        mapping.add('%d', lambda: str(date.day))
+        mapping.add('%0d', lambda: str(date.day).rjust(2, '0'))
+
+    def deobfuscate_path(self, filename):
+        start = os.path.dirname(self.download_dir)
+        new_name = filename[len(start)+1:]
+        if self.verbose:
+            self.log('stripped filename: %s' % new_name)
+
+        parts = os_path_split(new_name)
+        if self.verbose:
+            self.log(parts)
+
+        part_removed = 0
+        for x in range(0, len(parts)-1):
+            fn = parts[x]
+            if fn.find('.')==-1 and fn.find('_')==-1 and fn.find(' ')==-1:
+                self.log('Detected obfuscated directory name %s, removing from guess path' % fn)
+                parts[x] = None
+                part_removed += 1
+
+        fn = os.path.splitext(parts[len(parts)-1])[0]
+        if fn.find('.')==-1 and fn.find('_')==-1 and fn.find(' ')==-1:
+            self.log('Detected obfuscated filename %s, removing from guess path' % os.path.basename(filename))
+            parts[len(parts)-1] = '-' + os.path.splitext(filename)[1]
+            part_removed += 1
+
+        if part_removed < len(parts):
+            new_name = ''
+            for x in range(0, len(parts)):
+                if parts[x] != None:
+                    new_name = os.path.join(new_name, parts[x])
+        else:
+            self.log("All file path parts are obfuscated, using obfuscated NZB-Name")
+            new_name = os.path.basename(self.download_dir) + os.path.splitext(filename)[1]
+
+        return new_name
+
+    def remove_year(self, title):
+        """ Removes year from series name (if exist) """
+        m = re.compile('..*(\((19|20)\d\d\))').search(title)
+        if not m:
+            m = re.compile('..*((19|20)\d\d)').search(title)
+        if m:
+            if self.verbose:
+                self.log('Removing year from series name')
+            title = title.replace(m.group(1), '').strip()
+        return title
+
+    def apply_dnzb_headers(self, guess):
+        """ Applies DNZB headers (if exist) """
+
+        dnzb = self.dnzb
+        dnzb_used = False
+        if dnzb.proper_name != '':
+            dnzb_used = True
+            if self.verbose:
+                self.log('Using DNZB-ProperName')
+            if guess['vtype'] == 'series':
+                proper_name = dnzb.proper_name
+                if not self.config.series_year:
+                    proper_name = self.remove_year(proper_name)
+                guess['title'] = proper_name
+            else:
+                guess['title'] = dnzb.proper_name
+
+        if dnzb.episode_name != '' and guess['vtype'] == 'series':
+            dnzb_used = True
+            if self.verbose:
+                self.log('Using DNZB-EpisodeName')
+            guess['episode_title'] = dnzb.episode_name
+
+        if dnzb.movie_year != '':
+            dnzb_used = True
+            if self.verbose:
+                self.log('Using DNZB-MovieYear')
+            guess['year'] = dnzb.movie_year
+
+        if dnzb.more_info != '':
+            dnzb_used = True
+            if self.verbose:
+                self.log('Using DNZB-MoreInfo')
+            if guess['type'] == 'movie':
+                regex = re.compile(r'^http://www.imdb.com/title/(tt[0-9]+)/$', re.IGNORECASE)
+                matches = regex.match(dnzb.more_info)
+                if matches:
+                    guess['imdb'] = matches.group(1)
+                    guess['cpimdb'] = 'cp(' + guess['imdb'] + ')'
+
+        if self.verbose and dnzb_used:
+            self.log(guess)
+
+    @timed('guess_info')
+    def guess_info(self, filename):
+        """ Parses the filename using guessit-library """
+
+        if self.use_nzb_name:
+            if self.verbose:
+                self.log("Using NZB-Name")
+            guessfilename = os.path.basename(self.download_dir) + os.path.splitext(filename)[1]
+        else:
+            guessfilename = self.deobfuscate_path(filename)
+
+        # workaround for titles starting with numbers (which guessit has problems with) (part 1)
+        path, tmp_filename = os.path.split(guessfilename)
+        pad_start_digits = tmp_filename[0].isdigit()
+        if pad_start_digits:
+            guessfilename = os.path.join(path, 'T' + tmp_filename)
+
+        if self.verbose:
+            self.log('Guessing: %s' % guessfilename)
+
+        guess = guessit.api.guessit(unicode(guessfilename), {'allowed_languages': [], 'allowed_countries': []})
+
+        if self.verbose:
+            self.log(guess)
+
+        # workaround for titles starting with numbers (part 2)
+        if pad_start_digits:
+            guess['title'] = guess['title'][1:]
+            if guess['title'] == '':
+                guess['title'] = os.path.splitext(os.path.basename(guessfilename))[0][1:]
+                if self.verbose:
+                    self.log('use filename as title for recovery')
+
+        # fix some strange guessit guessing:
+        # if guessit doesn't find a year in the file name it thinks it is episode,
+        # but we prefer it to be handled as movie instead
+        if guess.get('type') == 'episode' and guess.get('episode', '') == '':
+            guess['type'] = 'movie'
+            guess['year'] = '1900'
+            if self.verbose:
+                self.log('episode without episode-number is a movie')
+
+        # treat parts as episodes ("Part.2" or "Part.II")
+        if guess.get('type') == 'movie' and guess.get('part') != None:
+            guess['type'] = 'episode'
+            guess['episode'] = guess.get('part')
+            if self.verbose:
+                self.log('treat parts as episodes')
+
+        # add season number if not present
+        if guess['type'] == 'episode' and (guess.get('season') == None):
+            guess['season'] = 1
+            if self.verbose:
+                self.log('force season 1')
+
+        # detect if year is part of series name
+        if guess['type'] == 'episode':
+            if self.config.series_year:
+                if guess.get('year') != None and guess.get('title') != None and \
+                        guess.get('season') != guess.get('year') and \
+                        guess['title'] == self.remove_year(guess['title']):
+                    guess['title'] += ' ' + str(guess['year'])
+                    if self.verbose:
+                        self.log('year is part of title')
+            else:
+                guess['title'] = self.remove_year(guess['title'])
+
+        if guess['type'] == 'movie':
+            date = guess.get('date')
+            if date:
+                guess['vtype'] = 'dated'
+            elif self.force_tv:
+                guess['vtype'] = 'othertv'
+            else:
+                guess['vtype'] = 'movie'
+        elif guess['type'] == 'episode':
+            guess['vtype'] = 'series'
+        else:
+            guess['vtype'] = guess['type']
+
+        if self.config.dnzb_headers:
+            self.apply_dnzb_headers(guess)
+
+        if self.verbose:
+            self.log('Type: %s' % guess['vtype'])
+
+        if self.verbose:
+            self.log(guess)
+
+        return guess
+
+    @timed('construct_path')
+    def construct_path(self, filename):
+        """ Parses the filename and generates new name for renaming """
+
+        if self.verbose:
+            self.log("filename: %s" % filename)
+
+        config = self.config
+        guess = self.guess_info(filename)
+        type = guess.get('vtype')
+        mapping = LazyMapping()
+        self.add_common_mapping(filename, guess, mapping)
+
+        if type == 'movie':
+            dest_dir = config.movies_dir
+            template = config.movies_template
+            self.add_movies_mapping(filename, guess, mapping)
+        elif type == 'series':
+            dest_dir = config.series_dir
+            template = config.series_template
+            self.add_series_mapping(guess, mapping)
+        elif type == 'dated':
+            dest_dir = config.dated_dir
+            template = config.dated_template
+            self.add_dated_mapping(guess, mapping)
+        elif type == 'othertv':
+            dest_dir = config.othertv_dir
+            template = config.othertv_template
+            self.add_movies_mapping(filename, guess, mapping)
+        else:
+            if self.verbose:
+                self.log('Could not determine video type for %s' % filename)
+            return None
+
+        if dest_dir == '':
+            dest_dir = os.path.dirname(self.download_dir)
+
+        # Deprecated specifiers of the format in use, reported once per job
+        if template not in self._warned_templates:
+            self._warned_templates.add(template)
+            for message in template.deprecated_warnings():
+                self.log(message)
+
+        # Char most suitable as dupe_separator
+        self.dupe_separator = template.dupe_separator
+
+        if self.verbose:
+            self.log('format: %s' % template.format)
+
+        # Replace elements
+        start = clock()
+        path, case_adjusted = template.render(mapping.resolve(template.specifiers))
+        self.timer.add('path_subst', clock() - start)
+
+        if self.verbose:
+            self.log('path after subst: %s' % path)
+
+        # Cleanup file name
+        old_path = ''
+        while old_path != path:
+            old_path = path
+            for key, name in REPLACE_AFTER.items():
+                path = path.replace(key, name)
+
+        path = path.replace('%up', '..')
+
+        if case_adjusted:
+            # Letter case was adjusted by the template, only remove the braces
+            path = path.replace('{', '').replace('}', '')
+        else:
+            # Uppercase all characters encased in {{}}
+            path = to_uppercase(path)
+
+            # Lowercase all characters encased in {}
+            path = to_lowercase(path)
+
+        # Strip any extra strippable characters around foldernames and filename
+        path, ext = os.path.splitext(path)
+        path = strip_folders(path)
+        path = path + ext
+
+        path = os.path.normpath(path)
+
+        if self.verbose:
+            self.log('path after cleanup: %s' % path)
+
+        new_path = os.path.join(dest_dir, path)
+
+        if self.verbose:
+            self.log('destination path: %s' % new_path)
+
+        if filename.upper() == new_path.upper():
+            if self.verbose:
+                self.log('Destination path equals filename  - return None')
+            return None
+
+        return new_path
+
+    def find_video_files(self):
+        """ Returns all video files in download_dir and its subdirectories """
+        video_files = []
+
+        for entry in self.inventory.with_extensions(self.config.video_extensions):
+            # Check minimum file size
+            if entry.size is None:
+                self.errors = True
+                self.log('[ERROR] Failed: %s' % entry.name)
+                self.log('[ERROR] Could not get size of %s' % entry.path)
+                continue
+            if entry.size < self.config.min_size:
+                self.log('[INFO] Skipping small: %s' % entry.name)
+                continue
+
+            # This is our video file, we should process it
+            video_files.append(entry.path)
+
+        return video_files
+
+    def run(self):
+        """ Sorts all video files of the download, returns SortResult """
+        if self.config.preview:
+            self.log('[WARNING] *** PREVIEW MODE ON - NO CHANGES TO FILE SYSTEM ***')
+
+        if self.verbose and self.force_tv:
+            self.log('[INFO] Forcing TV sorting (category: %s)' % self.category)
+
+        self.inventory = Inventory(self.download_dir)
+        video_files = self.find_video_files()
+
+        self.use_nzb_name = self.config.prefer_nzb_name and len(video_files) == 1
+
+        for old_path in video_files:
+            try:
+                new_path = self.construct_path(old_path)
+
+                # Move video file
+                if new_path:
+                    new_path = self.rename(old_path, new_path)
+                    self.files_moved = True
+
+                    # Move satellite files
+                    if self.config.satellites:
+                        self.move_satellites(old_path, new_path)
+
+            except Exception as e:
+                self.errors = True
+                self.log('[ERROR] Failed: %s' % os.path.basename(old_path))
+                self.log('[ERROR] %s' % e)
+                traceback.print_exc(file=self.out)
+
+        # Destination directories
+        final_dirs = []
+        for filename in self.moved_dst_files:
+            dir = os.path.dirname(filename)
+            if dir not in final_dirs:
+                final_dirs.append(dir)
+
+        # Cleanup if:
+        # 1) files were moved AND
+        # 2) no errors happen AND
+        # 3) all remaining files are smaller than <MinSize> AND
+        # 4) original files don't have to be kept
+        if self.config.cleanup and self.files_moved and not self.errors and not self.config.hardlink:
+            self.cleanup_download_dir()
+
+        if self.errors:
+            status = POSTPROCESS_ERROR
+        elif self.files_moved:
+            status = POSTPROCESS_SUCCESS
+        else:
+            status = POSTPROCESS_NONE
+
+        self.report_timing(status)
+
+        return SortResult(status, list(zip(self.moved_src_files, self.moved_dst_files)), final_dirs)
+
+    def report_timing(self, status):
+        """ Prints time of phases and appends a record to stats file (option StatsFile) """
+        for line in self.timer.summary():
+            self.log(line)
+        if self.config.stats_file:
+            # timing must never change the result of the job
+            try:
+                record = self.timer.record(nzb_name=to_text(self.nzb_name), category=to_text(self.category),
+                    status=status, files=len(self.moved_dst_files), preview=self.config.preview)
+                with open(self.config.stats_file, 'a') as stats_file:
+                    stats_file.write(record + '\n')
+            except (IOError, ValueError, UnicodeError) as e:
+                self.log('[WARNING] Could not write stats file: %s' % e)
+
+
+def sort_download(config, directory, nzb_name=None, category='', dnzb=NO_DNZB_HEADERS, out=None):
+    """ Sorts video files of the download in 'directory', returns SortResult.
+        Log messages are printed to 'out' (stdout by default).
+    """
+    return SortJob(config, directory, nzb_name, category, dnzb, out).run()
+
+
+def process_environ(environ, config=None, out=None):
+    """ Processes the download described by NZBGet environment variables.
+        Prints log and FINALDIR command to 'out', returns exit code for NZBGet.
+        A config parsed earlier from the same environment can be passed in 'config'.
+    """
+    out = out if out is not None else sys.stdout
+
+    # Check if the script is called from nzbget 11.0 or later
+    if not 'NZBOP_SCRIPTDIR' in environ:
+        print('*** NZBGet post-processing script ***', file=out)
+        print('This script is supposed to be called from nzbget (11.0 or later).', file=out)
+        return POSTPROCESS_ERROR
+
+    # Check if directory still exist (for post-process again)
+    if not os.path.exists(environ['NZBPP_DIRECTORY']):
+        print('[INFO] Destination directory %s doesn\'t exist, exiting' % environ['NZBPP_DIRECTORY'], file=out)
+        return POSTPROCESS_NONE
+
+    # Check par and unpack status for errors
+    if environ['NZBPP_PARSTATUS'] == '1' or environ['NZBPP_PARSTATUS'] == '4' or environ['NZBPP_UNPACKSTATUS'] == '1':
+        print('[WARNING] Download of "%s" has failed, exiting' % (environ['NZBPP_NZBNAME']), file=out)
+        return POSTPROCESS_NONE
+
+    # Check if all required script config options are present in config file
+    for optname in Config.missing_options(environ):
+        print('[ERROR] Option %s is missing in configuration file. Please check script settings' % optname, file=out)
+        return POSTPROCESS_ERROR
+
+    if config is None:
+        config = Config.from_environ(environ)
+        for message in config.format_warnings:
+            print(message, file=out)
+
+    result = sort_download(config, environ['NZBPP_DIRECTORY'], environ['NZBPP_NZBNAME'],
+        environ.get('NZBPP_CATEGORY', ''), DnzbHeaders.from_environ(environ), out)
+
+    # Inform NZBGet about new destination path
+    if result.final_dir != '':
+        print('[NZB] FINALDIR=%s' % result.final_dir, file=out)
+
+    return result.status
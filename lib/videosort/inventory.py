@@ -0,0 +1,107 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Inventory of files in the download directory.
+
+    The directory is listed once per job. Video discovery, satellite
+    matching and cleanup query the inventory instead of walking and
+    stat'ing the directory again.
+"""
+
+import os
+from collections import namedtuple
+
+# File in the download directory:
+# order - position in the order of os.walk;
+# size - size in bytes or None if the file couldn't be stat'ed.
+FileEntry = namedtuple('FileEntry', ['order', 'path', 'dirpath', 'name', 'base', 'ext', 'size'])
+
+def scan_dir(path):
+    """ Lists directory, returns list of (name, is_dir, is_link, size) """
+    result = []
+    if hasattr(os, 'scandir'):
+        for entry in os.scandir(path):
+            is_dir = entry.is_dir()
+            size = None
+            if not is_dir:
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    pass
+            result.append((entry.name, is_dir, is_dir and entry.is_symlink(), size))
+    else:
+        for name in os.listdir(path):
+            fullname = os.path.join(path, name)
+            is_dir = os.path.isdir(fullname)
+            size = None
+            if not is_dir:
+                try:
+                    size = os.path.getsize(fullname)
+                except OSError:
+                    pass
+            result.append((name, is_dir, is_dir and os.path.islink(fullname), size))
+    return result
+
+
+class Inventory(object):
+    """ Files of a directory tree, in the order of os.walk """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = []
+        self.removed = set()
+        self._scan(directory)
+
+    def _scan(self, dirpath):
+        try:
+            listing = scan_dir(dirpath)
+        except OSError:
+            # same as os.walk: unreadable directories are skipped
+            return
+        subdirs = []
+        for name, is_dir, is_link, size in listing:
+            if is_dir:
+                # symlinks to directories are not followed (as in os.walk)
+                if not is_link:
+                    subdirs.append(name)
+                continue
+            base, ext = os.path.splitext(name)
+            self.files.append(FileEntry(len(self.files), os.path.join(dirpath, name), dirpath, name, base, ext, size))
+        for name in subdirs:
+            self._scan(os.path.join(dirpath, name))
+
+    def __iter__(self):
+        """ Iterates files which weren't removed (moved) yet """
+        return (entry for entry in self.files if entry.path not in self.removed)
+
+    def remove(self, path):
+        """ Marks the file as moved out of the directory """
+        self.removed.add(path)
+
+    def contains(self, entry):
+        return entry.path not in self.removed
+
+    def with_extensions(self, extensions):
+        """ Returns remaining files having one of extensions (lowercase, with dot) """
+        return [entry for entry in self if entry.ext.lower() in extensions]
+
+    @staticmethod
+    def is_under(entry, dirpath):
+        """ Checks if the file is in directory dirpath or its subdirectories """
+        return entry.dirpath == dirpath or entry.dirpath.startswith(os.path.join(dirpath, ''))
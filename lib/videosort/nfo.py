@@ -0,0 +1,104 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Scanning of nfo-files.
+
+    An nfo-file is read in chunks up to a size limit and split into words
+    once. Words similar to the nzb-name are found with the cheap upper
+    bounds of difflib before the exact ratio is computed, so only a few
+    candidates are passed to guessit.
+"""
+
+import re
+import difflib
+from collections import namedtuple
+
+# Bytes of nfo-file to scan; the rest of large files is ignored
+SIZE_LIMIT = 256 * 1024
+
+CHUNK_SIZE = 16 * 1024
+
+_RE_IMDB = re.compile(br'tt\d{7,8}(?!\d)')
+
+# words - unique words in order of appearance;
+# imdb_ids - IMDb IDs (tt0123456) in order of appearance.
+NfoInfo = namedtuple('NfoInfo', ['words', 'imdb_ids'])
+
+def scan_nfo(filename, limit=SIZE_LIMIT):
+    """ Reads nfo-file, returns NfoInfo. Raises IOError. """
+    words = []
+    imdb_ids = []
+    seen = set()
+
+    def add_words(parts):
+        for word in parts:
+            if word in seen:
+                continue
+            seen.add(word)
+            if b'tt' in word:
+                for imdb_id in _RE_IMDB.findall(word):
+                    if not isinstance(imdb_id, str):
+                        imdb_id = imdb_id.decode('ascii')
+                    if imdb_id not in imdb_ids:
+                        imdb_ids.append(imdb_id)
+            if not isinstance(word, str):
+                try:
+                    word = word.decode('utf-8')
+                except UnicodeDecodeError:
+                    # Ignore non-unicode words (common in nfo "artwork")
+                    continue
+            words.append(word)
+
+    with open(filename, 'rb') as nfo:
+        rest = b''
+        remaining = limit
+        while remaining > 0:
+            chunk = nfo.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            data = rest + chunk
+            parts = data.split()
+            rest = b''
+            # the last word may continue in the next chunk
+            if parts and not data[-1:].isspace():
+                rest = parts.pop()
+            add_words(parts)
+        if rest:
+            add_words([rest])
+
+    return NfoInfo(words, imdb_ids)
+
+def similar_words(words, name, threshold):
+    """ Returns list of (ratio, word) for words similar to name (ratio >= threshold),
+        best matches first, words with equal ratio in order of appearance.
+    """
+    matcher = difflib.SequenceMatcher(None)
+    matcher.set_seq2(name)
+    candidates = []
+    for order, word in enumerate(words):
+        matcher.set_seq1(word)
+        # real_quick_ratio and quick_ratio are upper bounds of ratio
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= threshold:
+            candidates.append((-ratio, order, word))
+    candidates.sort()
+    return [(-ratio, word) for ratio, order, word in candidates]
@@ -0,0 +1,109 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Timing of the phases of a job.
+
+    Time of a phase includes the time of phases called from it, for example
+    construct_path includes guess_info and path_subst.
+"""
+
+import time
+import json
+import functools
+from collections import OrderedDict
+
+# Clock for durations: monotonic in python 3; python 2 has only the wall
+# clock, which can go back, so durations are never negative
+try:
+    clock = time.monotonic
+except AttributeError:
+    clock = time.time
+
+def to_text(value):
+    """ Decodes byte strings (python 2) for JSON, undecodable bytes are replaced """
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value
+
+class PhaseStats(object):
+    """ Number of calls, time and transferred bytes of one phase """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+
+    def as_dict(self):
+        result = OrderedDict([('count', self.count), ('seconds', round(self.seconds, 6))])
+        if self.bytes:
+            result['bytes'] = self.bytes
+        return result
+
+
+class JobTimer(object):
+    """ Accumulates time per phase """
+
+    def __init__(self):
+        self.start = clock()
+        self.phases = OrderedDict()
+
+    def add(self, name, seconds, size=0):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.count += 1
+        stats.seconds += max(seconds, 0.0)
+        stats.bytes += size
+
+    def elapsed(self):
+        return max(clock() - self.start, 0.0)
+
+    def summary(self):
+        """ Returns lines for the log """
+        lines = ['[DETAIL] Job time: %.3f s' % self.elapsed()]
+        for name, stats in self.phases.items():
+            line = '[DETAIL] Phase %s: %i call(s), %.3f s' % (name, stats.count, stats.seconds)
+            if stats.bytes:
+                line += ', %.1f MB' % (stats.bytes / 1048576.0)
+                if stats.seconds > 0:
+                    line += ', %.1f MB/s' % (stats.bytes / 1048576.0 / stats.seconds)
+            lines.append(line)
+        return lines
+
+    def record(self, **fields):
+        """ Returns JSON record (one line) with the fields and the timing """
+        record = OrderedDict([('time', int(time.time()))])
+        record.update(sorted(fields.items()))
+        record['seconds'] = round(self.elapsed(), 6)
+        record['phases'] = OrderedDict((name, stats.as_dict()) for name, stats in self.phases.items())
+        return json.dumps(record)
+
+
+def timed(name):
+    """ Decorator for SortJob methods, adds the time of the call to phase 'name' """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start = clock()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.timer.add(name, clock() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,236 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Compiled formatting strings.
+
+    A formatting string (option MoviesFormat etc.) is parsed once into a
+    FormatTemplate: a list of literal segments and specifiers, with the
+    letter case changes of {{...}} and {...} resolved in advance. Rendering
+    a template for a file only looks up the values of the specifiers.
+"""
+
+import os
+import re
+
+# Specifiers available for all video types
+COMMON_SPECIFIERS = ('%dn', '%^dn', '%.dn', '%_dn', '%^dN', '%.dN', '%_dN',
+    '%fn', '%^fn', '%.fn', '%_fn', '%^fN', '%.fN', '%_fN',
+    '%ext', '%EXT', '%Ext',
+    '%cat', '%.cat', '%_cat', '%cAt', '%.cAt', '%_cAt',
+    '%qf', '%qss', '%qvc', '%qac', '%qah', '%qrg')
+
+SHOW_NAME_SPECIFIERS = ('%sn', '%s.n', '%s_n', '%sN', '%s.N', '%s_N')
+
+EPISODE_NAME_SPECIFIERS = ('%en', '%e.n', '%e_n', '%eN', '%e.N', '%e_N')
+
+DECADE_SPECIFIERS = ('%decade', '%0decade')
+
+MOVIES_SPECIFIERS = COMMON_SPECIFIERS + ('%title', '%.title', '%_title', '%t', '%.t', '%_t',
+    '%tT', '%t.T', '%t_T', '%y') + DECADE_SPECIFIERS + ('%imdb', '%cpimdb')
+
+SERIES_SPECIFIERS = COMMON_SPECIFIERS + SHOW_NAME_SPECIFIERS + ('%s', '%0s') + \
+    EPISODE_NAME_SPECIFIERS + ('%e', '%0e', '%y') + DECADE_SPECIFIERS
+
+DATED_SPECIFIERS = COMMON_SPECIFIERS + ('%title', '%.title', '%_title', '%t', '%.t', '%_t') + \
+    SHOW_NAME_SPECIFIERS + EPISODE_NAME_SPECIFIERS + ('%year', '%y') + DECADE_SPECIFIERS + \
+    ('%m', '%0m', '%d', '%0d')
+
+DATED_DEPRECATED = {
+    '%t': 'consider using %sn',
+    '%.t': 'consider using %s.n',
+    '%_t': 'consider using %s_n'
+}
+
+# Navigation to parent directory, replaced after cleanup of the path
+UP_SPECIFIER = '%up'
+
+# Specifier-like token, a percent sign without a letter is a literal (e.g. "100%")
+_RE_UNKNOWN = re.compile(r'%[\^._]?[a-zA-Z]\w*')
+
+# Same expressions as in to_uppercase/to_lowercase
+_RE_UPPERCASE = re.compile(r'{{([^{]*)}}')
+_RE_LOWERCASE = re.compile(r'{([^{]*)}')
+
+def build_trie(specifiers):
+    """ Builds a character trie of specifiers; the end of a specifier is marked with key None """
+    trie = {}
+    for spec in specifiers:
+        node = trie
+        for char in spec:
+            node = node.setdefault(char, {})
+        node[None] = spec
+    return trie
+
+def match_specifier(trie, text, pos):
+    """ Returns the longest specifier starting at text[pos] or None """
+    node = trie
+    found = None
+    while pos < len(text):
+        node = node.get(text[pos])
+        if node is None:
+            break
+        found = node.get(None, found)
+        pos += 1
+    return found
+
+def resolve_case(items):
+    """ Applies letter case rules to the format skeleton.
+        items = list of (char, ref) where char is '{', '}' or 'x' (any other character).
+        Returns dict ref -> tuple of case operations ('upper', 'lower') in order of application.
+    """
+    ops = {}
+    for regex, op in ((_RE_UPPERCASE, 'upper'), (_RE_LOWERCASE, 'lower')):
+        while True:
+            m = regex.search(''.join(char for char, ref in items))
+            if not m:
+                break
+            for char, ref in items[m.start(1):m.end(1)]:
+                ops[ref] = ops.get(ref, ()) + (op,)
+            items = items[:m.start()] + items[m.start(1):m.end(1)] + items[m.end():]
+    return ops
+
+def apply_case(text, ops):
+    for op in ops:
+        text = text.upper() if op == 'upper' else text.lower()
+    return text
+
+def value_str(value):
+    """ Converts a mapping value to string, lists are joined with dots """
+    return '.'.join(value) if isinstance(value, list) else str(value)
+
+
+class FormatTemplate(object):
+    """ Formatting string compiled for one video type.
+
+        format - formatting string with extension specifier and forward slashes;
+        segments - list of (specifier, case operations, None, None) and
+                   (None, None, case-adjusted text, original text) for literals;
+        specifiers - set of specifiers referenced by the format;
+        unknown - specifier-like tokens which are not specifiers (copied literally);
+        deprecated - list of (specifier, message) for deprecated specifiers in use;
+        dupe_separator - char used in names of duplicates, e.g. "My.Movie.(2).mkv".
+    """
+
+    def __init__(self, format, specifiers, deprecated=None):
+        # Add extension specifier if the format string doesn't end with it
+        if format.rstrip('}')[-5:] != '.%ext':
+            format += '.%ext'
+        self.format = format.replace('\\', '/')
+        self.dupe_separator = self._dupe_separator(self.format)
+        self._compile(build_trie(specifiers), deprecated or {})
+
+    @staticmethod
+    def _dupe_separator(format):
+        """ Find out a char most suitable as dupe_separator
+        """
+        format_fname = os.path.basename(format)
+
+        for x in ('%.t', '%s.n', '%s.N'):
+            if (format_fname.find(x) > -1):
+                return '.'
+
+        for x in ('%_t', '%s_n', '%s_N'):
+            if (format_fname.find(x) > -1):
+                return '_'
+
+        return ' '
+
+    def _compile(self, trie, deprecated):
+        format = self.format
+        tokens = []
+        self.unknown = []
+        self.deprecated = []
+        n = 0
+        while n < len(format):
+            spec = match_specifier(trie, format, n) if format[n] == '%' else None
+            if spec:
+                tokens.append(spec)
+                if spec in deprecated and (spec, deprecated[spec]) not in self.deprecated:
+                    self.deprecated.append((spec, deprecated[spec]))
+                n += len(spec)
+            elif format.startswith(UP_SPECIFIER, n):
+                tokens.append(UP_SPECIFIER)
+                n += len(UP_SPECIFIER)
+            else:
+                unknown = _RE_UNKNOWN.match(format, n) if format[n] == '%' else None
+                if unknown:
+                    self.unknown.append(unknown.group())
+                tokens.append(format[n])
+                n += 1
+
+        # Specifiers count as one character of the skeleton, %up is never case-adjusted
+        skeleton = []
+        for ref, token in enumerate(tokens):
+            if token in ('{', '}'):
+                skeleton.append((token, ref))
+            elif token != UP_SPECIFIER:
+                skeleton.append(('x', ref))
+        case_ops = resolve_case(skeleton)
+
+        # Merge literal characters into segments
+        self.segments = []
+        specifiers = set()
+        folded = raw = ''
+        for ref, token in enumerate(tokens):
+            ops = case_ops.get(ref, ())
+            if token.startswith('%') and token not in (UP_SPECIFIER, '%'):
+                if raw:
+                    self.segments.append((None, None, folded, raw))
+                    folded = raw = ''
+                self.segments.append((token, ops, None, None))
+                specifiers.add(token)
+            else:
+                folded += apply_case(token, ops)
+                raw += token
+        if raw:
+            self.segments.append((None, None, folded, raw))
+        self.specifiers = frozenset(specifiers)
+
+    def render(self, values):
+        """ Replaces specifiers with values from dict 'values'.
+            Returns the path and flag whether letter case rules were applied.
+            The braces of the rules are kept; they must be removed after
+            cleanup of the path. If a value contains braces or %up the
+            rules can't be resolved in advance: the path is returned with
+            plain substitution and the flag is False.
+        """
+        parts = []
+        resolved = True
+        for spec, ops, folded, raw in self.segments:
+            if spec is None:
+                parts.append(folded)
+            else:
+                value = value_str(values[spec])
+                if '{' in value or '}' in value or UP_SPECIFIER in value:
+                    resolved = False
+                parts.append(apply_case(value, ops))
+
+        if not resolved:
+            parts = [raw if spec is None else value_str(values[spec])
+                for spec, ops, folded, raw in self.segments]
+
+        return ''.join(parts), resolved
+
+    def unknown_warnings(self, option):
+        """ Returns warnings about unknown specifiers of the format (option name) for the log """
+        return ['[WARNING] unknown specifier %s in option %s' % (token, option) for token in self.unknown]
+
+    def deprecated_warnings(self):
+        """ Returns warnings about deprecated specifiers of the format for the log """
+        return ['[WARNING] specifier %s is deprecated, %s' % (spec, msg) for spec, msg in self.deprecated]
@@ -0,0 +1,252 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Unit tests of the videosort modules (sorting itself is tested by testsort.py).
+
+    Run from the lib directory: python -m videosort.tests
+"""
+
+import io
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+from unittest import TestCase, TestSuite, TestLoader, TextTestRunner
+
+from videosort import transfer
+from videosort.client import forward_job, POSTPROCESS_ERROR
+from videosort.engine import Config
+from videosort.worker import ConfigCache, decode_environ
+
+CONTENT = b'video data ' * 100000
+
+OPTIONS = {'NZBPO_MOVIESDIR': '/movies', 'NZBPO_SERIESDIR': '/series', 'NZBPO_DATEDDIR': '/dated',
+    'NZBPO_OTHERTVDIR': '/tv', 'NZBPO_VIDEOEXTENSIONS': '.mkv', 'NZBPO_SATELLITEEXTENSIONS': '.srt',
+    'NZBPO_MINSIZE': '100', 'NZBPO_MOVIESFORMAT': '%t (%y)', 'NZBPO_SERIESFORMAT': '%sn/%sn - S%0sE%0e',
+    'NZBPO_OTHERTVFORMAT': '%t', 'NZBPO_DATEDFORMAT': '%sn - %y-%0m-%0d', 'NZBPO_EPISODESEPARATOR': '-',
+    'NZBPO_OVERWRITE': 'no', 'NZBPO_CLEANUP': 'no', 'NZBPO_LOWERWORDS': 'the,of', 'NZBPO_UPPERWORDS': 'II',
+    'NZBPO_TVCATEGORIES': 'tv', 'NZBPO_PREVIEW': 'no', 'NZBPO_VERBOSE': 'no'}
+
+
+class TestTransfer(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.old = os.path.join(self.dir, 'old.mkv')
+        self.new = os.path.join(self.dir, 'new.mkv')
+        with open(self.old, 'wb') as f:
+            f.write(CONTENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def patch(self, obj, name, value):
+        """ Replaces attribute for the test """
+        self.addCleanup(setattr, obj, name, getattr(obj, name))
+        setattr(obj, name, value)
+
+    def force_copy(self):
+        """ Makes transfer_file copy the file as if the destination was on another device """
+        self.patch(transfer, 'same_device', lambda old, new: False)
+
+    def no_reflink(self):
+        self.patch(transfer, 'reflink', lambda src, dst: False)
+
+    def read(self, filename):
+        with open(filename, 'rb') as f:
+            return f.read()
+
+    def assertMoved(self):
+        self.assertFalse(os.path.exists(self.old))
+        self.assertEqual(self.read(self.new), CONTENT)
+
+    def test_rename(self):
+        self.assertEqual(transfer.transfer_file(self.old, self.new), ('rename', None))
+        self.assertMoved()
+
+    def test_hardlink(self):
+        if not hasattr(os, 'link'):
+            self.skipTest('no hard links')
+        self.assertEqual(transfer.transfer_file(self.old, self.new, True), ('hardlink', None))
+        self.assertEqual(os.stat(self.old).st_ino, os.stat(self.new).st_ino)
+
+    def test_rename_failed(self):
+        def rename(old, new):
+            raise OSError(18, 'Invalid cross-device link')
+        self.patch(transfer.os, 'rename', rename)
+        self.no_reflink()
+        method, reason = transfer.transfer_file(self.old, self.new)
+        self.assertTrue(reason.startswith('Could not rename file'))
+        self.assertNotEqual(method, 'rename')
+        self.assertMoved()
+
+    def test_different_devices(self):
+        self.force_copy()
+        self.no_reflink()
+        method, reason = transfer.transfer_file(self.old, self.new, True)
+        self.assertEqual(reason, 'Source and destination are on different devices')
+        self.assertEqual(self.read(self.old), CONTENT)
+        self.assertEqual(self.read(self.new), CONTENT)
+
+    def test_reflink(self):
+        def reflink(src, dst):
+            dst.write(src.read())
+            dst.flush()
+            return True
+        self.force_copy()
+        self.patch(transfer, 'reflink', reflink)
+        self.assertEqual(transfer.transfer_file(self.old, self.new)[0], 'reflink')
+        self.assertMoved()
+
+    def test_kernel_copy(self):
+        if not transfer.KERNEL_COPY:
+            self.skipTest('no kernel copy in this python version')
+        self.force_copy()
+        self.no_reflink()
+        # several calls per file
+        self.patch(transfer, 'CHUNK_SIZE', 300000)
+        method = transfer.transfer_file(self.old, self.new)[0]
+        self.assertIn(method, [name for name, func in transfer.KERNEL_COPY])
+        self.assertMoved()
+
+    def test_kernel_copy_stopped(self):
+        # kernel method which stops at once, the file is copied through a buffer
+        self.force_copy()
+        self.no_reflink()
+        self.patch(transfer, 'KERNEL_COPY', [('stopped', lambda infd, outfd, offset, count: 0)])
+        self.assertEqual(transfer.transfer_file(self.old, self.new)[0], 'copy')
+        self.assertMoved()
+
+    def test_buffered_copy(self):
+        self.force_copy()
+        self.no_reflink()
+        self.patch(transfer, 'KERNEL_COPY', [])
+        self.assertEqual(transfer.transfer_file(self.old, self.new)[0], 'copy')
+        self.assertMoved()
+
+    def test_short_copy(self):
+        # the source is truncated while being copied: the space of the copy is
+        # already allocated, but the copy is incomplete and the source is kept
+        def truncate(infd, outfd, offset, count):
+            with open(self.old, 'r+b') as f:
+                f.truncate(len(CONTENT) // 2)
+            return 0
+        self.force_copy()
+        self.no_reflink()
+        self.patch(transfer, 'KERNEL_COPY', [('truncate', truncate)])
+        self.assertRaises(IOError, transfer.transfer_file, self.old, self.new)
+        self.assertTrue(os.path.exists(self.old))
+        self.assertFalse(os.path.exists(self.new))
+
+
+class TestClient(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.dir, 'worker.sock')
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.dir)
+
+    def forward(self, response):
+        """ Runs the client against a worker sending response, returns exit code and output """
+        def worker():
+            conn = self.server.accept()[0]
+            while not conn.recv(65536).endswith(b'\n'):
+                pass
+            conn.sendall(response)
+            conn.close()
+        thread = threading.Thread(target=worker)
+        thread.start()
+        out = io.BytesIO()
+        exit_code = forward_job(self.socket_path, {'NZBPP_NZBNAME': 'test'}, out)
+        thread.join()
+        return exit_code, out.getvalue()
+
+    def test_output(self):
+        self.assertEqual(self.forward(b'line 1\nline 2\n\n\0EXIT=93\n'), (93, b'line 1\nline 2\n'))
+
+    def test_output_without_newline(self):
+        self.assertEqual(self.forward(b'line 1\nline 2\n\0EXIT=93\n'), (93, b'line 1\nline 2'))
+
+    def test_marker_in_line(self):
+        # the marker is recognized at the start of a line only
+        exit_code, out = self.forward(b'line 1\0EXIT=93\n')
+        self.assertEqual(exit_code, POSTPROCESS_ERROR)
+        self.assertTrue(out.startswith(b'line 1\0EXIT=93\n'))
+
+    def test_no_marker(self):
+        exit_code, out = self.forward(b'line 1\n')
+        self.assertEqual(exit_code, POSTPROCESS_ERROR)
+        self.assertTrue(out.endswith(b'[ERROR] VideoSort worker terminated unexpectedly\n'))
+
+    def test_no_worker(self):
+        self.assertEqual(forward_job(os.path.join(self.dir, 'none.sock'), {}, io.BytesIO()), None)
+
+
+class TestConfig(TestCase):
+
+    def test_format_warnings(self):
+        # unknown specifiers of all formats are reported at load, deprecated ones when used
+        config = Config.from_environ(dict(OPTIONS, NZBPO_MOVIESFORMAT='%t (%y) 100%', NZBPO_SERIESFORMAT='%sn/%foo',
+            NZBPO_DATEDFORMAT='%t - %y-%0m-%0d'))
+        self.assertEqual(config.format_warnings, ('[WARNING] unknown specifier %foo in option SeriesFormat',))
+        self.assertEqual(config.dated_template.deprecated_warnings(),
+            ['[WARNING] specifier %t is deprecated, consider using %sn'])
+
+    def test_no_warnings(self):
+        self.assertEqual(Config.from_environ(OPTIONS).format_warnings, ())
+
+
+class TestConfigCache(TestCase):
+
+    def test_add(self):
+        configs = ConfigCache()
+        environ = dict(OPTIONS, NZBPP_NZBNAME='test')
+        self.assertEqual(configs.get(environ), None)
+        # options are sent by the child to the worker as JSON
+        configs.add(decode_environ(json.dumps(dict(ConfigCache.options(environ))).encode('utf-8')))
+        self.assertEqual(configs.get(environ).movies_format, '%t (%y)')
+        # other jobs with the same options
+        self.assertTrue(configs.get(dict(OPTIONS, NZBPP_NZBNAME='other')) is configs.get(environ))
+
+    def test_invalid(self):
+        configs = ConfigCache()
+        for environ in ({}, dict(OPTIONS, NZBPO_MINSIZE='100 MB'), dict(OPTIONS, NZBPO_MINSIZE=None)):
+            configs.add(environ)
+            self.assertEqual(configs.get(environ), None)
+
+
+def suite():
+    suite = TestSuite()
+    suite.addTest(TestLoader().loadTestsFromTestCase(TestTransfer))
+    suite.addTest(TestLoader().loadTestsFromTestCase(TestClient))
+    suite.addTest(TestLoader().loadTestsFromTestCase(TestConfig))
+    suite.addTest(TestLoader().loadTestsFromTestCase(TestConfigCache))
+    return suite
+
+
+if __name__ == '__main__':
+    TextTestRunner().run(suite())
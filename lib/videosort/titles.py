@@ -0,0 +1,163 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Letter case adjustment of titles (case-adjusted specifiers).
+
+    Options LowerWords and UpperWords are compiled once into a lookup table
+    of words. A title is then adjusted with one pass over its words.
+"""
+
+import re
+import sys
+
+try:
+    unicode
+except NameError:
+    unicode = str
+
+# Characters not allowed in file names
+_RE_INVALID_CHARS = re.compile('[\"\:\?\*\\\/\<\>\|]')
+
+# Words of a title; no re.UNICODE, same as the word boundaries of replace_word
+_RE_WORD = re.compile(r'\w+')
+_RE_SINGLE_WORD = re.compile(r'^\w+$')
+
+# Number of titles remembered by TitleCase
+CACHE_SIZE = 4096
+
+# * From SABnzbd+ (with modifications) *
+
+def titler(p):
+    """ title() replacement
+        Python's title() fails with Latin-1, so use Unicode detour.
+    """
+    if isinstance(p, unicode):
+        return p.title()
+    elif gUTF:
+        try:
+            return p.decode('utf-8').title().encode('utf-8')
+        except:
+            return p.decode('latin-1', 'replace').title().encode('latin-1', 'replace')
+    else:
+        return p.decode('latin-1', 'replace').title().encode('latin-1', 'replace')
+
+def replace_word(input, one, two):
+    ''' Regex replace on just words '''
+    regex = re.compile(r'\W(%s)(\W|$)' % one, re.I)
+    matches = regex.findall(input)
+    if matches:
+        for m in matches:
+            input = input.replace(one, two)
+    return input
+
+gUTF = False
+try:
+    if sys.platform == 'darwin':
+        gUTF = True
+    else:
+        gUTF = locale.getdefaultlocale()[1].lower().find('utf') >= 0
+except:
+    # Incorrect locale implementation, assume the worst
+    gUTF = False
+
+# END * From SABnzbd+ * END
+
+
+class TitleCase(object):
+    """ Title maker for options LowerWords and UpperWords """
+
+    def __init__(self, lower_words, upper_words):
+        # Words in the form produced by titler() and the form to use instead.
+        # Lower words go first: a word listed in both options stays lowercased.
+        self.words = {}
+        # Words which consist of several parts (e.g. "vs.") are replaced with regex
+        self.phrases = []
+        rules = [(titler(x), x) for x in tuple(lower_words) + tuple(upper_words) if x]
+        for xtitled, x in rules:
+            if _RE_SINGLE_WORD.match(xtitled):
+                self.words.setdefault(xtitled, self._chain(xtitled, rules))
+            else:
+                self.phrases.append((xtitled, x))
+        self.cache = {}
+
+    @staticmethod
+    def _chain(word, rules):
+        """ Returns the word after all rules are applied one by one """
+        for xtitled, x in rules:
+            if word == xtitled:
+                word = x
+        return word
+
+    def titles(self, name, titleing=False):
+        '''
+        The title will be the part before the match
+        Clean it up and title() it
+
+        ''.title() isn't very good under python so this contains
+        a lot of little hacks to make it better and for more control
+
+        Returns the title with words separated with spaces, dots and underscores.
+        '''
+        key = (name, titleing)
+        result = self.cache.get(key)
+        if result is None:
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            result = self.cache[key] = self._titles(name, titleing)
+        return result
+
+    def _titles(self, name, titleing):
+        #make valid filename
+        title = _RE_INVALID_CHARS.sub(' ', name)
+
+        if titleing:
+            title = self.adjust_case(title)
+
+        # The title with spaces replaced by dots
+        dots = title.replace(" - ", "-").replace(' ','.').replace('_','.')
+        dots = dots.replace('(', '.').replace(')','.').replace('..','.').rstrip('.')
+
+        # The title with spaces replaced by underscores
+        underscores = title.replace(' ','_').replace('.','_').replace('__','_').rstrip('_')
+
+        return title, dots, underscores
+
+    def adjust_case(self, title):
+        title = titler(title) # title the show name so it is in a consistant letter case
+
+        #title applied uppercase to 's Python bug?
+        title = title.replace("'S", "'s")
+
+        # Make sure some words such as 'and' or 'of' stay lowercased
+        # and words such as 'III' or 'IV' stay uppercased.
+        # A word is replaced if it follows a non-word character somewhere in the title.
+        if self.words:
+            words = self.words
+            found = set(m.group() for m in _RE_WORD.finditer(title) if m.start() > 0 and m.group() in words)
+            if found:
+                title = _RE_WORD.sub(lambda m: words[m.group()] if m.group() in found else m.group(), title)
+
+        for xtitled, x in self.phrases:
+            title = replace_word(title, xtitled, x)
+
+        # Make sure the first letter of the title is always uppercase
+        if title:
+            title = titler(title[0]) + title[1:]
+
+        return title
@@ -0,0 +1,190 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Transfer of files to destination.
+
+    The method is chosen by comparing the devices of source and destination:
+    on the same device a file is renamed (or hard-linked); otherwise it is
+    cloned (reflink), copied in kernel (copy_file_range, sendfile) or, as
+    the last resort, copied through a buffer. Methods not supported by the
+    platform, python version or file system are skipped.
+"""
+
+import os
+import sys
+import errno
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl to clone a file on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Bytes per kernel copy call; the page cache of copied part is released after each call
+CHUNK_SIZE = 64 << 20
+
+BUFFER_SIZE = 1 << 20
+
+# Errors meaning that a copy method is not supported for the files
+_UNSUPPORTED = set(getattr(errno, name) for name in
+    ('EXDEV', 'ENOSYS', 'EINVAL', 'EOPNOTSUPP', 'ENOTSUP', 'EBADF', 'ENOTTY') if hasattr(errno, name))
+
+def same_device(old, new):
+    """ Checks if the file and the directory of destination are on the same device """
+    try:
+        return os.stat(old).st_dev == os.stat(os.path.dirname(new)).st_dev
+    except OSError:
+        return False
+
+def transfer_file(old, new, keep_source=False):
+    """ Moves the file; with keep_source the file is hard-linked or copied.
+        Returns name of the method used and, if the file was copied, the reason why.
+    """
+    if same_device(old, new):
+        try:
+            if keep_source:
+                os.link(old, new)
+                return 'hardlink', None
+            os.rename(old, new)
+            return 'rename', None
+        except (OSError, AttributeError) as e:
+            # bind mounts, file systems without hard links, no os.link
+            reason = 'Could not %s file (%s)' % ('hard-link' if keep_source else 'rename', e)
+    else:
+        reason = 'Source and destination are on different devices'
+    method = copy_file(old, new)
+    if not keep_source:
+        os.remove(old)
+    return method, reason
+
+def copy_file(old, new):
+    """ Copies file content, returns name of the method used.
+        Raises IOError if fewer bytes than the size of the source were copied.
+    """
+    try:
+        with open(old, 'rb') as src:
+            with open(new, 'wb') as dst:
+                size = os.fstat(src.fileno()).st_size
+                if reflink(src, dst):
+                    method = 'reflink'
+                    copied = os.fstat(dst.fileno()).st_size
+                else:
+                    # the copy has the full size from here on, only the bytes copied tell if it's complete
+                    preallocate(dst, size)
+                    advise(src, 'POSIX_FADV_SEQUENTIAL')
+                    method = kernel_copy(src, dst, size)
+                    if method is None:
+                        copied = buffered_copy(src, dst)
+                        method = 'copy'
+                    else:
+                        # a kernel method is used only if it copied all bytes
+                        copied = size
+                    advise(src, 'POSIX_FADV_DONTNEED')
+                    advise(dst, 'POSIX_FADV_DONTNEED')
+                if copied != size:
+                    raise IOError(errno.EIO, 'Incomplete copy of %s: %i of %i bytes' % (old, copied, size))
+                return method
+    except BaseException:
+        # don't leave partial copy
+        try:
+            os.remove(new)
+        except OSError:
+            pass
+        raise
+
+def reflink(src, dst):
+    """ Clones the file on file systems supporting copy-on-write """
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except (IOError, OSError):
+        return False
+
+def preallocate(dst, size):
+    """ Reserves disk space for the copy to reduce fragmentation """
+    if size > 0 and hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(dst.fileno(), 0, size)
+        except OSError:
+            pass
+
+def advise(f, advice, offset=0, length=0):
+    """ Gives a hint about access to file data (os.posix_fadvise) """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), offset, length, getattr(os, advice))
+        except OSError:
+            pass
+
+def _copy_file_range(infd, outfd, offset, count):
+    return os.copy_file_range(infd, outfd, count, offset, offset)
+
+def _sendfile(infd, outfd, offset, count):
+    os.lseek(outfd, offset, os.SEEK_SET)
+    return os.sendfile(outfd, infd, offset, count)
+
+# Kernel copy methods available in this python version
+KERNEL_COPY = []
+if hasattr(os, 'copy_file_range'):
+    KERNEL_COPY.append(('copy_file_range', _copy_file_range))
+if hasattr(os, 'sendfile'):
+    KERNEL_COPY.append(('sendfile', _sendfile))
+
+def kernel_copy(src, dst, size):
+    """ Copies without passing data through user space.
+        Returns name of the method used or None if no method is supported
+        or no method copied the whole file.
+    """
+    infd = src.fileno()
+    outfd = dst.fileno()
+    for name, func in KERNEL_COPY:
+        offset = 0
+        while offset < size:
+            try:
+                copied = func(infd, outfd, offset, min(CHUNK_SIZE, size - offset))
+            except OSError as e:
+                if offset == 0 and e.errno in _UNSUPPORTED:
+                    break
+                raise
+            if copied == 0:
+                # some file systems stop early, the next method copies from the start
+                break
+            advise(src, 'POSIX_FADV_DONTNEED', offset, copied)
+            offset += copied
+        if offset == size:
+            return name
+    return None
+
+def buffered_copy(src, dst):
+    """ Copies through a buffer, returns number of bytes copied """
+    src.seek(0)
+    dst.seek(0)
+    copied = 0
+    while True:
+        buf = src.read(BUFFER_SIZE)
+        if not buf:
+            break
+        dst.write(buf)
+        copied += len(buf)
+    dst.truncate()
+    return copied
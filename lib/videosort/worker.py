@@ -0,0 +1,227 @@
+#
+# VideoSort post-processing script for NZBGet.
+#
+# Copyright (C) 2013-2020 Andrey Prygunkov <hugbug@users.sourceforge.net>
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.    See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with the program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Persistent VideoSort worker.
+
+    The worker loads guessit once and listens on a unix socket. Every job
+    sent by the client (see client.py) is read and processed in a forked
+    child, which inherits the warm guessit instance and the parsed script
+    configs but keeps the state of the job private. The output of the job
+    is streamed back to the client followed by the exit code.
+"""
+
+import os
+import sys
+import json
+import stat
+import errno
+import select
+import signal
+import socket
+import traceback
+
+import guessit
+
+from videosort.client import EXIT_MARKER, POSTPROCESS_ERROR
+from videosort.engine import Config, process_environ
+
+# Seconds a child waits for the job environment sent by the client
+REQUEST_TIMEOUT = 10
+
+def warm_up():
+    """ Runs a guess to initialize all lazy structures of guessit """
+    guessit.api.guessit('Warm.Up.S01E02.Episode.Title.720p.HDTV.x264-GROUP.mkv',
+        {'allowed_languages': [], 'allowed_countries': []})
+
+class ConfigCache(object):
+    """ Parsed script configs, keyed by script options of the job.
+        Children look up the config of their job; options of a config
+        which wasn't cached yet are sent back to the worker (see serve),
+        which parses them for the next jobs.
+    """
+
+    def __init__(self):
+        self.configs = {}
+
+    @staticmethod
+    def options(environ):
+        """ Returns key of the config: sorted script options (NZBPO_*) """
+        return tuple(sorted((k, v) for k, v in environ.items() if k.startswith('NZBPO_')))
+
+    def get(self, environ):
+        """ Returns cached config of the job or None """
+        return self.configs.get(self.options(environ))
+
+    def add(self, environ):
+        """ Parses and caches config of the script options """
+        try:
+            self.configs[self.options(environ)] = Config.from_environ(environ)
+        except Exception:
+            # invalid config, the job reported the error itself
+            pass
+
+def decode_environ(data):
+    """ Decodes environment (JSON) sent by the client or a child """
+    environ = json.loads(data.decode('utf-8'))
+    if sys.version_info[0] < 3:
+        # python 2 scripts see environment as byte strings
+        environ = dict((key.encode('utf-8'), value.encode('utf-8')) for key, value in environ.items())
+    return environ
+
+def read_request(conn):
+    """ Reads job environment sent by the client, returns None if nothing was sent """
+    conn.settimeout(REQUEST_TIMEOUT)
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    # the output of the job is written to the socket in blocking mode
+    conn.settimeout(None)
+    if data == b'':
+        return None
+    return decode_environ(data)
+
+def run_job(environ, config):
+    """ Processes the job, returns exit code """
+    try:
+        return process_environ(environ, config)
+    except Exception:
+        print('[ERROR] VideoSort worker failed to process the job')
+        traceback.print_exc()
+        return POSTPROCESS_ERROR
+
+def handle(conn, configs, notify):
+    """ Processes one job in the forked child """
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    exit_code = POSTPROCESS_ERROR
+    try:
+        try:
+            environ = read_request(conn)
+        except (socket.error, ValueError):
+            # stuck or broken client
+            traceback.print_exc()
+            os._exit(0)
+        if environ is None:
+            # connection without a job, e.g. check if the worker is running
+            os._exit(0)
+
+        # redirect output of the job to the client, line by line
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+        sys.stdout = os.fdopen(1, 'w', 1)
+        sys.stderr = os.fdopen(2, 'w', 1)
+
+        config = configs.get(environ)
+        if config is None:
+            # the job parses the config and reports its errors; the worker caches it
+            message = json.dumps(dict(ConfigCache.options(environ))).encode('utf-8') + b'\n'
+            # only writes up to PIPE_BUF are atomic
+            if len(message) <= select.PIPE_BUF:
+                os.write(notify, message)
+        exit_code = run_job(environ, config)
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # the marker starts a line even if the output doesn't end with a newline
+            conn.sendall(b'\n' + EXIT_MARKER + str(exit_code).encode('ascii') + b'\n')
+            conn.close()
+        finally:
+            os._exit(0)
+
+def worker_running(socket_path):
+    """ Checks if a worker listens on the socket """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except socket.error as e:
+        # only a refused connection means the socket is left over
+        return e.errno != errno.ECONNREFUSED
+    finally:
+        sock.close()
+
+def serve(socket_path):
+    """ Accepts jobs until interrupted, returns exit code """
+    if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        if worker_running(socket_path):
+            print('[ERROR] Socket %s is in use by another VideoSort worker' % socket_path)
+            return 1
+        os.remove(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # the socket is created accessible to the owner only
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+
+    # children are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # remove the socket on termination
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    configs = ConfigCache()
+    # options of configs parsed by children, one JSON line per config
+    notify_read, notify_write = os.pipe()
+    notified = b''
+
+    print('[INFO] VideoSort worker listening on %s' % socket_path)
+    sys.stdout.flush()
+    try:
+        while True:
+            readable = select.select([server, notify_read], [], [])[0]
+            if notify_read in readable:
+                notified += os.read(notify_read, 65536)
+                while b'\n' in notified:
+                    line, notified = notified.split(b'\n', 1)
+                    configs.add(decode_environ(line))
+            if server in readable:
+                conn, _ = server.accept()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                # the request is read by the child, a stuck client doesn't delay other jobs
+                if os.fork() == 0:
+                    server.close()
+                    os.close(notify_read)
+                    handle(conn, configs, notify_write)
+                conn.close()
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+def main(script, args):
+    """ Entry point for "VideoSort.py --worker <socket>" """
+    if len(args) != 1:
+        print('Usage: %s --worker <socket>' % os.path.basename(script))
+        return 2
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'):
+        print('[ERROR] VideoSort worker is not supported on this platform')
+        return 1
+
+    warm_up()
+    try:
+        return serve(args[0])
+    except KeyboardInterrupt:
+        return 0
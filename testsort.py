@@ -27,18 +27,24 @@ import shutil
 import subprocess
 import json
 import getopt
+import tempfile
+import time
 
 print('Test script for VideoSort')
 
 root_dir = dirname(__file__)
 test_dir = root_dir + '/__'
 verbose = False
+use_worker = False
+worker_socket = ''
 test_ids = []
 
-options, _ = getopt.getopt(sys.argv[1:], 't:v', ['testid=', 'verbose'])
+options, _ = getopt.getopt(sys.argv[1:], 't:vw', ['testid=', 'verbose', 'worker'])
 for opt, arg in options:
 	if opt in ('-v', '--verbose'):
 		verbose = True
+	elif opt in ('-w', '--worker'):
+		use_worker = True
 	elif opt in ('-t', '--testid'):
 		test_ids.append(arg)
 
@@ -68,6 +74,7 @@ def set_defaults():
 	os.environ['NZBPO_CLEANUP'] = 'no'
 	os.environ['NZBPO_PREVIEW'] = 'yes'
 	os.environ['NZBPO_VERBOSE'] = 'yes'
+	os.environ['NZBPO_WORKERSOCKET'] = worker_socket
 
 	# properties of nzb-file
 	os.environ['NZBPP_DIRECTORY'] = test_dir
@@ -84,6 +91,8 @@ def set_defaults():
 def run_test(testobj):
 	set_defaults()
 	for prop_name in testobj:
+		if prop_name in ('EXTRAFILES', 'OUTPUTFILES', 'OUTPUTSATELLITES'):
+			continue
 		os.environ[str(prop_name)] = str(testobj[prop_name])
 		if verbose:
 			print('%s: %s' % (prop_name, os.environ[prop_name]))
@@ -91,13 +100,16 @@ def run_test(testobj):
 	output_file = testobj['OUTPUTFILE']
 	shutil.rmtree(test_dir, True)
 	os.mkdir(test_dir)
-	dir_name, file_name = os.path.split(input_file)
-	if dir_name != '':
-		os.mkdir(test_dir + '/' + dir_name)
-	full_file_name = test_dir + '/' + input_file
-	out_file = open(full_file_name, 'w')
-	out_file.write('empty file')
-	out_file.close()
+	# other files of the download (satellites, other videos): name -> content
+	files = {input_file: 'empty file'}
+	files.update(testobj.get('EXTRAFILES', {}))
+	for name in sorted(files):
+		dir_name = os.path.dirname(name)
+		if dir_name != '' and not os.path.isdir(test_dir + '/' + dir_name):
+			os.makedirs(test_dir + '/' + dir_name)
+		out_file = open(test_dir + '/' + name, 'w')
+		out_file.write(files[name])
+		out_file.close()
 
 	if verbose:
 		print('Executing...')
@@ -110,6 +122,8 @@ def run_test(testobj):
 		print('Return code: %i' % ret)
 	success = False
 	dest = ''
+	dests = []
+	satellites = []
 
 	if ret == 93:
 		for line in out.split(b'\n'):
@@ -118,7 +132,19 @@ def run_test(testobj):
 				if line.startswith(root_dir.encode()):
 					line = line[len(root_dir.encode()):]
 				dest = line.replace(b'\\', b'/').decode()
+				dests.append(dest)
+			elif line.startswith(b'Satellite: '):
+				satellites.append(line[len(b'Satellite: '):].strip().decode())
 		success = dest == output_file and output_file != ''
+		# destinations of all videos, if the download has more than one
+		if 'OUTPUTFILES' in testobj and dests != testobj['OUTPUTFILES']:
+			success = False
+			dest = ', '.join(dests)
+		# names of satellite files moved with the videos
+		for name in testobj.get('OUTPUTSATELLITES', []):
+			if name not in satellites:
+				success = False
+				dest += ' (satellite %s not moved)' % name
 
 	if success:
 		print('%s: SUCCESS' % testobj['id'])
@@ -141,7 +167,29 @@ def run_test(testobj):
 		print('expected   : %s' % output_file)
 		print('destination: %s' % dest)
 
+def start_worker():
+	global worker_socket
+	worker_socket = os.path.join(tempfile.gettempdir(), 'videosort-test-%i.sock' % os.getpid())
+	devnull = open(os.devnull, 'w')
+	proc = subprocess.Popen(['python', root_dir + '/VideoSort.py', '--worker', worker_socket], stdout=devnull, stderr=devnull)
+	for i in range(300):
+		if os.path.exists(worker_socket) or proc.poll() is not None:
+			break
+		time.sleep(0.1)
+	if not os.path.exists(worker_socket):
+		print('Could not start worker')
+		sys.exit(1)
+	print('Using worker: %s' % worker_socket)
+	return proc
+
+worker = start_worker() if use_worker else None
+
 testdata = json.load(open(root_dir + '/testdata.json'))
-for testobj in testdata:
-	if test_ids == [] or testobj['id'] in test_ids:
-		run_test(testobj)
+try:
+	for testobj in testdata:
+		if test_ids == [] or testobj['id'] in test_ids:
+			run_test(testobj)
+finally:
+	if worker:
+		worker.terminate()
+		worker.wait()